@@ -3,8 +3,13 @@ Audio Manager for game sounds and music
 Singleton pattern for centralized audio management
 """
 import pygame
-import numpy as np
 import os
+import threading
+from utils.storage import get_data_path, load_json, save_json
+from utils.logger import get_logger
+
+
+logger = get_logger(__name__)
 
 
 class AudioManager:
@@ -13,6 +18,13 @@ class AudioManager:
     Handles music and sound effects with procedural generation
     """
     
+    # Mixer settings (the buffer is also the output latency the beat clock compensates)
+    MIXER_FREQUENCY = 22050
+    MIXER_BUFFER = 512
+    
+    # Tap calibration of the output delay (see screens/calibration.py)
+    CALIBRATION_FILE = 'audio_calibration.json'
+    
     _instance = None
     
     def __new__(cls):
@@ -28,54 +40,85 @@ class AudioManager:
         self._initialized = True
         self._audio_available = False
         
+        # Music streamed by MusicEngine instead of a file (created on first play);
+        # the calibration beat has no file and is streamed even when files are chosen
+        self._procedural_music = {'game_music'}
+        self._procedural_only = {'calibration'}
+        self._procedural_enabled = True
+        self._music_engine = None
+        self._audio_offset = None
+        
         # Initialize pygame mixer
         try:
-            pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
+            pygame.mixer.init(frequency=self.MIXER_FREQUENCY, size=-16, channels=2,
+                              buffer=self.MIXER_BUFFER)
             self._audio_available = True
         except Exception as e:
-            print(f"Audio not available: {e}")
+            logger.warning("Audio not available: %s", e)
             return
         
         # Volume settings
         self._music_volume = 0.5
         self._sfx_volume = 0.7
         
-        # Sound cache
+        # Sound cache (filled on first play or by preload_sounds)
         self._sounds = {}
+        self._sounds_lock = threading.Lock()
         
-        # Generate procedural sounds
-        self._generate_sounds()
+        # Procedural sound recipes: name -> (generator, args)
+        self._sound_recipes = {
+            'click': (self._generate_beep, (440, 50)),             # Short beep
+            'good_catch': (self._generate_sweep, (440, 880, 150)),  # Rising tone
+            'bad_catch': (self._generate_sweep, (440, 220, 150)),   # Falling tone
+            'game_over': (self._generate_game_over, ()),           # Descending tones
+            'victory': (self._generate_victory, ()),               # Ascending fanfare
+        }
         
         # Music state
         self._current_music = None
     
-    def _generate_sounds(self):
-        """Generate procedural sound effects"""
+    def _get_sound(self, sound_name):
+        """
+        Get a sound, synthesizing it on first use
+        
+        NumPy is only imported by the generators, so it stays out of
+        startup until a sound is actually needed.
+        
+        Args:
+            sound_name: Name of sound
+        
+        Returns:
+            pygame.mixer.Sound or None: Sound, None if unknown or generation failed
+        """
+        if sound_name in self._sounds:
+            return self._sounds[sound_name]
+        
+        recipe = self._sound_recipes.get(sound_name)
+        if recipe is None:
+            return None
+        
+        with self._sounds_lock:
+            if sound_name not in self._sounds:
+                generator, args = recipe
+                self._sounds[sound_name] = generator(*args)
+        return self._sounds[sound_name]
+    
+    def preload_sounds(self):
+        """Synthesize every sound effect now (safe to call from a worker thread)"""
         if not self._audio_available:
             return
         
         try:
-            # Click sound - short beep
-            self._sounds['click'] = self._generate_beep(440, 50)
-            
-            # Good catch - rising tone
-            self._sounds['good_catch'] = self._generate_sweep(440, 880, 150)
-            
-            # Bad catch - falling tone  
-            self._sounds['bad_catch'] = self._generate_sweep(440, 220, 150)
-            
-            # Game over - descending tones
-            self._sounds['game_over'] = self._generate_game_over()
-            
-            # Victory - ascending fanfare
-            self._sounds['victory'] = self._generate_victory()
-            
+            for sound_name in self._sound_recipes:
+                self._get_sound(sound_name)
         except Exception as e:
-            print(f"Error generating sounds: {e}")
+            logger.error("Error generating sounds: %s", e)
     
     def _generate_beep(self, frequency, duration_ms):
         """Generate a simple beep sound"""
         try:
+            import numpy as np
+            
             sample_rate = 22050
             duration = duration_ms / 1000.0
             samples = int(sample_rate * duration)
@@ -99,12 +142,14 @@ class AudioManager:
             
             return pygame.sndarray.make_sound(stereo_wave)
         except Exception as e:
-            print(f"Error generating beep: {e}")
+            logger.error("Error generating beep: %s", e)
             return None
     
     def _generate_sweep(self, start_freq, end_freq, duration_ms):
         """Generate a frequency sweep (chirp)"""
         try:
+            import numpy as np
+            
             sample_rate = 22050
             duration = duration_ms / 1000.0
             samples = int(sample_rate * duration)
@@ -130,7 +175,7 @@ class AudioManager:
             
             return pygame.sndarray.make_sound(stereo_wave)
         except Exception as e:
-            print(f"Error generating sweep: {e}")
+            logger.error("Error generating sweep: %s", e)
             return None
     
     def _generate_game_over(self):
@@ -149,7 +194,7 @@ class AudioManager:
             # Combine sounds (play first one, others will queue)
             return sounds[0] if sounds else None
         except Exception as e:
-            print(f"Error generating game over sound: {e}")
+            logger.error("Error generating game over sound: %s", e)
             return None
     
     def _generate_victory(self):
@@ -167,7 +212,7 @@ class AudioManager:
             
             return sounds[0] if sounds else None
         except Exception as e:
-            print(f"Error generating victory sound: {e}")
+            logger.error("Error generating victory sound: %s", e)
             return None
     
     def play_sound(self, sound_name):
@@ -181,12 +226,12 @@ class AudioManager:
             return
         
         try:
-            sound = self._sounds.get(sound_name)
+            sound = self._get_sound(sound_name)
             if sound:
                 sound.set_volume(self._sfx_volume)
                 sound.play()
         except Exception as e:
-            print(f"Error playing sound {sound_name}: {e}")
+            logger.error("Error playing sound %s: %s", sound_name, e)
     
     def play_music(self, music_name, loop=True):
         """
@@ -199,6 +244,11 @@ class AudioManager:
         if not self._audio_available:
             return
         
+        if music_name in self._procedural_only or (
+                self._procedural_enabled and music_name in self._procedural_music):
+            self._play_procedural_music(music_name)
+            return
+        
         try:
             # Check if music file exists
             music_path = None
@@ -217,7 +267,60 @@ class AudioManager:
                 # No music file - silent is okay
                 pass
         except Exception as e:
-            print(f"Error playing music {music_name}: {e}")
+            logger.error("Error playing music %s: %s", music_name, e)
+    
+    def _play_procedural_music(self, music_name):
+        """
+        Stream music from the procedural engine on its reserved channel
+        
+        Args:
+            music_name: Name of the piece (for current-music tracking)
+        """
+        try:
+            pygame.mixer.music.stop()
+            if self._music_engine is None:
+                from core.music_engine import MusicEngine
+                self._music_engine = MusicEngine(volume=self._music_volume,
+                                                 latency_frames=self.MIXER_BUFFER,
+                                                 offset=self.audio_offset)
+            self._music_engine.start()
+            self._current_music = music_name
+        except Exception as e:
+            logger.error("Error starting procedural music %s: %s", music_name, e)
+    
+    def update_music(self, time_remaining, spawn_rate, beat=None):
+        """
+        Steer procedural music tempo and intensity from the game state
+        
+        Args:
+            time_remaining: Seconds left in the session
+            spawn_rate: Current spawns per second
+            beat: Game beat position to lock the music to (None = free-running)
+        """
+        if self._music_engine is not None:
+            self._music_engine.set_state(time_remaining, spawn_rate, beat)
+    
+    def set_audio_offset(self, offset):
+        """
+        Set and save the calibrated output delay
+        
+        Args:
+            offset: Seconds the music is heard later than the mixer buffer
+                    alone accounts for (negative = earlier)
+        """
+        self._audio_offset = offset
+        save_json(get_data_path(self.CALIBRATION_FILE), {'offset_ms': round(offset * 1000.0, 1)})
+        if self._music_engine is not None:
+            self._music_engine.beat_clock.set_offset(offset)
+    
+    def set_procedural_music(self, enabled):
+        """
+        Choose between procedural music and music files for procedural pieces
+        
+        Args:
+            enabled: False plays assets/sounds/ files for every piece
+        """
+        self._procedural_enabled = enabled
     
     def stop_music(self):
         """Stop background music"""
@@ -226,9 +329,12 @@ class AudioManager:
         
         try:
             pygame.mixer.music.stop()
+            if self._music_engine is not None and self._music_engine.is_running:
+                self._music_engine.stop()
+                logger.info(self._music_engine.format_report())
             self._current_music = None
         except Exception as e:
-            print(f"Error stopping music: {e}")
+            logger.error("Error stopping music: %s", e)
     
     def set_music_volume(self, volume):
         """
@@ -241,8 +347,10 @@ class AudioManager:
         if self._audio_available:
             try:
                 pygame.mixer.music.set_volume(self._music_volume)
+                if self._music_engine is not None:
+                    self._music_engine.set_volume(self._music_volume)
             except Exception as e:
-                print(f"Error setting music volume: {e}")
+                logger.error("Error setting music volume: %s", e)
     
     def set_sfx_volume(self, volume):
         """
@@ -262,9 +370,25 @@ class AudioManager:
             self.stop_music()
             pygame.mixer.quit()
         except Exception as e:
-            print(f"Error cleaning up audio: {e}")
+            logger.error("Error cleaning up audio: %s", e)
     
     @property
     def is_available(self):
         """Check if audio is available"""
         return self._audio_available
+    
+    @property
+    def audio_offset(self):
+        """Calibrated output delay in seconds (loaded from data/ on first use)"""
+        if self._audio_offset is None:
+            settings = load_json(get_data_path(self.CALIBRATION_FILE), {})
+            try:
+                self._audio_offset = float(settings.get('offset_ms', 0.0)) / 1000.0
+            except (AttributeError, TypeError, ValueError):
+                self._audio_offset = 0.0
+        return self._audio_offset
+    
+    @property
+    def music_engine(self):
+        """MusicEngine streaming procedural music (None until first played)"""
+        return self._music_engine
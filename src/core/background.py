@@ -1,37 +1,57 @@
 import pygame
+import numpy as np
+
+
+# Gradient surfaces shared by all Background instances:
+# (width, height, color_top, color_bottom) -> pygame.Surface
+_gradient_cache = {}
 
 
 class Background:
     """Renders a beautiful purple-to-blue gradient background"""
     
-    def __init__(self, width, height):
+    def __init__(self, width, height, color_top=(138, 43, 226), color_bottom=(25, 25, 112)):
         """
         Initialize background
         
         Args:
             width: Screen width
             height: Screen height
+            color_top: Top color (default Blue Violet)
+            color_bottom: Bottom color (default Midnight Blue)
         """
         self._width = width
         self._height = height
-        self._surface = pygame.Surface((width, height))
-        self._create_gradient()
+        self._color_top = tuple(color_top)
+        self._color_bottom = tuple(color_bottom)
+        
+        key = (width, height, self._color_top, self._color_bottom)
+        self._surface = _gradient_cache.get(key)
+        if self._surface is None:
+            self._surface = self._create_gradient()
+            _gradient_cache[key] = self._surface
     
     def _create_gradient(self):
-        """Create vertical gradient from purple to blue (encapsulated method)"""
-        # Top color (purple)
-        color_top = (138, 43, 226)  # Blue Violet
-        # Bottom color (blue)
-        color_bottom = (25, 25, 112)  # Midnight Blue
+        """
+        Create vertical gradient from top to bottom color (encapsulated method)
+        
+        All rows are interpolated at once with NumPy and written to the
+        surface in a single surfarray blit.
+        
+        Returns:
+            pygame.Surface: Gradient surface
+        """
+        surface = pygame.Surface((self._width, self._height))
+        
+        # Interpolate between colors for every row
+        ratio = (np.arange(self._height, dtype=np.float64) / self._height)[:, None]
+        top = np.array(self._color_top, dtype=np.float64)
+        bottom = np.array(self._color_bottom, dtype=np.float64)
+        rows = (top * (1 - ratio) + bottom * ratio).astype(np.uint8)
         
-        for y in range(self._height):
-            # Interpolate between colors
-            ratio = y / self._height
-            r = int(color_top[0] * (1 - ratio) + color_bottom[0] * ratio)
-            g = int(color_top[1] * (1 - ratio) + color_bottom[1] * ratio)
-            b = int(color_top[2] * (1 - ratio) + color_bottom[2] * ratio)
-            
-            pygame.draw.line(self._surface, (r, g, b), (0, y), (self._width, y))
+        # surfarray is indexed [x, y, channel]: repeat each row across the width
+        pygame.surfarray.blit_array(surface, np.broadcast_to(rows, (self._width, self._height, 3)))
+        return surface
     
     def draw(self, screen):
         """Draw the background to screen"""
@@ -0,0 +1,246 @@
+"""
+Beat timing: the session's beat grid and the beat as heard from the speakers
+Demonstrates: Encapsulation
+
+BeatGrid is the game's tempo map: beats as a function of session time
+(100 BPM, rising to 140 BPM over the last 20 seconds). It is a pure
+function of game time, so a spawn timeline quantised to it is reproducible
+from its seed, and snapshots and recorded sessions replay exactly.
+
+BeatClock follows the audio device instead. The music engine reports when
+each chunk starts playing in the mixer; that gives the mixer's sample clock
+in perf_counter time. A frame is heard one mixer buffer later (512 frames
+at 22050 Hz is 23 ms), plus a calibration offset measured from the
+player's taps. Reports arrive late by up to one worker poll, so the clock
+follows the earliest report over a sliding window. Once the window has
+filled it moves by at most half a millisecond per report: drift between
+the audio clock and perf_counter is corrected without the beat ever jumping.
+"""
+import math
+from collections import deque
+
+
+class BeatGrid:
+    """
+    Tempo map of a session
+    Encapsulation: Tempo curve parameters are private; beats and times
+    are converted with beat_at()/time_of_beat()
+    """
+
+    BASE_TEMPO = 100.0
+    MAX_TEMPO = 140.0
+    RAMP_SECONDS = 20.0
+
+    def __init__(self, duration=60.0, base_tempo=BASE_TEMPO, max_tempo=MAX_TEMPO,
+                 ramp_seconds=RAMP_SECONDS):
+        """
+        Args:
+            duration: Session length in seconds
+            base_tempo: Beats per minute until the ramp starts
+            max_tempo: Beats per minute at the end of the session (and after it)
+            ramp_seconds: Length of the tempo ramp at the end of the session
+        """
+        self._duration = duration
+        self._base = base_tempo
+        self._max = max_tempo
+        self._ramp_start = max(0.0, duration - ramp_seconds)
+        self._ramp = duration - self._ramp_start
+        self._acceleration = (max_tempo - base_tempo) / self._ramp if self._ramp else 0.0
+
+        # Beats at the start and at the end of the ramp
+        self._ramp_start_beat = base_tempo * self._ramp_start / 60.0
+        self._end_beat = self._ramp_start_beat + self._ramp_beats(self._ramp)
+
+    def _ramp_beats(self, seconds):
+        """Beats played in the first seconds of the ramp"""
+        return (self._base * seconds + self._acceleration * seconds * seconds / 2.0) / 60.0
+
+    def tempo_at(self, elapsed):
+        """
+        Tempo at a session time
+
+        Args:
+            elapsed: Seconds since session start
+
+        Returns:
+            float: Beats per minute
+        """
+        if elapsed <= self._ramp_start:
+            return self._base
+        if elapsed >= self._duration:
+            return self._max
+        return self._base + self._acceleration * (elapsed - self._ramp_start)
+
+    def beat_at(self, elapsed):
+        """
+        Beat position at a session time
+
+        Args:
+            elapsed: Seconds since session start
+
+        Returns:
+            float: Beats since session start (fraction = phase within the beat)
+        """
+        if elapsed <= self._ramp_start:
+            return self._base * elapsed / 60.0
+        if elapsed >= self._duration:
+            return self._end_beat + self._max * (elapsed - self._duration) / 60.0
+        return self._ramp_start_beat + self._ramp_beats(elapsed - self._ramp_start)
+
+    def time_of_beat(self, beat):
+        """
+        Session time of a beat position (inverse of beat_at)
+
+        Args:
+            beat: Beats since session start
+
+        Returns:
+            float: Seconds since session start
+        """
+        if beat <= self._ramp_start_beat:
+            return beat * 60.0 / self._base
+        if beat >= self._end_beat:
+            return self._duration + (beat - self._end_beat) * 60.0 / self._max
+        # Solve base * x + acceleration * x^2 / 2 = 60 * beats for x
+        beats = (beat - self._ramp_start_beat) * 60.0
+        seconds = (-self._base + math.sqrt(self._base * self._base + 2.0 * self._acceleration * beats)) \
+            / self._acceleration
+        return self._ramp_start + seconds
+
+    def next_time(self, elapsed, subdivision=1):
+        """
+        First grid point at or after a session time
+
+        Args:
+            elapsed: Seconds since session start
+            subdivision: Grid points per beat (2 = eighth notes)
+
+        Returns:
+            float: Seconds since session start
+        """
+        points = math.ceil(self.beat_at(elapsed) * subdivision - 1e-9)
+        return self.time_of_beat(points / subdivision)
+
+    # Properties
+    @property
+    def duration(self):
+        return self._duration
+
+
+class BeatClock:
+    """
+    Maps mixer sample frames to the perf_counter time they are heard
+    Encapsulation: The estimated origin of the sample clock and the
+    reports it is fitted to are private
+    """
+
+    # Chunk start reports in the sliding minimum (about 1.5 s of 46 ms chunks)
+    WINDOW = 32
+
+    # Largest correction applied per report, in seconds
+    MAX_SLEW = 0.0005
+
+    def __init__(self, sample_rate, latency_frames, offset=0.0):
+        """
+        Args:
+            sample_rate: Mixer sample rate
+            latency_frames: Mixer buffer size in frames (delay from mixing to output)
+            offset: Calibrated extra delay in seconds (positive = heard later)
+        """
+        self._rate = float(sample_rate)
+        self._latency = latency_frames / self._rate
+        self._offset = offset
+
+        # perf_counter time at which frame 0 was mixed
+        self._origin = None
+        self._candidates = deque(maxlen=self.WINDOW)
+        self._reports = 0
+        self._drift = 0.0
+
+    def restart(self, frame, started_at):
+        """
+        Start a new stretch of continuous playback (stream start or after an underrun)
+
+        Args:
+            frame: Frame index that started playing
+            started_at: perf_counter time it started
+        """
+        self._origin = started_at - frame / self._rate
+        self._candidates.clear()
+        self._reports = 0
+
+    def observe(self, frame, observed_at):
+        """
+        Report that a frame has started playing in the mixer
+
+        Args:
+            frame: Frame index (the first frame of a chunk)
+            observed_at: perf_counter time the start was noticed (never early)
+        """
+        candidate = observed_at - frame / self._rate
+        self._candidates.append(candidate)
+        if self._reports < self.WINDOW or self._origin is None:
+            # Settling: the earliest report so far is the best estimate
+            self._origin = min(self._candidates)
+        else:
+            step = min(self._candidates) - self._origin
+            step = max(-self.MAX_SLEW, min(self.MAX_SLEW, step))
+            self._origin += step
+            self._drift += step
+        self._reports += 1
+
+    def heard_at(self, frame):
+        """
+        perf_counter time a frame reaches the speakers
+
+        Args:
+            frame: Frame index
+
+        Returns:
+            float: perf_counter time (None before playback started)
+        """
+        if self._origin is None:
+            return None
+        return self._origin + frame / self._rate + self._latency + self._offset
+
+    def frame_heard_at(self, time_point):
+        """
+        Frame reaching the speakers at a perf_counter time
+
+        Args:
+            time_point: perf_counter time
+
+        Returns:
+            float: Frame index (None before playback started)
+        """
+        if self._origin is None:
+            return None
+        return (time_point - self._latency - self._offset - self._origin) * self._rate
+
+    def set_offset(self, offset):
+        """
+        Set the calibrated extra delay
+
+        Args:
+            offset: Seconds (positive = heard later than the mixer latency alone)
+        """
+        self._offset = offset
+
+    # Properties
+    @property
+    def offset(self):
+        return self._offset
+
+    @property
+    def latency(self):
+        """Total delay from mixing to hearing in seconds (buffer plus offset)"""
+        return self._latency + self._offset
+
+    @property
+    def drift(self):
+        """Total drift correction applied to the sample clock, in seconds"""
+        return self._drift
+
+    @property
+    def is_running(self):
+        return self._origin is not None
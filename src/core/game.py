@@ -2,54 +2,151 @@
 Main game logic controller
 Demonstrates: Composition, Encapsulation, Exception Handling
 """
+import struct
+from collections import namedtuple
 import pygame
-import random
+import numpy as np
 from core.player import Player
-from core.item import GoodItem, BadItem
+from core.item import SPEED_FRAME_RATE, create_item, draw_item
+from core.item_registry import ItemRegistry
 from core.background import Background
+from core.beat_clock import BeatGrid
+from core.spawn_scheduler import LinearSpawnScheduler
+from utils.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+
+# Key bindings as (left keys, right keys) per player
+SINGLE_PLAYER_BINDINGS = ((pygame.K_LEFT, pygame.K_a), (pygame.K_RIGHT, pygame.K_d))
+MULTI_PLAYER_BINDINGS = (
+    ((pygame.K_a,), (pygame.K_d,)),
+    ((pygame.K_LEFT,), (pygame.K_RIGHT,)),
+    ((pygame.K_j,), (pygame.K_l,)),
+    ((pygame.K_KP4,), (pygame.K_KP6,)),
+)
+MAX_PLAYERS = len(MULTI_PLAYER_BINDINGS)
+
+# Items appear above the top edge of the screen
+SPAWN_Y = -30
+
+# Collision modes: rectangle overlap only, or rectangles confirmed by sprite masks
+COLLISION_AABB = 'aabb'
+COLLISION_PIXEL = 'pixel'
+COLLISION_MODES = (COLLISION_AABB, COLLISION_PIXEL)
+
+# Snapshot layout (little-endian, struct-packed)
+SNAPSHOT_MAGIC = b'MBGS'
+SNAPSHOT_VERSION = 4
+_SNAPSHOT_HEADER = struct.Struct('<4sHB')        # magic, version, player count
+_SNAPSHOT_GAME = struct.Struct('<fIIIdBBHB')     # time left, spawned, seed, cursor, elapsed ms,
+                                                 # game over, reason code, item count, beat subdivision
+_SNAPSHOT_PLAYER = struct.Struct('<ffBBfiBHHH')  # x, velocity, sprite state, bad flag, bad timer,
+                                                 # score, hp, total/good/bad caught
+_SNAPSHOT_ITEM = struct.Struct('<Hhff')          # item type index, x, y, speed
+_PLAYER_STATES = ('idle', 'left', 'right')
+_GAME_OVER_REASONS = ("", "Time's up!", "HP habis!")
+
+# HUD colour per player (single player keeps the classic white score)
+PLAYER_COLORS = ((96, 165, 250), (251, 146, 60), (192, 132, 252), (45, 212, 191))
+
+# Immutable view of everything Game.draw shows (see Game.capture_frame):
+#   items   (item type, (x, y)) per live item
+#   players (player index, Player.get_render_state()) per drawn player
+#   hud     (score, hp, is_out) per player
+GameFrame = namedtuple('GameFrame', ('items', 'players', 'hud', 'time_remaining', 'is_game_over'))
+
+
+class PlayerState:
+    """
+    Per-player score, HP and statistics
+    Simple composition component used by Game
+    """
+    
+    def __init__(self, max_hp=3):
+        self.score = 0
+        self.hp = max_hp
+        self.total_caught = 0
+        self.good_caught = 0
+        self.bad_caught = 0
+    
+    @property
+    def is_out(self):
+        """Player has no HP left and no longer catches items"""
+        return self.hp <= 0
 
 
 class Game:
     """
     Main game controller
-    Composition: Contains Player, Items, Background
+    Composition: Contains Players, Items, Background, SpawnScheduler
     Encapsulation: Private game state management
     """
     
-    def __init__(self, screen_width, screen_height):
+    def __init__(self, screen_width, screen_height, spawn_scheduler=None, num_players=1,
+                 collision_mode=COLLISION_PIXEL, beat_subdivision=0):
         """
         Initialize game
         
         Args:
             screen_width: Width of game screen
             screen_height: Height of game screen
+            spawn_scheduler: Optional SpawnScheduler (default: linear curve)
+            num_players: Number of local players (1-4)
+            collision_mode: COLLISION_PIXEL (sprite masks) or COLLISION_AABB
+            beat_subdivision: Quantise spawns so items reach the players on
+                              this many grid points per beat (0 = free timing)
         """
         self._width = screen_width
         self._height = screen_height
+        self._num_players = max(1, min(MAX_PLAYERS, num_players))
+        self._collision_mode = COLLISION_AABB
+        self.set_collision_mode(collision_mode)
+        
+        if self._num_players == 1:
+            self._bindings = (SINGLE_PLAYER_BINDINGS,)
+        else:
+            self._bindings = MULTI_PLAYER_BINDINGS[:self._num_players]
         
         # Composition: Game contains these objects
-        self._background = Background(screen_width, screen_height)
-        self._player = Player(screen_width // 2, screen_height - 80, screen_width)
+        # (background is built on first use; GameScreen draws its own image)
+        self._background = None
+        self._players = [
+            Player(screen_width * (i + 1) // (self._num_players + 1), screen_height - 80, screen_width)
+            for i in range(self._num_players)
+        ]
         self._items = []
         
         # Game state (encapsulated)
-        self._score = 0
-        self._hp = 3
         self._max_hp = 3
+        self._player_states = [PlayerState(self._max_hp) for _ in range(self._num_players)]
         self._time_remaining = 60.0  # 60 seconds
-        self._spawn_timer = 0
-        self._spawn_interval = 1000  # milliseconds
+        self._spawn_scheduler = spawn_scheduler or LinearSpawnScheduler(screen_width)
         self._last_time = pygame.time.get_ticks()
         
+        # Beat grid of the session (music locks to it; see core/beat_clock.py)
+        self._beat_grid = BeatGrid(duration=self._time_remaining)
+        self._set_beat_subdivision(beat_subdivision)
+        if beat_subdivision:
+            self._spawn_scheduler.generate(self._spawn_scheduler.seed)
+        self._delta_time = 0.0
+        
         # Statistics
-        self._total_caught = 0
-        self._good_caught = 0
-        self._bad_caught = 0
         self._total_spawned = 0
         
         # Game state flags
         self._is_game_over = False
         self._game_over_reason = ""
+        
+        # Fonts for player labels (created on first multiplayer draw)
+        self._label_font = None
+        self._label_surfaces = {}
+        
+        # HUD fonts and rendered texts, re-rendered only when a text changes
+        self._hud_font = None
+        self._hud_small_font = None
+        self._hud_texts = {}
     
     def handle_input(self, keys):
         """
@@ -58,22 +155,41 @@ class Game:
         Args:
             keys: pygame key state
         """
-        if keys[pygame.K_LEFT] or keys[pygame.K_a]:
-            self._player.move_left()
-        elif keys[pygame.K_RIGHT] or keys[pygame.K_d]:
-            self._player.move_right()
-        else:
-            self._player.stop()
+        for player, (left_keys, right_keys) in zip(self._players, self._bindings):
+            if any(keys[key] for key in left_keys):
+                player.move_left()
+            elif any(keys[key] for key in right_keys):
+                player.move_right()
+            else:
+                player.stop()
     
-    def update(self):
-        """Update game state"""
+    def apply_input(self, axes):
+        """
+        Apply sub-frame input (see InputManager.get_axis)
+        
+        Args:
+            axes: One (axis, held) tuple per player, in binding order
+        """
+        for player, (axis, held) in zip(self._players, axes):
+            player.move(axis, held)
+    
+    def update(self, delta_time=None):
+        """
+        Update game state
+        
+        Args:
+            delta_time: Seconds to advance; None measures the time since the
+                        last update (replays pass the recorded value)
+        """
         if self._is_game_over:
             return
         
         # Update timer
         current_time = pygame.time.get_ticks()
-        delta_time = (current_time - self._last_time) / 1000.0  # seconds
+        if delta_time is None:
+            delta_time = (current_time - self._last_time) / 1000.0  # seconds
         self._last_time = current_time
+        self._delta_time = delta_time
         
         self._time_remaining -= delta_time
         if self._time_remaining <= 0:
@@ -82,85 +198,315 @@ class Game:
             self._game_over_reason = "Time's up!"
             return
         
-        # Check HP
-        if self._hp <= 0:
-            self._hp = 0
+        # Check HP (game ends when every player is out)
+        for state in self._player_states:
+            if state.hp < 0:
+                state.hp = 0
+        if all(state.is_out for state in self._player_states):
             self._is_game_over = True
             self._game_over_reason = "HP habis!"
             return
         
-        # Update player with delta time
-        self._player.update(delta_time)
-        
-        # Spawn items
-        self._spawn_timer += delta_time * 1000
-        if self._spawn_timer >= self._spawn_interval:
-            self._spawn_item()
-            self._spawn_timer = 0
-            # Gradually increase difficulty
-            if self._spawn_interval > 500:
-                self._spawn_interval -= 10
-        
-        # Update items
-        player_rect = self._player.get_rect()
-        for item in self._items[:]:
-            item.update()
-            
-            # Check collision
-            if not item.is_caught and item.check_collision(player_rect):
-                self._catch_item(item)
-            
-            # Remove off-screen items
-            if item.is_off_screen or item.is_caught:
-                self._items.remove(item)
-    
-    def _spawn_item(self):
-        """Spawn a new item (encapsulated method)"""
+        # Update players with delta time
+        for player in self._players:
+            player.update(delta_time)
+        
+        # Update items (by time, so they fall at the same rate at any frame rate)
+        for item in self._items:
+            item.update(delta_time)
+        
+        # Spawn items that became due on the precomputed timeline
+        for spawn_index in self._spawn_scheduler.advance(delta_time * 1000):
+            self._spawn_item(spawn_index)
+        
+        # Check collisions for all items against all players at once
+        for item, player_index in self._resolve_collisions():
+            self._catch_item(item, player_index)
+        
+        # Remove off-screen and caught items
+        self._items = [item for item in self._items
+                       if not (item.is_off_screen or item.is_caught)]
+    
+    def _set_beat_subdivision(self, subdivision):
+        """
+        Configure beat quantisation of the spawn timeline (applies from its next generate)
+        
+        Args:
+            subdivision: Grid points per beat, 0 for free timing
+        """
+        # Items are caught when they reach the top edge of the players
+        player = self._players[0]
+        fall_distance = player.y - player.height / 2 - SPAWN_Y
+        self._spawn_scheduler.set_beat_quantisation(
+            self._beat_grid if subdivision else None, subdivision, fall_distance)
+    
+    def set_collision_mode(self, mode):
+        """
+        Choose how catches are detected
+        
+        Args:
+            mode: COLLISION_PIXEL or COLLISION_AABB
+        
+        Raises:
+            ValueError: If the mode is unknown
+        """
+        if mode not in COLLISION_MODES:
+            raise ValueError(f"unknown collision mode: {mode}")
+        self._collision_mode = mode
+    
+    def reset(self):
+        """
+        Start a new session in place
+        
+        Keeps the already created background (if any), player sprites and scheduler;
+        only the session state and the spawn timeline are renewed.
+        """
+        for index, player in enumerate(self._players):
+            player.set_state(self._width * (index + 1) // (self._num_players + 1))
+        self._items = []
+        self._player_states = [PlayerState(self._max_hp) for _ in range(self._num_players)]
+        self._time_remaining = 60.0
+        self._spawn_scheduler.generate()
+        self._last_time = pygame.time.get_ticks()
+        self._total_spawned = 0
+        self._is_game_over = False
+        self._game_over_reason = ""
+    
+    def snapshot(self):
+        """
+        Serialise the full game state into a compact versioned snapshot
+        
+        The random state is captured as the spawn timeline seed plus cursor,
+        since every random decision of a session comes from that timeline.
+        Restoring regenerates the timeline on the same scheduler type.
+        
+        Returns:
+            bytes: Snapshot data
+        """
+        scheduler = self._spawn_scheduler
+        parts = [
+            _SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, self._num_players),
+            _SNAPSHOT_GAME.pack(
+                self._time_remaining, self._total_spawned, scheduler.seed,
+                scheduler.cursor, scheduler.elapsed, self._is_game_over,
+                _GAME_OVER_REASONS.index(self._game_over_reason), len(self._items),
+                scheduler.beat_subdivision
+            )
+        ]
+        for player, state in zip(self._players, self._player_states):
+            x, velocity_x, sprite_state, is_bad_state, bad_state_timer = player.get_state()
+            parts.append(_SNAPSHOT_PLAYER.pack(
+                x, velocity_x, _PLAYER_STATES.index(sprite_state), is_bad_state,
+                bad_state_timer, state.score, max(state.hp, 0), state.total_caught,
+                state.good_caught, state.bad_caught
+            ))
+        for item in self._items:
+            parts.append(_SNAPSHOT_ITEM.pack(item.type_index, int(item.x), item.y, item.speed))
+        return b''.join(parts)
+    
+    def restore(self, data):
+        """
+        Restore state from a snapshot made by snapshot()
+        
+        Args:
+            data: Snapshot bytes
+        
+        Raises:
+            ValueError: If the snapshot is invalid or for another player count
+        """
         try:
-            x = random.randint(50, self._width - 50)
-            y = -30
+            magic, version, num_players = _SNAPSHOT_HEADER.unpack_from(data, 0)
+            if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+                raise ValueError(f"unsupported snapshot (version {version})")
+            if num_players != self._num_players:
+                raise ValueError(f"snapshot is for {num_players} players, game has {self._num_players}")
+            offset = _SNAPSHOT_HEADER.size
             
-            # 70% chance for good item, 30% for bad
-            if random.random() < 0.7:
-                item = GoodItem(x, y)
-            else:
-                item = BadItem(x, y)
+            (time_remaining, total_spawned, seed, cursor, elapsed, is_game_over, reason,
+             item_count, beat_subdivision) = _SNAPSHOT_GAME.unpack_from(data, offset)
+            offset += _SNAPSHOT_GAME.size
+            
+            # Parsed completely before anything is applied, so an invalid
+            # snapshot leaves the running game untouched
+            player_positions = []
+            player_states = []
+            for _ in self._players:
+                (x, velocity_x, sprite_state, is_bad_state, bad_state_timer, score, hp,
+                 total_caught, good_caught, bad_caught) = _SNAPSHOT_PLAYER.unpack_from(data, offset)
+                offset += _SNAPSHOT_PLAYER.size
+                if sprite_state >= len(_PLAYER_STATES):
+                    raise ValueError(f"snapshot has unknown player sprite state {sprite_state}")
+                player_positions.append((x, velocity_x, _PLAYER_STATES[sprite_state],
+                                         bool(is_bad_state), bad_state_timer))
+                state = PlayerState(self._max_hp)
+                state.score = score
+                state.hp = hp
+                state.total_caught = total_caught
+                state.good_caught = good_caught
+                state.bad_caught = bad_caught
+                player_states.append(state)
+            
+            registry = ItemRegistry()
+            items = []
+            for _ in range(item_count):
+                type_index, x, y, speed = _SNAPSHOT_ITEM.unpack_from(data, offset)
+                offset += _SNAPSHOT_ITEM.size
+                items.append(create_item(registry.get(type_index), x, y, speed))
+            if reason >= len(_GAME_OVER_REASONS):
+                raise ValueError(f"snapshot has unknown game over reason {reason}")
+        except KeyError as e:
+            raise ValueError(f"snapshot has unknown item type {e}")
+        except struct.error as e:
+            raise ValueError(f"truncated snapshot: {e}")
+        
+        # Timeline: regenerate only if the snapshot came from another session
+        # or quantised it differently
+        if (seed != self._spawn_scheduler.seed or
+                beat_subdivision != self._spawn_scheduler.beat_subdivision):
+            self._set_beat_subdivision(beat_subdivision)
+            self._spawn_scheduler.generate(seed)
+        self._spawn_scheduler.seek(cursor, elapsed)
+        
+        for player, position in zip(self._players, player_positions):
+            player.set_state(*position)
+        self._player_states = player_states
+        self._items = items
+        self._time_remaining = time_remaining
+        self._total_spawned = total_spawned
+        self._is_game_over = bool(is_game_over)
+        self._game_over_reason = _GAME_OVER_REASONS[reason]
+        self._last_time = pygame.time.get_ticks()
+    
+    def _resolve_collisions(self):
+        """
+        Compute item-versus-player overlaps as one matrix operation
+        
+        Builds an (items x players) overlap matrix from the same rectangles
+        BaseItem.check_collision uses (broadphase). In pixel mode only those
+        rect hits are then confirmed with sprite masks (narrowphase). An
+        item overlapping several players
+        goes to the player whose centre is horizontally nearest; exact ties go
+        to the lowest player index (argmin returns the first minimum).
+        
+        Returns:
+            list: (item, player_index) pairs caught this frame
+        """
+        try:
+            items = [item for item in self._items if not item.is_caught]
+            if not items:
+                return []
             
-            self._items.append(item)
+            count = len(items)
+            item_x = np.fromiter((item.x for item in items), dtype=np.float64, count=count)
+            item_y = np.fromiter((item.y for item in items), dtype=np.float64, count=count)
+            radius = np.fromiter((item.radius for item in items), dtype=np.float64, count=count)
+            
+            # pygame.Rect truncates float coordinates towards zero
+            item_left = np.trunc(item_x - radius)
+            item_top = np.trunc(item_y - radius)
+            item_right = item_left + np.trunc(radius * 2)
+            item_bottom = item_top + np.trunc(radius * 2)
+            
+            rects = [player.get_rect() for player in self._players]
+            player_left = np.array([rect.left for rect in rects], dtype=np.float64)
+            player_top = np.array([rect.top for rect in rects], dtype=np.float64)
+            player_right = np.array([rect.right for rect in rects], dtype=np.float64)
+            player_bottom = np.array([rect.bottom for rect in rects], dtype=np.float64)
+            player_x = np.array([player.x for player in self._players], dtype=np.float64)
+            active = np.array([not state.is_out for state in self._player_states])
+            
+            overlap = (
+                (item_left[:, None] < player_right[None, :]) &
+                (item_right[:, None] > player_left[None, :]) &
+                (item_top[:, None] < player_bottom[None, :]) &
+                (item_bottom[:, None] > player_top[None, :]) &
+                active[None, :]
+            )
+            
+            if self._collision_mode == COLLISION_PIXEL:
+                self._narrowphase(items, overlap)
+            
+            hit_rows = np.flatnonzero(overlap.any(axis=1))
+            if hit_rows.size == 0:
+                return []
+            
+            # Deterministic tie-break: nearest player centre, then lowest index
+            distance = np.abs(item_x[hit_rows, None] - player_x[None, :])
+            distance = np.where(overlap[hit_rows], distance, np.inf)
+            winners = np.argmin(distance, axis=1)
+            
+            return [(items[row], int(winner)) for row, winner in zip(hit_rows, winners)]
+        except Exception as e:
+            logger.error("Collision detection error: %s", e)
+            return []
+    
+    def _narrowphase(self, items, overlap):
+        """
+        Clear rect hits whose opaque sprite pixels do not touch (in place)
+        
+        Args:
+            items: Items in overlap row order
+            overlap: Boolean (items x players) broadphase matrix
+        """
+        player_masks = [player.get_mask() for player in self._players]
+        for row, column in zip(*np.nonzero(overlap)):
+            mask, origin = player_masks[column]
+            if mask is not None and not items[row].overlaps_mask(mask, origin):
+                overlap[row, column] = False
+    
+    def _spawn_item(self, spawn_index):
+        """
+        Spawn a new item from the timeline (encapsulated method)
+        
+        Args:
+            spawn_index: Index into the spawn scheduler timeline
+        """
+        try:
+            x, type_index, speed = self._spawn_scheduler.get_spawn(spawn_index)
+            
+            # Start where it would be had it spawned exactly on time, so it
+            # reaches the players on its beat whatever the frame length
+            late = (self._spawn_scheduler.elapsed - self._spawn_scheduler.get_spawn_time(spawn_index)) / 1000.0
+            y = SPAWN_Y + speed * SPEED_FRAME_RATE * late
+            
+            # GoodItem or BadItem, sharing its type's sprite and effect
+            self._items.append(create_item(type_index, x, y, speed))
             self._total_spawned += 1
         except Exception as e:
-            print(f"Error spawning item: {e}")
+            logger.error("Error spawning item: %s", e)
     
-    def _catch_item(self, item):
+    def _catch_item(self, item, player_index=0):
         """
         Process catching an item (encapsulated method)
         
         Args:
             item: The caught item
+            player_index: Index of the player who caught it
         """
         try:
             item.catch()
             effect = item.get_effect()
+            state = self._player_states[player_index]
             
-            self._score += effect['score']
-            self._hp += effect['hp']
+            state.score += effect.score
+            state.hp += effect.hp
             
             # Cap HP at max
-            if self._hp > self._max_hp:
-                self._hp = self._max_hp
+            if state.hp > self._max_hp:
+                state.hp = self._max_hp
             
             # Trigger bad state on player if caught bad item
-            if effect['hp'] < 0:
-                self._player.trigger_bad_state()
+            if effect.hp < 0:
+                self._players[player_index].trigger_bad_state()
             
             # Update statistics
-            self._total_caught += 1
-            if effect['score'] > 0:
-                self._good_caught += 1
+            state.total_caught += 1
+            if effect.score > 0:
+                state.good_caught += 1
             else:
-                self._bad_caught += 1
+                state.bad_caught += 1
         except Exception as e:
-            print(f"Error catching item: {e}")
+            logger.error("Error catching item: %s", e)
     
     def draw(self, screen, draw_background=True):
         """
@@ -170,56 +516,156 @@ class Game:
             screen: pygame surface to draw on
             draw_background: Whether to draw the background (default True)
         """
+        self.draw_frame(screen, self.capture_frame(), draw_background)
+    
+    def capture_frame(self):
+        """
+        Capture the current state as an immutable GameFrame
+        
+        The frame shares nothing mutable with the game, so it can be drawn
+        while the game keeps updating (see core/sim_pipeline.py).
+        
+        Returns:
+            GameFrame: What draw() would show now
+        """
+        items = tuple((item.item_type, (int(item.x), int(item.y))) for item in self._items)
+        
+        # Eliminated players are not drawn in multiplayer
+        players = tuple(
+            (index, player.get_render_state())
+            for index, player in enumerate(self._players)
+            if self._num_players == 1 or not self._player_states[index].is_out
+        )
+        
+        hud = tuple((state.score, state.hp, state.is_out) for state in self._player_states)
+        return GameFrame(items, players, hud, self._time_remaining, self._is_game_over)
+    
+    def draw_frame(self, screen, frame, draw_background=True):
+        """
+        Draw a captured frame
+        
+        Args:
+            screen: pygame surface to draw on
+            frame: GameFrame from capture_frame()
+            draw_background: Whether to draw the background (default True)
+        """
         if draw_background:
-            self._background.draw(screen)
+            self.background.draw(screen)
         
         # Draw items
-        for item in self._items:
-            item.draw(screen)
+        for item_type, center in frame.items:
+            draw_item(screen, item_type, center)
         
-        # Draw player
-        self._player.draw(screen)
+        # Draw players
+        for index, render_state in frame.players:
+            player = self._players[index]
+            player.draw_state(screen, render_state)
+            if self._num_players > 1:
+                self._draw_player_label(screen, index, player, render_state[0])
         
         # Draw HUD
-        self._draw_hud(screen)
+        self._draw_hud(screen, frame)
     
-    def _draw_hud(self, screen):
+    def _draw_player_label(self, screen, index, player, x):
+        """Draw 'P1'..'P4' above a player (encapsulated method)"""
+        label = self._label_surfaces.get(index)
+        if label is None:
+            if self._label_font is None:
+                self._label_font = pygame.font.Font(None, 32)
+            label = self._label_font.render(f"P{index + 1}", True, PLAYER_COLORS[index])
+            self._label_surfaces[index] = label
+        label_rect = label.get_rect(center=(int(x), int(player.y - player.height // 2 - 10)))
+        screen.blit(label, label_rect)
+    
+    def _draw_hud(self, screen, frame):
         """Draw heads-up display (encapsulated method)"""
-        font = pygame.font.Font(None, 48)
-        small_font = pygame.font.Font(None, 36)
-        
-        # Score
-        score_text = font.render(f"Score: {self._score}", True, (255, 255, 255))
-        screen.blit(score_text, (20, 20))
+        if self._hud_font is None:
+            self._hud_font = pygame.font.Font(None, 48)
+            self._hud_small_font = pygame.font.Font(None, 36)
+        font = self._hud_font
+        small_font = self._hud_small_font
         
-        # HP
-        hp_color = (34, 197, 94) if self._hp > 1 else (239, 68, 68)
-        hp_text = font.render(f"HP: {self._hp}", True, hp_color)
-        screen.blit(hp_text, (20, 70))
+        if self._num_players == 1:
+            score, hp, _ = frame.hud[0]
+            
+            # Score
+            score_text = self._render_hud_text('score', font, f"Score: {score}", (255, 255, 255))
+            screen.blit(score_text, (20, 20))
+            
+            # HP
+            hp_color = (34, 197, 94) if hp > 1 else (239, 68, 68)
+            hp_text = self._render_hud_text('hp', font, f"HP: {hp}", hp_color)
+            screen.blit(hp_text, (20, 70))
+        else:
+            # One line per player: score and HP
+            for index, (score, hp, is_out) in enumerate(frame.hud):
+                color = PLAYER_COLORS[index] if not is_out else (120, 120, 120)
+                line = self._render_hud_text(
+                    index, small_font, f"P{index + 1}  Score: {score}  HP: {hp}", color
+                )
+                screen.blit(line, (20, 20 + index * 34))
         
         # Timer
-        time_color = (255, 255, 255) if self._time_remaining > 10 else (239, 68, 68)
-        time_text = small_font.render(f"Time: {int(self._time_remaining)}s", True, time_color)
+        time_remaining = frame.time_remaining
+        time_color = (255, 255, 255) if time_remaining > 10 else (239, 68, 68)
+        time_text = self._render_hud_text('time', small_font, f"Time: {int(time_remaining)}s", time_color)
         screen.blit(time_text, (self._width - 150, 30))
     
-    def get_results(self):
+    def _render_hud_text(self, slot, font, text, color):
         """
-        Get game results for high score screen
+        Rendered HUD text, reused while the slot's text and colour stay the same
+        
+        Args:
+            slot: Key of the HUD element
+            font: pygame.font.Font to render with
+            text: Text to show
+            color: Text colour
         
         Returns:
-            dict: Game statistics
+            pygame.Surface: Rendered text
         """
-        accuracy = (self._good_caught / self._total_caught * 100) if self._total_caught > 0 else 0
+        cached = self._hud_texts.get(slot)
+        if cached is not None and cached[0] == text and cached[1] == color:
+            return cached[2]
+        surface = font.render(text, True, color)
+        self._hud_texts[slot] = (text, color, surface)
+        return surface
+    
+    def _get_player_results(self, state):
+        """Build a results dict for one player (encapsulated method)"""
+        accuracy = (state.good_caught / state.total_caught * 100) if state.total_caught > 0 else 0
         
         return {
-            'score': self._score,
-            'total_caught': self._total_caught,
-            'good_caught': self._good_caught,
-            'bad_caught': self._bad_caught,
+            'score': state.score,
+            'total_caught': state.total_caught,
+            'good_caught': state.good_caught,
+            'bad_caught': state.bad_caught,
             'accuracy': accuracy,
             'time_played': 60.0 - self._time_remaining
         }
     
+    def get_results(self):
+        """
+        Get game results for high score screen
+        
+        In multiplayer the top-level stats are the winner's (highest score,
+        ties to the lowest player number) and every player's stats are listed
+        under 'players'.
+        
+        Returns:
+            dict: Game statistics
+        """
+        if self._num_players == 1:
+            return self._get_player_results(self._player_states[0])
+        
+        players = [self._get_player_results(state) for state in self._player_states]
+        winner = max(range(self._num_players), key=lambda index: (players[index]['score'], -index))
+        
+        results = dict(players[winner])
+        results['players'] = players
+        results['winner'] = winner
+        return results
+    
     # Properties for encapsulation
     @property
     def is_game_over(self):
@@ -227,12 +673,72 @@ class Game:
     
     @property
     def score(self):
-        return self._score
+        """Score of player 1"""
+        return self._player_states[0].score
     
     @property
     def hp(self):
-        return self._hp
+        """HP of player 1"""
+        return self._player_states[0].hp
     
     @property
     def time_remaining(self):
         return self._time_remaining
+    
+    @property
+    def delta_time(self):
+        """Seconds advanced by the last update"""
+        return self._delta_time
+    
+    @property
+    def background(self):
+        """Gradient background, constructed on first use"""
+        if self._background is None:
+            self._background = Background(self._width, self._height)
+        return self._background
+    
+    @property
+    def spawn_scheduler(self):
+        return self._spawn_scheduler
+    
+    @property
+    def beat_grid(self):
+        return self._beat_grid
+    
+    @property
+    def beat_position(self):
+        """Beats since session start on the session's beat grid"""
+        return self._beat_grid.beat_at(self._beat_grid.duration - self._time_remaining)
+    
+    @property
+    def beat_subdivision(self):
+        """Grid points per beat spawns are quantised to (0 = free timing)"""
+        return self._spawn_scheduler.beat_subdivision
+    
+    @property
+    def spawn_rate(self):
+        """Spawns per second over the next two seconds of the timeline"""
+        return self._spawn_scheduler.rate_at(self._spawn_scheduler.elapsed)
+    
+    @property
+    def collision_mode(self):
+        return self._collision_mode
+    
+    @property
+    def bindings(self):
+        """(left keys, right keys) for each player"""
+        return self._bindings
+    
+    @property
+    def num_players(self):
+        return self._num_players
+    
+    @property
+    def players(self):
+        """Player characters (read-only tuple)"""
+        return tuple(self._players)
+    
+    @property
+    def player_states(self):
+        """Per-player score/HP/statistics (read-only tuple)"""
+        return tuple(self._player_states)
@@ -0,0 +1,213 @@
+"""
+Timestamped input with sub-frame movement and input-to-present latency probe
+Singleton pattern: one event source for the whole game
+
+Events are pulled from the pygame queue whenever the game loop is idle
+(every millisecond while waiting for the next frame) and stamped on
+arrival, because pygame events carry no timestamp of their own. Each frame
+then sees exactly which part of the last frame interval a key was held, so
+a short tap still moves the player and a key released mid-frame moves it
+only for the time it was down.
+"""
+import time
+from collections import deque
+import pygame
+
+
+class InputManager:
+    """
+    Singleton input layer
+    Encapsulation: Raw events, key state and latency samples are private;
+    the game loop calls begin_frame()/mark_presented(), screens ask for axes
+    """
+
+    # A press released before it was ever sampled still counts this long
+    MIN_TAP_SECONDS = 1.0 / 60
+
+    # Events that count as player input for the latency probe
+    LATENCY_EVENTS = (pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN)
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(InputManager, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self._initialized = True
+
+        # Polled events waiting for the next frame: (timestamp, event)
+        self._queue = []
+
+        # Key state: key -> timestamp of the press that is still held
+        self._down = {}
+
+        # Current frame window and the key transitions inside it
+        now = time.perf_counter()
+        self._frame_start = now
+        self._frame_end = now
+        self._down_at_start = set()
+        self._transitions = []  # (timestamp, key, is_down, press_timestamp)
+
+        # Latency probe: arrival timestamps of inputs not yet on screen
+        self._unpresented = []
+        self._latencies = deque(maxlen=2000)
+
+    def poll(self):
+        """Move pending pygame events into the input queue, stamped now"""
+        events = pygame.event.get()
+        if events:
+            now = time.perf_counter()
+            self._queue.extend((now, event) for event in events)
+
+    def wait_until(self, deadline, poll_interval=0.001):
+        """
+        Sleep until a perf_counter deadline, polling input meanwhile
+
+        Args:
+            deadline: time.perf_counter() value to wait for
+            poll_interval: Seconds between polls
+        """
+        while True:
+            self.poll()
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return
+            time.sleep(min(remaining, poll_interval))
+
+    def begin_frame(self):
+        """
+        Close the input window for this frame
+
+        Returns:
+            list: pygame events received since the last frame, in order
+        """
+        self.poll()
+
+        self._frame_start = self._frame_end
+        self._frame_end = time.perf_counter()
+        self._down_at_start = set(self._down)
+        self._transitions = []
+
+        events = []
+        for stamp, event in self._queue:
+            events.append(event)
+            if event.type == pygame.KEYDOWN:
+                if event.key not in self._down:
+                    self._down[event.key] = stamp
+                    self._transitions.append((stamp, event.key, True, stamp))
+            elif event.type == pygame.KEYUP:
+                pressed_at = self._down.pop(event.key, None)
+                if pressed_at is not None:
+                    self._transitions.append((stamp, event.key, False, pressed_at))
+            if event.type in self.LATENCY_EVENTS:
+                self._unpresented.append(stamp)
+        self._queue = []
+        return events
+
+    def mark_presented(self):
+        """Record input-to-present latency for inputs handled this frame (call after flip)"""
+        if self._unpresented:
+            now = time.perf_counter()
+            self._latencies.extend(now - stamp for stamp in self._unpresented)
+            self._unpresented = []
+
+    def get_axis(self, left_keys, right_keys):
+        """
+        Horizontal input over the last frame interval
+
+        Left wins while both directions are held, as with a key snapshot.
+
+        Args:
+            left_keys: Keys that move left
+            right_keys: Keys that move right
+
+        Returns:
+            tuple: (axis, held) - axis in [-1, 1] is the time-weighted
+                   direction over the frame (-1 = left the whole frame);
+                   held is the direction held at the end of the frame
+        """
+        span = self._frame_end - self._frame_start
+        if span <= 0:
+            span = self.MIN_TAP_SECONDS
+
+        left_held = sum(1 for key in left_keys if key in self._down_at_start)
+        right_held = sum(1 for key in right_keys if key in self._down_at_start)
+
+        def direction():
+            return -1 if left_held else (1 if right_held else 0)
+
+        total = 0.0
+        cursor = self._frame_start
+        for stamp, key, is_down, pressed_at in self._transitions:
+            if key in left_keys:
+                side = -1
+            elif key in right_keys:
+                side = 1
+            else:
+                continue
+
+            total += direction() * (stamp - cursor)
+            cursor = stamp
+            step = 1 if is_down else -1
+            if side < 0:
+                left_held += step
+            else:
+                right_held += step
+
+            # Taps shorter than a frame still move the player
+            if not is_down and stamp - pressed_at < self.MIN_TAP_SECONDS:
+                total += side * (self.MIN_TAP_SECONDS - (stamp - pressed_at))
+        total += direction() * (self._frame_end - cursor)
+
+        axis = max(-1.0, min(1.0, total / span))
+        return axis, direction()
+
+    def get_presses(self, key):
+        """
+        Arrival times of presses of a key in the last frame interval
+
+        Args:
+            key: pygame key code
+
+        Returns:
+            list: time.perf_counter() stamps, oldest first
+        """
+        return [stamp for stamp, pressed_key, is_down, _ in self._transitions
+                if is_down and pressed_key == key]
+
+    def is_down(self, key):
+        """Whether a key is held (as of the last frame)"""
+        return key in self._down
+
+    def get_latency_stats(self):
+        """
+        Input-to-present latency percentiles over recent inputs
+
+        Returns:
+            dict: 'count', 'p50', 'p95', 'p99' and 'max' in milliseconds
+        """
+        samples = sorted(self._latencies)
+        if not samples:
+            return {'count': 0, 'p50': 0.0, 'p95': 0.0, 'p99': 0.0, 'max': 0.0}
+
+        def percentile(fraction):
+            index = min(len(samples) - 1, int(fraction * len(samples)))
+            return samples[index] * 1000.0
+
+        return {
+            'count': len(samples),
+            'p50': percentile(0.50),
+            'p95': percentile(0.95),
+            'p99': percentile(0.99),
+            'max': samples[-1] * 1000.0
+        }
+
+    def reset_latency_stats(self):
+        """Forget collected latency samples"""
+        self._latencies.clear()
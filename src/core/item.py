@@ -5,7 +5,15 @@ Demonstrates: Inheritance, Polymorphism, Encapsulation, Exception Handling
 import pygame
 import random
 from abc import ABC, abstractmethod
-from utils.load_image import get_assets_path, load_image_fit
+from core.item_registry import ItemRegistry
+from utils.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+
+# Item speeds are pixels per frame at this rate; items move by delta time
+SPEED_FRAME_RATE = 60
 
 
 class BaseItem(ABC):
@@ -13,65 +21,125 @@ class BaseItem(ABC):
     Abstract base class for falling items
     Inheritance: Parent class for GoodItem and BadItem
     Encapsulation: Private attributes with property accessors
+    Flyweight: Sprite, colours and effect live in the shared ItemType; an
+    item only stores its position, speed, caught flag and type
     """
     
-    def __init__(self, x, y, radius=20):
+    __slots__ = ('_x', '_y', '_speed', '_type', '_is_caught')
+    
+    # Kind of ItemType this class draws (see ITEM_CLASSES)
+    KIND = None
+    
+    def __init__(self, x, y, item_type=None, speed=None):
         """
         Initialize base item
         
         Args:
             x: Initial x position
             y: Initial y position
-            radius: Item size
+            item_type: ItemType, type index or type id (random type of this
+                       class's kind if omitted)
+            speed: Optional fall speed (random if omitted)
         """
+        registry = ItemRegistry()
+        if item_type is None:
+            item_type = random.choice([t for t in registry.types if t.kind == self.KIND])
+        self._type = registry.get(item_type)
         self._x = x
         self._y = y
-        self._radius = radius
-        self._speed = random.uniform(2.0, 4.0)
+        self._speed = speed if speed is not None else random.uniform(2.0, 4.0)
         self._is_caught = False
     
-    def update(self):
-        """Update item position (polymorphic method)"""
+    def update(self, delta_time=1/60):
+        """
+        Update item position (polymorphic method)
+        
+        Args:
+            delta_time: Seconds elapsed since last update (default 1/60 for 60 FPS)
+        """
         if not self._is_caught:
-            self._y += self._speed
+            self._y += self._speed * SPEED_FRAME_RATE * delta_time
     
-    @abstractmethod
     def draw(self, screen):
-        """Draw the item (abstract method - must be implemented by children)"""
-        pass
+        """Draw the item sprite, or the kind's fallback shape without one"""
+        draw_item(screen, self._type, (int(self._x), int(self._y)))
     
+    @classmethod
     @abstractmethod
+    def draw_fallback(cls, screen, item_type, center):
+        """
+        Draw a shape when the sprite is missing (abstract method - children differ)
+        
+        A class method so render snapshots can draw items by type and position.
+        
+        Args:
+            screen: pygame surface to draw on
+            item_type: ItemType of the item
+            center: Integer (x, y) of the item
+        """
+        pass
+    
     def get_effect(self):
         """
         Get the effect of catching this item
-        Returns: dict with 'score' and 'hp' changes
-        (Polymorphism: each child implements differently)
+        
+        Returns:
+            ItemEffect: Shared (score, hp, label) tuple of the item's type
         """
-        pass
+        return self._type.effect
     
-    def check_collision(self, player_rect):
+    def check_collision(self, player_rect, player_mask=None, mask_origin=(0, 0)):
         """
         Check collision with player
         
+        The rectangle test is the broadphase; with a player mask, a rect hit
+        is confirmed only if opaque pixels of both sprites overlap.
+        
         Args:
             player_rect: pygame.Rect of the player
-            
+            player_mask: Optional pygame.mask.Mask of the player sprite
+            mask_origin: Screen position of the player mask's top-left corner
+        
         Returns:
             bool: True if collision detected
         """
         try:
+            radius = self._type.radius
             item_rect = pygame.Rect(
-                self._x - self._radius,
-                self._y - self._radius,
-                self._radius * 2,
-                self._radius * 2
+                self._x - radius,
+                self._y - radius,
+                radius * 2,
+                radius * 2
             )
-            return item_rect.colliderect(player_rect)
+            if not item_rect.colliderect(player_rect):
+                return False
+            if player_mask is None:
+                return True
+            return self.overlaps_mask(player_mask, mask_origin)
         except Exception as e:
             # Exception handling
-            print(f"Collision detection error: {e}")
+            logger.error("Collision detection error: %s", e)
             return False
     
+    def overlaps_mask(self, mask, origin):
+        """
+        Pixel-accurate test against another sprite's mask (narrowphase)
+        
+        Args:
+            mask: pygame.mask.Mask of the other sprite
+            origin: Screen position of that mask's top-left corner
+        
+        Returns:
+            bool: True if opaque pixels overlap (True without a sprite mask)
+        """
+        own_mask = self._type.mask
+        if own_mask is None:
+            return True
+        # Same placement as draw(): sprite centred on the integer position
+        width, height = own_mask.get_size()
+        offset = (int(self._x) - width // 2 - origin[0], int(self._y) - height // 2 - origin[1])
+        return mask.overlap(own_mask, offset) is not None
+    
     def catch(self):
         """Mark item as caught"""
         self._is_caught = True
@@ -85,6 +153,28 @@ class BaseItem(ABC):
     def y(self):
         return self._y
     
+    @property
+    def speed(self):
+        return self._speed
+    
+    @property
+    def item_type(self):
+        """Shared ItemType of this item"""
+        return self._type
+    
+    @property
+    def type_index(self):
+        """Index of this item's type in the registry"""
+        return self._type.index
+    
+    @property
+    def name(self):
+        return self._type.effect.label
+    
+    @property
+    def radius(self):
+        return self._type.radius
+    
     @property
     def is_caught(self):
         return self._is_caught
@@ -102,58 +192,16 @@ class GoodItem(BaseItem):
     Polymorphism: Implements abstract methods with specific behavior
     """
     
-    # Class variable for available food types
-    FOOD_TYPES = ['banana', 'carrot', 'chicken', 'fish', 'milk', 'rice', 'vegetable']
-    
-    def __init__(self, x, y):
-        super().__init__(x, y, radius=30)
-        self._food_type = random.choice(self.FOOD_TYPES)
-        self._name = self._food_type.capitalize()
-        self._color = (34, 197, 94)  # Green (fallback)
-        self._outline_color = (22, 163, 74)
-        
-        # Load food image
-        self._load_image()
-    
-    def _load_image(self):
-        """Load food sprite image"""
-        try:
-            image_path = get_assets_path('images', 'foods', f'{self._food_type}.png')
-            image, width, height = load_image_fit(
-                image_path, 
-                self._radius * 2, 
-                self._radius * 2, 
-                convert_alpha=True
-            )
-            self._image = image
-            self._image_width = width
-            self._image_height = height
-        except Exception as e:
-            print(f"Error loading good food image '{self._food_type}.png': {e}")
-            self._image = None
-    
-    def draw(self, screen):
-        """Draw good item using sprite image (polymorphic implementation)"""
-        if self._image:
-            # Draw sprite image
-            image_rect = self._image.get_rect(center=(int(self._x), int(self._y)))
-            screen.blit(self._image, image_rect)
-        else:
-            # Fallback to colored circle if image not loaded
-            pygame.draw.circle(screen, self._outline_color, 
-                             (int(self._x), int(self._y)), self._radius + 2)
-            pygame.draw.circle(screen, self._color, 
-                             (int(self._x), int(self._y)), self._radius)
-            pygame.draw.circle(screen, (187, 247, 208), 
-                             (int(self._x - 5), int(self._y - 5)), 6)
+    __slots__ = ()
+    KIND = 'good'
     
-    def get_effect(self):
-        """Good item adds 5 score (polymorphic implementation)"""
-        return {'score': 5, 'hp': 0, 'name': self._name}
-    
-    @property
-    def name(self):
-        return self._name
+    @classmethod
+    def draw_fallback(cls, screen, item_type, center):
+        """Colored circle if the image is not loaded (polymorphic implementation)"""
+        radius = item_type.radius
+        pygame.draw.circle(screen, item_type.outline_color, center, radius + 2)
+        pygame.draw.circle(screen, item_type.color, center, radius)
+        pygame.draw.circle(screen, (187, 247, 208), (center[0] - 5, center[1] - 5), 6)
 
 
 class BadItem(BaseItem):
@@ -163,54 +211,59 @@ class BadItem(BaseItem):
     Polymorphism: Implements abstract methods differently than GoodItem
     """
     
-    # Class variable for available bad food types
-    FOOD_TYPES = ['banana', 'carrot', 'chicken', 'fish', 'milk', 'rice', 'vegetable']
+    __slots__ = ()
+    KIND = 'bad'
     
-    def __init__(self, x, y):
-        super().__init__(x, y, radius=30)
-        self._food_type = random.choice(self.FOOD_TYPES)
-        self._color = (239, 68, 68)  # Red (fallback)
-        self._outline_color = (220, 38, 38)
-        
-        # Load bad food image
-        self._load_image()
+    @classmethod
+    def draw_fallback(cls, screen, item_type, center):
+        """Colored circle with X mark if the image is not loaded (polymorphic implementation)"""
+        x, y = center
+        radius = item_type.radius
+        pygame.draw.circle(screen, item_type.outline_color, center, radius + 2)
+        pygame.draw.circle(screen, item_type.color, center, radius)
+        pygame.draw.line(screen, (255, 255, 255),
+                        (x - 8, y - 8),
+                        (x + 8, y + 8), 3)
+        pygame.draw.line(screen, (255, 255, 255),
+                        (x + 8, y - 8),
+                        (x - 8, y + 8), 3)
+
+
+# Item class per manifest kind
+ITEM_CLASSES = {'good': GoodItem, 'bad': BadItem}
+
+
+def create_item(item_type, x, y, speed=None):
+    """
+    Create a live item of a registered type
     
-    def _load_image(self):
-        """Load bad food sprite image"""
-        try:
-            image_path = get_assets_path('images', 'foods', f'{self._food_type}-bad.png')
-            image, width, height = load_image_fit(
-                image_path, 
-                self._radius * 2, 
-                self._radius * 2, 
-                convert_alpha=True
-            )
-            self._image = image
-            self._image_width = width
-            self._image_height = height
-        except Exception as e:
-            print(f"Error loading bad food image '{self._food_type}-bad.png': {e}")
-            self._image = None
+    Args:
+        item_type: ItemType, type index or type id
+        x: Initial x position
+        y: Initial y position
+        speed: Optional fall speed (random if omitted)
     
-    def draw(self, screen):
-        """Draw bad item using sprite image (polymorphic implementation)"""
-        if self._image:
-            # Draw sprite image
-            image_rect = self._image.get_rect(center=(int(self._x), int(self._y)))
-            screen.blit(self._image, image_rect)
-        else:
-            # Fallback to colored circle with X mark if image not loaded
-            pygame.draw.circle(screen, self._outline_color, 
-                             (int(self._x), int(self._y)), self._radius + 2)
-            pygame.draw.circle(screen, self._color, 
-                             (int(self._x), int(self._y)), self._radius)
-            pygame.draw.line(screen, (255, 255, 255),
-                            (self._x - 8, self._y - 8),
-                            (self._x + 8, self._y + 8), 3)
-            pygame.draw.line(screen, (255, 255, 255),
-                            (self._x + 8, self._y - 8),
-                            (self._x - 8, self._y + 8), 3)
+    Returns:
+        BaseItem: GoodItem or BadItem, depending on the type's kind
+    """
+    item_type = ItemRegistry().get(item_type)
+    return ITEM_CLASSES[item_type.kind](x, y, item_type, speed)
+
+
+def draw_item(screen, item_type, center):
+    """
+    Draw an item of a type at a position
     
-    def get_effect(self):
-        """Bad item reduces 1 HP (polymorphic implementation)"""
-        return {'score': 0, 'hp': -1, 'name': 'Busuk!'}
+    Used by BaseItem.draw and by renderers working from snapshots, which
+    have no live item to draw.
+    
+    Args:
+        screen: pygame surface to draw on
+        item_type: ItemType of the item
+        center: Integer (x, y) of the item
+    """
+    image = item_type.sprite
+    if image:
+        screen.blit(image, image.get_rect(center=center))
+    else:
+        ITEM_CLASSES[item_type.kind].draw_fallback(screen, item_type, center)
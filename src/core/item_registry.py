@@ -0,0 +1,274 @@
+"""
+Data-driven item types loaded from assets/items.json
+Singleton pattern (registry) + Flyweight pattern (item types)
+
+Everything that is the same for every item of a food type - sprite, mask,
+colours, catch effect and spawn weight - lives once in its ItemType. Live
+items only keep their position, speed and a reference to their type, so a
+new food is one manifest line plus its sprite, without code changes.
+
+Type indices follow manifest order and are stored in snapshots and spawn
+timelines, so new types are appended at the end of the manifest.
+"""
+import bisect
+import json
+from collections import namedtuple
+from itertools import accumulate
+import pygame
+from core.residency_manager import ResidencyManager
+from utils.load_image import get_assets_path, load_image_fit
+from utils.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+
+# Shared, immutable result of catching an item
+ItemEffect = namedtuple('ItemEffect', ('score', 'hp', 'label'))
+
+# Item kinds understood by the game (core/item.py has one class per kind)
+ITEM_KINDS = ('good', 'bad')
+
+
+class ItemType:
+    """
+    Flyweight holding the state shared by all items of one type
+    Encapsulation: Read-only properties; the sprite is loaded on first use
+    """
+
+    __slots__ = ('_index', '_id', '_kind', '_sprite_name', '_size', '_color',
+                 '_outline_color', '_effect', '_weight', '_sprite', '_mask', '_loaded')
+
+    def __init__(self, index, type_id, kind, sprite_name, size, color, outline_color,
+                 score, hp, label, weight):
+        """
+        Args:
+            index: Position in the manifest (stored in snapshots)
+            type_id: Unique name, e.g. 'banana-bad'
+            kind: One of ITEM_KINDS
+            sprite_name: File name in assets/images/foods/
+            size: Sprite width and height limit (the item radius is half)
+            color: Fallback fill colour
+            outline_color: Fallback outline colour
+            score: Score change when caught
+            hp: HP change when caught
+            label: Name shown for the catch
+            weight: Relative spawn weight
+        """
+        self._index = index
+        self._id = type_id
+        self._kind = kind
+        self._sprite_name = sprite_name
+        self._size = size
+        self._color = tuple(color)
+        self._outline_color = tuple(outline_color)
+        self._effect = ItemEffect(score, hp, label)
+        self._weight = weight
+        self._sprite = None
+        self._mask = None
+        self._loaded = False
+
+    def _load(self):
+        """Load the sprite and build its mask (once; failures fall back to shapes)"""
+        self._loaded = True
+        try:
+            image_path = get_assets_path('images', 'foods', self._sprite_name)
+            self._sprite, _, _ = load_image_fit(image_path, self._size, self._size, convert_alpha=True)
+            self._mask = pygame.mask.from_surface(self._sprite)
+
+            residency = ResidencyManager()
+            residency.register(residency.SHARED_BUNDLE, 'sprite', ('food', self._id, self._size), self._sprite)
+            residency.register(residency.SHARED_BUNDLE, 'mask', ('food-mask', self._id, self._size), self._mask)
+        except Exception as e:
+            logger.error("Error loading food image '%s': %s", self._sprite_name, e)
+            self._sprite = None
+            self._mask = None
+
+    # Properties
+    @property
+    def index(self):
+        return self._index
+
+    @property
+    def id(self):
+        return self._id
+
+    @property
+    def kind(self):
+        return self._kind
+
+    @property
+    def radius(self):
+        return self._size // 2
+
+    @property
+    def color(self):
+        return self._color
+
+    @property
+    def outline_color(self):
+        return self._outline_color
+
+    @property
+    def effect(self):
+        return self._effect
+
+    @property
+    def weight(self):
+        return self._weight
+
+    @property
+    def sprite(self):
+        """Sprite surface, or None if it could not be loaded"""
+        if not self._loaded:
+            self._load()
+        return self._sprite
+
+    @property
+    def mask(self):
+        """Collision mask of the sprite, or None without a sprite"""
+        if not self._loaded:
+            self._load()
+        return self._mask
+
+
+class ItemRegistry:
+    """
+    Singleton registry of item types
+    Encapsulation: Types are created from the manifest and looked up by
+    index or id; spawn weights are precomputed for weighted picks
+    """
+
+    MANIFEST = 'items.json'
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(ItemRegistry, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self._initialized = True
+        self._types = []
+        self._by_id = {}
+        self._cumulative_weights = []
+        self.load()
+
+    def load(self, path=None):
+        """
+        (Re)load item types from a manifest
+
+        Args:
+            path: Manifest file (default assets/items.json)
+
+        Raises:
+            ValueError: If the manifest is missing or invalid
+        """
+        path = path or get_assets_path(self.MANIFEST)
+        try:
+            with open(path, 'r', encoding='utf-8') as manifest_file:
+                manifest = json.load(manifest_file)
+        except (OSError, ValueError) as e:
+            raise ValueError(f"cannot read item manifest '{path}': {e}")
+
+        size = manifest.get('sprite_size', 60)
+        kinds = manifest.get('kinds', {})
+        types = []
+        by_id = {}
+        for index, entry in enumerate(manifest.get('types', [])):
+            kind = entry.get('kind')
+            if kind not in ITEM_KINDS:
+                raise ValueError(f"item type {entry.get('id')!r}: unknown kind {kind!r}")
+            # Type entries override the defaults of their kind
+            fields = dict(kinds.get(kind, {}))
+            fields.update(entry)
+            type_id = fields['id']
+            if type_id in by_id:
+                raise ValueError(f"duplicate item type {type_id!r}")
+
+            item_type = ItemType(
+                index, type_id, kind,
+                fields.get('sprite', f'{type_id}.png'),
+                fields.get('size', size),
+                fields.get('color', (200, 200, 200)),
+                fields.get('outline_color', (120, 120, 120)),
+                fields.get('score', 0),
+                fields.get('hp', 0),
+                fields.get('label', type_id.capitalize()),
+                float(fields.get('weight', 1.0))
+            )
+            types.append(item_type)
+            by_id[type_id] = item_type
+
+        if not types or sum(item_type.weight for item_type in types) <= 0:
+            raise ValueError(f"item manifest '{path}' has no spawnable types")
+
+        self._types = types
+        self._by_id = by_id
+        self._cumulative_weights = list(accumulate(item_type.weight for item_type in types))
+
+    def get(self, type_ref):
+        """
+        Look up an item type
+
+        Args:
+            type_ref: Type index, type id or ItemType
+
+        Returns:
+            ItemType: The type
+
+        Raises:
+            KeyError: If no such type exists
+        """
+        if isinstance(type_ref, ItemType):
+            return type_ref
+        if isinstance(type_ref, str):
+            return self._by_id[type_ref]
+        if 0 <= type_ref < len(self._types):
+            return self._types[type_ref]
+        raise KeyError(type_ref)
+
+    def pick_index(self, rng):
+        """
+        Weighted random type index
+
+        Args:
+            rng: random.Random (only rng.random() is used)
+
+        Returns:
+            int: Type index
+        """
+        cumulative = self._cumulative_weights
+        index = bisect.bisect_right(cumulative, rng.random() * cumulative[-1])
+        return min(index, len(cumulative) - 1)
+
+    def pick(self, rng):
+        """
+        Weighted random type
+
+        Args:
+            rng: random.Random
+
+        Returns:
+            ItemType: The type
+        """
+        return self._types[self.pick_index(rng)]
+
+    # Properties
+    @property
+    def types(self):
+        return tuple(self._types)
+
+    @property
+    def cumulative_weights(self):
+        """Running sum of spawn weights in type order"""
+        return tuple(self._cumulative_weights)
+
+    @property
+    def count(self):
+        return len(self._types)
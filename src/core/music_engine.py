@@ -0,0 +1,393 @@
+"""
+Streaming procedural music on a dedicated mixer channel
+Demonstrates: Encapsulation, Composition
+
+A worker thread renders the music in short NumPy chunks (about 46 ms at
+22050 Hz) and feeds them to one reserved pygame mixer channel with
+Channel.queue: one chunk plays, one waits in the channel's queue, and the
+worker already holds the next one rendered. Tempo and intensity are read
+when a chunk is rendered, so the music follows the game within two or
+three chunks instead of at the end of a looping file.
+
+The music is a step sequencer on a pentatonic scale: kick on every beat, a
+bass line per beat, hi-hats and a lead arpeggio faded in with intensity.
+Every voice is a function of the position on the beat grid, so chunks join
+without clicks and a tempo change keeps the beat where it is.
+
+During a session the music is locked to the game's beat grid (see
+core/beat_clock.py). Before each chunk is rendered, the engine predicts
+when its first frame will be heard, compares its own beat there with the
+game's beat at that moment, and bends the tempo by up to 4% to close the
+gap within about a second; a gap over half a beat (session start or
+restart) is closed by jumping. The beat the player hears is what matches
+the items landing on the grid.
+
+If the worker ever finds the channel idle while music should be playing,
+the audio device ran out of queued samples (an underrun, heard as a gap);
+underruns are counted and reported with the chunk render times and the
+phase error against the game.
+"""
+import threading
+import time
+from collections import deque
+import numpy as np
+import pygame
+from core.beat_clock import BeatClock, BeatGrid
+from utils.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+
+# Render time and phase error samples kept for percentiles
+_SAMPLE_WINDOW = 600
+
+# Rendered chunks remembered for beat_heard_at() (covers the chunks in flight)
+_SEGMENT_HISTORY = 16
+
+# Major pentatonic scale (semitones above the root)
+_SCALE = (0, 2, 4, 7, 9)
+
+# Scale degrees: bass note per beat (two bars), lead note per 16th step
+_BASS_PATTERN = (0, 0, 3, 4, 0, 0, 2, 3)
+_LEAD_PATTERN = (5, 7, 9, 7, 6, 7, 9, 10, 5, 7, 9, 7, 8, 7, 6, 4)
+
+
+def _degree_frequencies(root_hz, degrees):
+    """Frequencies (Hz) of scale degrees counted up from a root"""
+    return np.array([root_hz * 2.0 ** ((12 * (degree // len(_SCALE)) + _SCALE[degree % len(_SCALE)]) / 12.0)
+                     for degree in degrees])
+
+
+class MusicEngine:
+    """
+    Procedural music streamed to a reserved mixer channel
+    Encapsulation: The sequencer state, worker thread and statistics are
+    private; the game only sets its state with set_state()
+    """
+
+    CHUNK_FRAMES = 1024
+    CHANNEL = 0
+
+    # Intensity reaches 1.0 at FULL_INTENSITY_RATE spawns per second
+    FULL_INTENSITY_RATE = 2.0
+
+    # Share of the distance to the target tempo/intensity covered per chunk
+    SMOOTHING = 0.15
+
+    # Phase lock: seconds to close a phase error in, largest tempo bend,
+    # and the error (in beats) that is closed by jumping instead
+    LOCK_SECONDS = 1.0
+    MAX_BEND = 0.04
+    RESYNC_BEATS = 0.5
+
+    def __init__(self, chunk_frames=CHUNK_FRAMES, channel=CHANNEL, volume=0.5,
+                 latency_frames=512, offset=0.0):
+        """
+        Args:
+            chunk_frames: Sample frames per chunk
+            channel: Mixer channel index, reserved from automatic allocation
+                     so sound effects never take it over
+            volume: Channel volume (0.0 to 1.0)
+            latency_frames: Mixer buffer size in frames
+            offset: Calibrated output delay in seconds (see BeatClock)
+        """
+        frequency, _, channels = pygame.mixer.get_init()
+        self._sample_rate = frequency
+        self._channels = channels
+        self._chunk_frames = chunk_frames
+        self._chunk_seconds = chunk_frames / frequency
+
+        pygame.mixer.set_reserved(channel + 1)
+        self._channel = pygame.mixer.Channel(channel)
+        self._volume = volume
+
+        # Sequencer state: position on the grid in 16th steps, frames rendered
+        self._grid = BeatGrid()
+        self._step = 0.0
+        self._frames = 0
+        self._tempo = self._grid.tempo_at(0.0)
+        self._intensity = 0.5
+        self._target_tempo = self._tempo
+        self._target_intensity = 0.5
+
+        # Game beat at a perf_counter time, (beat, time), while locked to a session
+        self._sync = None
+        self._clock = BeatClock(frequency, latency_frames, offset)
+        self._segments = deque(maxlen=_SEGMENT_HISTORY)  # (first frame, first step, steps per frame)
+
+        self._bass_hz = _degree_frequencies(55.0, _BASS_PATTERN)
+        self._lead_hz = _degree_frequencies(220.0, _LEAD_PATTERN)
+        self._noise = np.random.default_rng(7).uniform(-1.0, 1.0, frequency // 4).astype(np.float32)
+        self._frame_offsets = np.arange(chunk_frames, dtype=np.float64)
+
+        self._stop_event = threading.Event()
+        self._thread = None
+
+        # pygame.quit (also run at interpreter exit) closes the mixer; the
+        # worker must be stopped before that or it queues into a freed channel
+        pygame.register_quit(self.stop)
+
+        self._chunks = 0
+        self._underruns = 0
+        self._resyncs = 0
+        self._render_times = deque(maxlen=_SAMPLE_WINDOW)
+        self._phase_errors = deque(maxlen=_SAMPLE_WINDOW)
+
+    def start(self):
+        """Start streaming (no-op while running)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._channel.set_volume(self._volume)
+        self._thread = threading.Thread(target=self._run, name='music-engine', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=1.0):
+        """
+        Stop the worker and silence the channel
+
+        Args:
+            timeout: Seconds to wait for the thread
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self._sync = None
+        if pygame.mixer.get_init():
+            self._channel.stop()
+
+    def set_state(self, time_remaining, spawn_rate, beat=None):
+        """
+        Steer tempo and intensity from the game (cheap; safe from any thread)
+
+        Args:
+            time_remaining: Seconds left in the session
+            spawn_rate: Current spawns per second
+            beat: The game's beat position now (Game.beat_position), to lock
+                  the music to; None plays free-running
+        """
+        self._target_tempo = self._grid.tempo_at(self._grid.duration - time_remaining)
+        self._target_intensity = min(1.0, max(0.0, spawn_rate / self.FULL_INTENSITY_RATE))
+        self._sync = None if beat is None else (beat, time.perf_counter())
+
+    def set_volume(self, volume):
+        """
+        Set channel volume
+
+        Args:
+            volume: Volume level (0.0 to 1.0)
+        """
+        self._volume = volume
+        self._channel.set_volume(volume)
+
+    def render_chunk(self):
+        """
+        Render the next chunk and advance the sequencer
+
+        Returns:
+            numpy.ndarray: int16 samples, shape (chunk_frames, channels)
+        """
+        self._intensity += (self._target_intensity - self._intensity) * self.SMOOTHING
+        intensity = self._intensity
+
+        sync = self._sync
+        heard_at = self._clock.heard_at(self._frames)
+        if sync is None or heard_at is None:
+            self._tempo += (self._target_tempo - self._tempo) * self.SMOOTHING
+            tempo = self._tempo
+        else:
+            # Where the game's beat will be when this chunk is heard
+            beat, synced_at = sync
+            self._tempo = self._target_tempo
+            error = beat + (heard_at - synced_at) * self._tempo / 60.0 - self._step / 4.0
+            if abs(error) > self.RESYNC_BEATS:
+                self._step += error * 4.0
+                self._resyncs += 1
+                error = 0.0
+            self._phase_errors.append(abs(error) * 60.0 / self._tempo)
+            bend = error * 60.0 / self.LOCK_SECONDS
+            tempo = self._tempo + max(-self.MAX_BEND, min(self.MAX_BEND, bend / self._tempo)) * self._tempo
+
+        step_seconds = 15.0 / tempo
+        steps_per_frame = 1.0 / (self._sample_rate * step_seconds)
+        steps = self._step + self._frame_offsets * steps_per_frame
+        self._segments.append((self._frames, self._step, steps_per_frame))
+        self._step += self._chunk_frames * steps_per_frame
+        self._frames += self._chunk_frames
+
+        step_index = np.floor(steps).astype(np.int64)
+        t_step = (steps - step_index) * step_seconds
+        beats = steps / 4.0
+        beat_index = np.floor(beats).astype(np.int64)
+        t_beat = (beats - beat_index) * step_seconds * 4.0
+        beat_left = step_seconds * 4.0 - t_beat
+        step_left = step_seconds - t_step
+
+        # Kick: pitch drop from 150 to 50 Hz on every beat
+        kick_phase = 2.0 * np.pi * (50.0 * t_beat + (100.0 / 30.0) * (1.0 - np.exp(-30.0 * t_beat)))
+        mix = 0.45 * np.exp(-12.0 * t_beat) * np.sin(kick_phase)
+
+        # Bass: one note per beat, short attack and release at the beat edges
+        bass_hz = self._bass_hz[beat_index % len(self._bass_hz)]
+        bass_gate = np.minimum(1.0, np.minimum(t_beat, beat_left) * 200.0)
+        bass_wave = np.sin(2.0 * np.pi * bass_hz * t_beat)
+        mix += 0.22 * bass_gate * np.exp(-3.0 * t_beat) * (bass_wave + 0.3 * np.sign(bass_wave))
+
+        # Hi-hats: off-beat 8ths from medium intensity, every odd 16th near the top
+        hat_gain = min(1.0, max(0.0, (intensity - 0.25) * 4.0)) * 0.12
+        if hat_gain > 0.0:
+            position = step_index % 4
+            hats = (position == 2) * 1.0 + (position % 2 == 1) * (0.5 if intensity > 0.75 else 0.0)
+            noise = self._noise[np.minimum((t_step * self._sample_rate).astype(np.int64), len(self._noise) - 1)]
+            mix += hat_gain * hats * np.exp(-70.0 * t_step) * noise
+
+        # Lead: 16th-note arpeggio (triangle wave) once intensity is high
+        lead_gain = min(1.0, max(0.0, (intensity - 0.5) * 3.0)) * 0.10
+        if lead_gain > 0.0:
+            lead_hz = self._lead_hz[step_index % len(self._lead_hz)]
+            lead_gate = np.minimum(1.0, np.minimum(t_step, step_left) * 400.0)
+            cycle = lead_hz * t_step
+            triangle = 4.0 * np.abs(cycle - np.floor(cycle + 0.5)) - 1.0
+            mix += lead_gain * lead_gate * np.exp(-8.0 * t_step) * triangle
+
+        samples = (np.clip(mix, -1.0, 1.0) * 32767).astype(np.int16)
+        if self._channels == 1:
+            return samples
+        return np.repeat(samples[:, None], self._channels, axis=1)
+
+    def beat_heard_at(self, time_point=None):
+        """
+        Music beat reaching the speakers at a perf_counter time
+
+        Args:
+            time_point: perf_counter time (default: now)
+
+        Returns:
+            float or None: Beat position, None while not playing
+        """
+        frame = self._clock.frame_heard_at(time.perf_counter() if time_point is None else time_point)
+        segments = list(self._segments)
+        if frame is None or not segments:
+            return None
+        for first_frame, first_step, steps_per_frame in reversed(segments):
+            if first_frame <= frame:
+                break
+        return (first_step + (frame - first_frame) * steps_per_frame) / 4.0
+
+    def _next_sound(self):
+        """
+        Render a chunk into a Sound and time it
+
+        Returns:
+            tuple: (pygame.mixer.Sound, index of its first frame)
+        """
+        started = time.perf_counter()
+        first_frame = self._frames
+        sound = pygame.sndarray.make_sound(self.render_chunk())
+        self._render_times.append(time.perf_counter() - started)
+        self._chunks += 1
+        return sound, first_frame
+
+    def _run(self):
+        """Worker loop: keep one chunk playing and one queued, with the next rendered"""
+        poll = self._chunk_seconds / 4.0
+        try:
+            # The first chunk is expected to start about now
+            self._clock.restart(self._frames, time.perf_counter())
+            sound, first_frame = self._next_sound()
+            self._channel.play(sound)
+            self._clock.restart(first_frame, time.perf_counter())
+            queued = self._next_sound()
+            self._channel.queue(queued[0])
+            pending = self._next_sound()
+            while not self._stop_event.wait(poll):
+                if self._channel.get_queue() is not None:
+                    continue
+                now = time.perf_counter()
+                if self._channel.get_busy():
+                    # The queued chunk has just started in the mixer
+                    self._clock.observe(queued[1], now)
+                    self._channel.queue(pending[0])
+                    queued = pending
+                else:
+                    # Both chunks finished before a refill: the device played silence
+                    self._underruns += 1
+                    self._channel.play(pending[0])
+                    self._clock.restart(pending[1], now)
+                    queued = self._next_sound()
+                    self._channel.queue(queued[0])
+                pending = self._next_sound()
+        except Exception as e:
+            logger.error("Music engine stopped: %s", e)
+
+    def get_stats(self):
+        """
+        Streaming statistics
+
+        Returns:
+            dict: Chunks rendered, underruns, render time (ms) and its share
+                  of the audio time rendered, buffered latency (ms), output
+                  latency and clock drift correction (ms), phase error
+                  against the game (ms) and resyncs, current tempo and intensity
+        """
+        render_times = sorted(self._render_times)
+        average = sum(render_times) / len(render_times) if render_times else 0.0
+        phase_errors = sorted(self._phase_errors)
+        return {
+            'chunks': self._chunks,
+            'underruns': self._underruns,
+            'resyncs': self._resyncs,
+            'phase_p50_ms': phase_errors[len(phase_errors) // 2] * 1000.0 if phase_errors else 0.0,
+            'phase_p95_ms': phase_errors[int(0.95 * (len(phase_errors) - 1))] * 1000.0 if phase_errors else 0.0,
+            'output_latency_ms': self._clock.latency * 1000.0,
+            'drift_ms': self._clock.drift * 1000.0,
+            'render_ms': average * 1000.0,
+            'render_p95_ms': render_times[int(0.95 * (len(render_times) - 1))] * 1000.0 if render_times else 0.0,
+            'render_max_ms': render_times[-1] * 1000.0 if render_times else 0.0,
+            'render_load_pct': average / self._chunk_seconds * 100.0,
+            'buffered_ms': 2 * self._chunk_seconds * 1000.0,
+            'tempo': self._tempo,
+            'intensity': self._intensity
+        }
+
+    def format_report(self):
+        """
+        Human-readable streaming report
+
+        Returns:
+            str: Report text
+        """
+        stats = self.get_stats()
+        return (f"Music engine: {stats['chunks']} chunks, {stats['underruns']} underruns; "
+                f"render {stats['render_ms']:.2f} ms avg, {stats['render_p95_ms']:.2f} ms p95, "
+                f"{stats['render_max_ms']:.2f} ms max ({stats['render_load_pct']:.1f}% of audio time); "
+                f"{stats['buffered_ms']:.0f} ms buffered + {stats['output_latency_ms']:.0f} ms output; "
+                f"phase error {stats['phase_p50_ms']:.1f} ms p50, {stats['phase_p95_ms']:.1f} ms p95, "
+                f"{stats['resyncs']} resyncs, clock drift {stats['drift_ms']:+.1f} ms; "
+                f"tempo {stats['tempo']:.0f} BPM, intensity {stats['intensity']:.2f}")
+
+    # Properties
+    @property
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def tempo(self):
+        """Current tempo in beats per minute"""
+        return self._tempo
+
+    @property
+    def intensity(self):
+        """Current intensity (0.0 to 1.0)"""
+        return self._intensity
+
+    @property
+    def underruns(self):
+        return self._underruns
+
+    @property
+    def beat_clock(self):
+        """BeatClock of the stream (output latency and calibration offset)"""
+        return self._clock
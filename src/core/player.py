@@ -3,7 +3,19 @@ Player class with movement and catching mechanics
 Demonstrates: Encapsulation, Composition
 """
 import pygame
+from core.residency_manager import ResidencyManager
 from utils.load_image import get_assets_path, load_image_fit
+from utils.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+
+# Character sprites shared by all players: (width, height) -> {sprite key: Surface}
+_sprite_cache = {}
+
+# Collision masks kept alongside the sprites: (width, height) -> {sprite key: Mask}
+_mask_cache = {}
 
 
 class Player:
@@ -41,8 +53,15 @@ class Player:
         self._bad_state_duration = 1.0  # 1 second
     
     def _load_sprites(self):
-        """Load all character sprites"""
+        """Load all character sprites (once per size, shared between players)"""
+        cached = _sprite_cache.get((self._width, self._height))
+        if cached is not None:
+            self._sprites = cached
+            self._masks = _mask_cache[(self._width, self._height)]
+            return
+        
         self._sprites = {}
+        _sprite_cache[(self._width, self._height)] = self._sprites
         sprite_names = ['idle', 'left', 'right']
         
         for sprite_name in sprite_names:
@@ -52,7 +71,7 @@ class Player:
                 normal_sprite, _, _ = load_image_fit(normal_path, self._width, self._height, convert_alpha=True)
                 self._sprites[f'normal-{sprite_name}'] = normal_sprite
             except Exception as e:
-                print(f"Error loading normal-{sprite_name}.png: {e}")
+                logger.error("Error loading normal-%s.png: %s", sprite_name, e)
                 self._sprites[f'normal-{sprite_name}'] = self._create_fallback_sprite()
             
             # Load bad sprite
@@ -61,8 +80,19 @@ class Player:
                 bad_sprite, _, _ = load_image_fit(bad_path, self._width, self._height, convert_alpha=True)
                 self._sprites[f'bad-{sprite_name}'] = bad_sprite
             except Exception as e:
-                print(f"Error loading bad-{sprite_name}.png: {e}")
+                logger.error("Error loading bad-%s.png: %s", sprite_name, e)
                 self._sprites[f'bad-{sprite_name}'] = self._create_fallback_sprite((239, 68, 68))
+        
+        # Pixel masks for narrowphase collision, built once per sprite
+        self._masks = {key: pygame.mask.from_surface(sprite) for key, sprite in self._sprites.items()}
+        _mask_cache[(self._width, self._height)] = self._masks
+        
+        # Counted against the surface budget; never evicted
+        residency = ResidencyManager()
+        residency.register(residency.SHARED_BUNDLE, 'sprite', ('character', self._width, self._height),
+                           tuple(self._sprites.values()))
+        residency.register(residency.SHARED_BUNDLE, 'mask', ('character-mask', self._width, self._height),
+                           tuple(self._masks.values()))
     
     def _create_fallback_sprite(self, color=(251, 191, 36)):
         """Create a fallback sprite if image loading fails"""
@@ -85,6 +115,18 @@ class Player:
         self._velocity_x = 0
         self._current_state = 'idle'
     
+    def move(self, axis, held=0):
+        """
+        Move by a fraction of full speed (sub-frame input)
+        
+        Args:
+            axis: Time-weighted direction over the last frame, -1.0 to 1.0
+            held: Direction still held (-1, 0, 1); picks the sprite
+        """
+        self._velocity_x = self._speed * axis
+        facing = held or (1 if axis > 0 else -1 if axis < 0 else 0)
+        self._current_state = 'left' if facing < 0 else ('right' if facing > 0 else 'idle')
+    
     def trigger_bad_state(self):
         """Trigger bad state when hit by BadItem"""
         self._is_bad_state = True
@@ -112,30 +154,97 @@ class Player:
                 self._is_bad_state = False
                 self._bad_state_timer = 0
     
+    def _sprite_key(self):
+        """Key of the sprite for the current state"""
+        sprite_prefix = 'bad' if self._is_bad_state else 'normal'
+        return f'{sprite_prefix}-{self._current_state}'
+    
     def draw(self, screen):
         """Draw player sprite based on current state"""
-        # Determine sprite key based on state
-        sprite_prefix = 'bad' if self._is_bad_state else 'normal'
-        sprite_key = f'{sprite_prefix}-{self._current_state}'
+        self.draw_state(screen, self.get_render_state())
+    
+    def get_render_state(self):
+        """
+        Get what draw() needs, as an immutable value for render snapshots
+        
+        Returns:
+            tuple: (x, sprite_key)
+        """
+        return (self._x, self._sprite_key())
+    
+    def draw_state(self, screen, render_state):
+        """
+        Draw the player as it was when a render state was taken
+        
+        Only the position and sprite come from the state; sprites and size
+        never change after construction, so this is safe while another
+        thread updates the player.
+        
+        Args:
+            screen: pygame surface to draw on
+            render_state: Value returned by get_render_state()
+        """
+        x, sprite_key = render_state
         
         # Get current sprite
         current_sprite = self._sprites.get(sprite_key)
         
         if current_sprite:
             # Draw sprite centered at player position
-            sprite_rect = current_sprite.get_rect(center=(int(self._x), int(self._y)))
+            sprite_rect = current_sprite.get_rect(center=(int(x), int(self._y)))
             screen.blit(current_sprite, sprite_rect)
         else:
             # Fallback drawing if sprite not found
             fallback_rect = pygame.Rect(
-                self._x - self._width // 2,
+                x - self._width // 2,
                 self._y - self._height // 2,
                 self._width,
                 self._height
             )
-            color = (239, 68, 68) if self._is_bad_state else (251, 191, 36)
+            color = (239, 68, 68) if sprite_key.startswith('bad') else (251, 191, 36)
             pygame.draw.rect(screen, color, fallback_rect, border_radius=8)
     
+    def get_state(self):
+        """
+        Get movement/sprite state for snapshots
+        
+        Returns:
+            tuple: (x, velocity_x, current_state, is_bad_state, bad_state_timer)
+        """
+        return (self._x, self._velocity_x, self._current_state,
+                self._is_bad_state, self._bad_state_timer)
+    
+    def set_state(self, x, velocity_x=0, current_state='idle', is_bad_state=False, bad_state_timer=0.0):
+        """
+        Restore movement/sprite state (sprites are kept)
+        
+        Args:
+            x: Horizontal position
+            velocity_x: Horizontal velocity
+            current_state: 'idle', 'left' or 'right'
+            is_bad_state: Whether the bad sprite is shown
+            bad_state_timer: Seconds left in bad state
+        """
+        self._x = x
+        self._velocity_x = velocity_x
+        self._current_state = current_state
+        self._is_bad_state = is_bad_state
+        self._bad_state_timer = bad_state_timer
+    
+    def get_mask(self):
+        """
+        Get the pixel mask of the sprite currently drawn
+        
+        Returns:
+            tuple: (pygame.mask.Mask, (left, top) screen position), or (None, None)
+        """
+        sprite_key = self._sprite_key()
+        mask = self._masks.get(sprite_key)
+        if mask is None:
+            return None, None
+        width, height = mask.get_size()
+        return mask, (int(self._x) - width // 2, int(self._y) - height // 2)
+    
     def get_rect(self):
         """
         Get collision rectangle
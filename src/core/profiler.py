@@ -0,0 +1,278 @@
+"""
+Frame profiler hooked into the BaseScreen safe_* wrappers
+Singleton pattern: one capture at a time for the whole game
+
+A capture covers N frames and is started at runtime (F10 / Shift+F10 in
+game, or SIGUSR1 / SIGUSR2 on POSIX). Two modes are available:
+    'cprofile' - deterministic cProfile of every wrapped call, saved as .pstats
+    'sampling' - low-overhead stack sampler, saved as collapsed stacks
+                 (one "frame;frame;frame count" line each, for flamegraph.pl
+                 or speedscope)
+Both modes also record per-screen call counts and cumulative time.
+"""
+import cProfile
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from utils.storage import get_data_path
+from utils.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+
+class Profiler:
+    """
+    Singleton profiler for screen event/update/draw calls
+    Encapsulation: Capture state is private; screens only call profile_call()
+    and the game manager calls end_frame() once per frame
+    """
+
+    MODES = ('cprofile', 'sampling')
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(Profiler, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self._initialized = True
+        self._active = False
+        self._mode = None
+        self._frames_left = 0
+        self._frames_captured = 0
+        self._started_at = 0.0
+
+        # Capture requested from a signal handler, started at the next frame
+        self._pending = None
+
+        # Per-screen totals: (screen, phase) -> [calls, seconds]
+        self._screen_stats = {}
+
+        # cProfile mode
+        self._cprofile = None
+
+        # Sampling mode
+        self._sample_interval = 0.002
+        self._samples = Counter()
+        self._sampler = None
+        self._stop_sampler = threading.Event()
+        self._main_thread_id = threading.main_thread().ident
+        self._current_call = None
+
+        self._last_output = None
+
+    def install_signal_handlers(self):
+        """Start captures on SIGUSR1 (cProfile) and SIGUSR2 (sampling), where available"""
+        try:
+            if hasattr(signal, 'SIGUSR1'):
+                signal.signal(signal.SIGUSR1, lambda signum, frame: self.request('cprofile'))
+            if hasattr(signal, 'SIGUSR2'):
+                signal.signal(signal.SIGUSR2, lambda signum, frame: self.request('sampling'))
+        except Exception as e:
+            logger.warning("Profiler signals not available: %s", e)
+
+    def request(self, mode='cprofile', frames=300):
+        """
+        Ask for a capture to start at the next frame boundary (signal safe)
+
+        Args:
+            mode: 'cprofile' or 'sampling'
+            frames: Number of frames to capture
+        """
+        self._pending = (mode, frames)
+
+    def start(self, mode='cprofile', frames=300):
+        """
+        Start a capture now
+
+        Args:
+            mode: 'cprofile' or 'sampling'
+            frames: Number of frames to capture
+
+        Returns:
+            bool: True if started (False if a capture is already running)
+        """
+        if self._active:
+            return False
+        if mode not in self.MODES:
+            raise ValueError(f"unknown profiler mode: {mode}")
+
+        self._mode = mode
+        self._frames_left = max(1, int(frames))
+        self._frames_captured = 0
+        self._screen_stats = {}
+        self._started_at = time.perf_counter()
+
+        if mode == 'cprofile':
+            self._cprofile = cProfile.Profile()
+        else:
+            self._samples = Counter()
+            self._stop_sampler.clear()
+            self._sampler = threading.Thread(target=self._sample_loop, name='profiler', daemon=True)
+            self._sampler.start()
+
+        self._active = True
+        print(f"Profiling {self._frames_left} frames ({mode})...")
+        return True
+
+    def toggle(self, mode='cprofile', frames=300):
+        """Start a capture, or finish the running one early"""
+        if self._active:
+            self.stop()
+        else:
+            self.start(mode, frames)
+
+    def profile_call(self, screen_name, phase, function, *args):
+        """
+        Call a screen method, measuring it while a capture is active
+
+        Args:
+            screen_name: Screen class name
+            phase: 'event', 'update' or 'draw'
+            function: Bound method to call
+            *args: Arguments for the method
+
+        Returns:
+            Whatever the method returns
+        """
+        if not self._active:
+            return function(*args)
+
+        key = (screen_name, phase)
+        self._current_call = key
+        start = time.perf_counter()
+        try:
+            if self._cprofile is not None:
+                return self._cprofile.runcall(function, *args)
+            return function(*args)
+        finally:
+            stats = self._screen_stats.get(key)
+            if stats is None:
+                stats = self._screen_stats[key] = [0, 0.0]
+            stats[0] += 1
+            stats[1] += time.perf_counter() - start
+            self._current_call = None
+
+    def end_frame(self):
+        """Count a finished frame; start pending captures and finish due ones"""
+        if self._pending is not None and not self._active:
+            mode, frames = self._pending
+            self._pending = None
+            self.start(mode, frames)
+            return
+
+        if not self._active:
+            return
+
+        self._frames_captured += 1
+        self._frames_left -= 1
+        if self._frames_left <= 0:
+            self.stop()
+
+    def stop(self):
+        """
+        Finish the capture and write its files
+
+        Returns:
+            str or None: Base path of the written files (without extension)
+        """
+        if not self._active:
+            return None
+
+        self._active = False
+        if self._sampler is not None:
+            self._stop_sampler.set()
+            self._sampler.join(timeout=1.0)
+            self._sampler = None
+
+        try:
+            base_path = get_data_path(
+                'profiles', time.strftime('profile-%Y%m%d-%H%M%S') + f'-{self._mode}'
+            )
+            os.makedirs(os.path.dirname(base_path), exist_ok=True)
+
+            if self._cprofile is not None:
+                self._cprofile.dump_stats(base_path + '.pstats')
+            else:
+                with open(base_path + '.collapsed', 'w', encoding='utf-8') as collapsed_file:
+                    for stack, count in self._samples.most_common():
+                        collapsed_file.write(f"{stack} {count}\n")
+
+            report = self.format_report()
+            with open(base_path + '.txt', 'w', encoding='utf-8') as report_file:
+                report_file.write(report + '\n')
+            print(report)
+            print(f"Profile written to {base_path}.*")
+            self._last_output = base_path
+        except Exception as e:
+            logger.error("Error writing profile: %s", e)
+            base_path = None
+        finally:
+            self._cprofile = None
+
+        return base_path
+
+    def format_report(self):
+        """
+        Per-screen call counts and cumulative time of the last capture
+
+        Returns:
+            str: Report text
+        """
+        wall = time.perf_counter() - self._started_at
+        frames = max(1, self._frames_captured)
+        lines = [
+            f"Profile ({self._mode}): {self._frames_captured} frames in {wall:.2f} s",
+            f"{'screen':<16}{'phase':<8}{'calls':>8}{'cum ms':>11}{'ms/frame':>10}"
+        ]
+        ordered = sorted(self._screen_stats.items(), key=lambda item: item[1][1], reverse=True)
+        for (screen_name, phase), (calls, seconds) in ordered:
+            lines.append(f"{screen_name:<16}{phase:<8}{calls:>8}"
+                         f"{seconds * 1000.0:>11.1f}{seconds * 1000.0 / frames:>10.2f}")
+        return '\n'.join(lines)
+
+    def _sample_loop(self):
+        """Sampler thread: record the main thread's stack inside wrapped calls"""
+        wrapper_code = Profiler.profile_call.__code__
+        while not self._stop_sampler.wait(self._sample_interval):
+            key = self._current_call
+            frame = sys._current_frames().get(self._main_thread_id)
+            if key is None or frame is None:
+                continue
+
+            # Walk up to the profile_call frame; everything below it is screen code
+            names = []
+            while frame is not None and frame.f_code is not wrapper_code:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if frame is None:
+                continue
+
+            names.append(key[1])
+            names.append(key[0])
+            self._samples[';'.join(reversed(names))] += 1
+
+    # Properties
+    @property
+    def is_active(self):
+        return self._active
+
+    @property
+    def mode(self):
+        return self._mode
+
+    @property
+    def last_output(self):
+        """Base path of the last written capture, if any"""
+        return self._last_output
@@ -0,0 +1,183 @@
+"""
+Frame-budget-aware dynamic quality scaling
+Singleton pattern for a single shared quality level
+"""
+from collections import deque
+
+
+class QualityManager:
+    """
+    Singleton quality controller
+    Tracks a moving average of frame times against the frame budget and steps
+    non-essential visual work down under pressure, back up with hysteresis
+    """
+
+    # Quality levels (higher is better)
+    MINIMAL = 0
+    LOW = 1
+    MEDIUM = 2
+    HIGH = 3
+    LEVEL_NAMES = ('minimal', 'low', 'medium', 'high')
+
+    # Fraction of the base particle count emitted per level
+    PARTICLE_SCALE = (0.0, 0.35, 0.65, 1.0)
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(QualityManager, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self._initialized = True
+        self._enabled = True
+        self._level = self.HIGH
+
+        # Frame budget (60 FPS by default)
+        self._budget_ms = 1000.0 / 60
+
+        # Moving average window
+        self._window = deque(maxlen=30)
+        self._window_total = 0.0
+
+        # Hysteresis: react fast to pressure, recover slowly
+        self._downgrade_ratio = 0.9   # Average above 90% of budget = pressure
+        self._upgrade_ratio = 0.6     # Average below 60% of budget = headroom
+        self._downgrade_frames = 30
+        self._upgrade_frames = 180
+        self._pressure_count = 0
+        self._headroom_count = 0
+
+        # Telemetry
+        self._level_changes = 0
+
+    def set_target_fps(self, fps):
+        """
+        Set frame budget from a target frame rate
+
+        Args:
+            fps: Target frames per second
+        """
+        if fps > 0:
+            self._budget_ms = 1000.0 / fps
+
+    def record_frame(self, frame_ms):
+        """
+        Record the work time of one frame and adjust quality if needed
+
+        Args:
+            frame_ms: Time spent on the frame in milliseconds (excluding idle wait)
+        """
+        if len(self._window) == self._window.maxlen:
+            self._window_total -= self._window[0]
+        self._window.append(frame_ms)
+        self._window_total += frame_ms
+
+        if not self._enabled or len(self._window) < self._window.maxlen:
+            return
+
+        average = self._window_total / len(self._window)
+        if average > self._budget_ms * self._downgrade_ratio:
+            self._pressure_count += 1
+            self._headroom_count = 0
+            if self._pressure_count >= self._downgrade_frames and self._level > self.MINIMAL:
+                self._change_level(self._level - 1)
+        elif average < self._budget_ms * self._upgrade_ratio:
+            self._headroom_count += 1
+            self._pressure_count = 0
+            if self._headroom_count >= self._upgrade_frames and self._level < self.HIGH:
+                self._change_level(self._level + 1)
+        else:
+            # Inside the hysteresis band: hold the current level
+            self._pressure_count = 0
+            self._headroom_count = 0
+
+    def _change_level(self, level):
+        """Switch level and restart measurement (encapsulated method)"""
+        self._level = level
+        self._level_changes += 1
+        self._pressure_count = 0
+        self._headroom_count = 0
+        self._window.clear()
+        self._window_total = 0.0
+
+    def set_enabled(self, enabled, level=None):
+        """
+        Enable or disable automatic scaling
+
+        Args:
+            enabled: Whether frame times may change the level
+            level: Optional level to pin (e.g. HIGH for benchmarks)
+        """
+        self._enabled = enabled
+        if level is not None:
+            self._level = max(self.MINIMAL, min(self.HIGH, level))
+
+    def particle_count(self, base_count):
+        """
+        Scale a particle count by the current level
+
+        Args:
+            base_count: Particle count at full quality
+
+        Returns:
+            int: Particles to emit
+        """
+        return int(round(base_count * self.PARTICLE_SCALE[self._level]))
+
+    def get_stats(self):
+        """
+        Get telemetry snapshot
+
+        Returns:
+            dict: Level, average frame time, budget and change count
+        """
+        return {
+            'level': self._level,
+            'level_name': self.LEVEL_NAMES[self._level],
+            'average_frame_ms': self.average_frame_ms,
+            'budget_ms': self._budget_ms,
+            'level_changes': self._level_changes
+        }
+
+    # Feature switches (read by screens and UI components)
+    @property
+    def text_fades(self):
+        """Floating texts fade out with per-surface alpha"""
+        return self._level >= self.MEDIUM
+
+    @property
+    def smooth_button_scaling(self):
+        """Hover scaling uses smoothscale instead of the fast scaler"""
+        return self._level >= self.MEDIUM
+
+    @property
+    def button_scaling(self):
+        """Hover scale animation is drawn at all"""
+        return self._level >= self.LOW
+
+    # Properties for encapsulation
+    @property
+    def level(self):
+        return self._level
+
+    @property
+    def level_name(self):
+        return self.LEVEL_NAMES[self._level]
+
+    @property
+    def average_frame_ms(self):
+        return self._window_total / len(self._window) if self._window else 0.0
+
+    @property
+    def budget_ms(self):
+        return self._budget_ms
+
+    @property
+    def is_enabled(self):
+        return self._enabled
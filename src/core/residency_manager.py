@@ -0,0 +1,293 @@
+"""
+Surface residency manager with a byte budget and per-screen asset bundles
+Singleton pattern: one budget for every surface the game keeps resident
+
+Screens load their surfaces through a named bundle (one per screen class).
+A bundle is reference counted by the screens using it; when the last one
+is disposed the bundle stays resident, so returning to a screen reuses its
+surfaces, until the byte budget is exceeded. Then unreferenced bundles are
+evicted least recently used first. Surfaces cached elsewhere for the
+whole session (item/player sprites, star shapes) are registered in the
+pinned SHARED_BUNDLE so they are counted but never evicted.
+"""
+import os
+from collections import OrderedDict
+from utils.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+
+class _Asset:
+    """One resident surface (or other sized value) and the bundles using it"""
+
+    __slots__ = ('value', 'category', 'nbytes', 'bundles')
+
+    def __init__(self, value, category, nbytes):
+        self.value = value
+        self.category = category
+        self.nbytes = nbytes
+        self.bundles = set()
+
+
+class ResidencyManager:
+    """
+    Singleton residency manager
+    Encapsulation: Assets, bundles and the LRU order are private; screens
+    only load through bundles and release them when disposed
+    """
+
+    SHARED_BUNDLE = 'shared'
+    DEFAULT_BUDGET_MB = 64
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(ResidencyManager, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self._initialized = True
+
+        # Byte budget (MBG_SURFACE_BUDGET_MB overrides the default)
+        budget_mb = float(os.environ.get('MBG_SURFACE_BUDGET_MB', self.DEFAULT_BUDGET_MB))
+        self._budget = int(budget_mb * 1024 * 1024)
+
+        # key -> _Asset
+        self._assets = {}
+
+        # Bundle name -> {'refs': int, 'keys': set}; order = least recently used first
+        self._bundles = OrderedDict()
+        self._pinned = {self.SHARED_BUNDLE}
+
+        self._resident_bytes = 0
+        self._evictions = 0
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def measure(value):
+        """
+        Memory used by a resident value's pixels
+
+        Args:
+            value: pygame.Surface, pygame.mask.Mask, or a tuple/list of them
+
+        Returns:
+            int: Bytes (pitch x height for surfaces, one bit per mask pixel)
+        """
+        if isinstance(value, (tuple, list)):
+            return sum(ResidencyManager.measure(item) for item in value)
+        if hasattr(value, 'get_pitch'):
+            return value.get_pitch() * value.get_height()
+        if hasattr(value, 'get_size'):
+            width, height = value.get_size()
+            return (width * height + 7) // 8
+        return 0
+
+    def set_budget(self, budget_bytes):
+        """
+        Change the byte budget and evict down to it if needed
+
+        Args:
+            budget_bytes: New budget in bytes
+        """
+        self._budget = max(0, int(budget_bytes))
+        self._enforce_budget()
+
+    def acquire_bundle(self, name):
+        """
+        Take a reference on a bundle (a screen starts using it)
+
+        Args:
+            name: Bundle name
+        """
+        bundle = self._touch(name)
+        bundle['refs'] += 1
+
+    def release_bundle(self, name):
+        """
+        Drop a reference on a bundle; unreferenced bundles become evictable
+
+        Args:
+            name: Bundle name
+        """
+        bundle = self._bundles.get(name)
+        if bundle is None or bundle['refs'] == 0:
+            return
+        bundle['refs'] -= 1
+        if bundle['refs'] == 0:
+            self._enforce_budget()
+
+    def load(self, bundle_name, category, key, loader):
+        """
+        Get a resident surface, loading it on first use
+
+        Args:
+            bundle_name: Bundle the surface belongs to
+            category: Report category (e.g. 'background', 'ui', 'layer')
+            key: Hashable cache key, unique per surface variant
+            loader: Callable returning the surface (or tuple of surfaces)
+                    when it is not resident
+
+        Returns:
+            The resident value returned by the loader
+        """
+        asset = self._assets.get(key)
+        if asset is None:
+            self._misses += 1
+            value = loader()
+            asset = self._add(key, value, category, self.measure(value))
+        else:
+            self._hits += 1
+
+        self._link(bundle_name, key, asset)
+        if self._resident_bytes > self._budget:
+            self._enforce_budget()
+        return asset.value
+
+    def register(self, bundle_name, category, key, surface):
+        """
+        Account for a surface cached by other code
+
+        Args:
+            bundle_name: Bundle the surface belongs to (SHARED_BUNDLE for session caches)
+            category: Report category
+            key: Hashable cache key
+            surface: pygame.Surface, pygame.mask.Mask or a tuple of them
+        """
+        asset = self._assets.get(key)
+        if asset is None:
+            asset = self._add(key, surface, category, self.measure(surface))
+        self._link(bundle_name, key, asset)
+        if self._resident_bytes > self._budget:
+            self._enforce_budget()
+
+    def unregister(self, key):
+        """
+        Forget a surface dropped by its owner (e.g. an invalidated layer)
+
+        Args:
+            key: Cache key used when loading or registering
+        """
+        asset = self._assets.pop(key, None)
+        if asset is None:
+            return
+        self._resident_bytes -= asset.nbytes
+        for name in asset.bundles:
+            bundle = self._bundles.get(name)
+            if bundle is not None:
+                bundle['keys'].discard(key)
+
+    def get_stats(self):
+        """
+        Resident memory broken down by category and bundle
+
+        Returns:
+            dict: Totals, per-category bytes and per-bundle refs/bytes
+        """
+        categories = {}
+        for asset in self._assets.values():
+            categories[asset.category] = categories.get(asset.category, 0) + asset.nbytes
+
+        bundles = {}
+        for name, bundle in self._bundles.items():
+            bundles[name] = {
+                'refs': bundle['refs'],
+                'bytes': sum(self._assets[key].nbytes for key in bundle['keys'] if key in self._assets)
+            }
+
+        return {
+            'resident_bytes': self._resident_bytes,
+            'budget_bytes': self._budget,
+            'assets': len(self._assets),
+            'evictions': self._evictions,
+            'hits': self._hits,
+            'misses': self._misses,
+            'categories': categories,
+            'bundles': bundles
+        }
+
+    def format_report(self):
+        """
+        Human-readable residency report
+
+        Returns:
+            str: Report text
+        """
+        stats = self.get_stats()
+        mb = 1024.0 * 1024.0
+        lines = [f"Surfaces resident: {stats['resident_bytes'] / mb:.1f} MB of "
+                 f"{stats['budget_bytes'] / mb:.1f} MB budget, {stats['assets']} assets, "
+                 f"{stats['evictions']} bundles evicted"]
+        for category, nbytes in sorted(stats['categories'].items(), key=lambda item: -item[1]):
+            lines.append(f"  {category:<12}{nbytes / mb:8.2f} MB")
+        for name, bundle in stats['bundles'].items():
+            lines.append(f"  [{name}] refs {bundle['refs']}, {bundle['bytes'] / mb:.2f} MB")
+        return '\n'.join(lines)
+
+    def _touch(self, name):
+        """Get (or create) a bundle and mark it most recently used"""
+        bundle = self._bundles.get(name)
+        if bundle is None:
+            bundle = self._bundles[name] = {'refs': 0, 'keys': set()}
+        else:
+            self._bundles.move_to_end(name)
+        return bundle
+
+    def _add(self, key, value, category, nbytes):
+        """Store a new asset"""
+        asset = _Asset(value, category, nbytes)
+        self._assets[key] = asset
+        self._resident_bytes += nbytes
+        return asset
+
+    def _link(self, bundle_name, key, asset):
+        """Record that a bundle uses an asset"""
+        bundle = self._touch(bundle_name)
+        bundle['keys'].add(key)
+        asset.bundles.add(bundle_name)
+
+    def _enforce_budget(self):
+        """Evict unreferenced bundles, least recently used first, until under budget"""
+        if self._resident_bytes <= self._budget:
+            return
+
+        for name in list(self._bundles):
+            if self._resident_bytes <= self._budget:
+                return
+            bundle = self._bundles[name]
+            if bundle['refs'] > 0 or name in self._pinned:
+                continue
+            self._evict(name)
+
+        if self._resident_bytes > self._budget:
+            logger.warning("Surface budget exceeded by referenced bundles: %.1f MB of %.1f MB",
+                           self._resident_bytes / (1024.0 * 1024.0), self._budget / (1024.0 * 1024.0))
+
+    def _evict(self, name):
+        """Drop a bundle and every asset no other bundle still uses"""
+        bundle = self._bundles.pop(name)
+        for key in bundle['keys']:
+            asset = self._assets.get(key)
+            if asset is None:
+                continue
+            asset.bundles.discard(name)
+            if not asset.bundles:
+                del self._assets[key]
+                self._resident_bytes -= asset.nbytes
+        self._evictions += 1
+
+    # Properties
+    @property
+    def resident_bytes(self):
+        return self._resident_bytes
+
+    @property
+    def budget_bytes(self):
+        return self._budget
@@ -0,0 +1,211 @@
+"""
+Streaming percentile rank of final scores
+Demonstrates: Encapsulation
+
+ScoreSketch is a KLL quantile sketch. Scores go into a buffer at level 0.
+When a level is full it is sorted, and every other item (starting at a
+random first or second) moves one level up with twice the weight. The
+level capacities shrink by 2/3 per level below the top one, so the sketch
+keeps a few hundred scores however many games are added. Rank error
+stays well under one percent. Two sketches merge by concatenating their levels and
+compacting again: sketches from several machines combine into the one
+they would have built together.
+
+Ranks are answered from a sorted table of the retained scores, which is
+rebuilt after a change. A query is a bisect over that bounded table, so
+its cost does not grow with the history. The sketch is saved as JSON
+(a few kilobytes) in data/score_sketch.json.
+"""
+import math
+import random
+from bisect import bisect_left
+from utils.storage import get_data_path, load_json, save_json
+from utils.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+
+class ScoreSketch:
+    """
+    Mergeable quantile sketch of integer scores
+    Encapsulation: Compactor levels and the rank table are private; scores
+    are added with add()/merge() and read back with top_fraction()
+    """
+
+    DEFAULT_FILE = 'score_sketch.json'
+    FORMAT_VERSION = 1
+
+    # Capacity of the top level, and the shrink factor per level below it
+    K = 200
+    CAPACITY_RATIO = 2.0 / 3.0
+
+    def __init__(self, k=K, seed=None):
+        """
+        Args:
+            k: Capacity of the top level (larger = more accurate, more memory)
+            seed: Seed for the compaction coin (None = random)
+        """
+        self._k = k
+        self._rng = random.Random(seed)
+        self._levels = [[]]
+        self._retained = 0
+        self._count = 0
+
+        # Sorted retained scores and the weight at or above each of them
+        self._table = None
+
+    def _capacity(self, level):
+        """Items a level holds before it is compacted"""
+        depth = len(self._levels) - level - 1
+        return int(math.ceil(self._k * self.CAPACITY_RATIO ** depth)) + 1
+
+    def _max_retained(self):
+        return sum(self._capacity(level) for level in range(len(self._levels)))
+
+    def add(self, score):
+        """
+        Add one final score
+
+        Args:
+            score: Integer score
+        """
+        self._levels[0].append(int(score))
+        self._retained += 1
+        self._count += 1
+        self._table = None
+        if self._retained >= self._max_retained():
+            self._compress()
+
+    def merge(self, other):
+        """
+        Fold another sketch into this one (e.g. one from another machine)
+
+        Args:
+            other: ScoreSketch
+        """
+        while len(self._levels) < len(other._levels):
+            self._levels.append([])
+        for level, items in enumerate(other._levels):
+            self._levels[level].extend(items)
+        self._retained += other._retained
+        self._count += other._count
+        self._table = None
+        while self._retained >= self._max_retained():
+            self._compress()
+
+    def _compress(self):
+        """Compact full levels from the bottom until the sketch fits again"""
+        for level in range(len(self._levels)):
+            items = self._levels[level]
+            if len(items) < self._capacity(level):
+                continue
+            if level + 1 == len(self._levels):
+                self._levels.append([])
+
+            # Odd item out stays; every other sorted item moves up with double weight
+            items.sort()
+            kept = [items.pop()] if len(items) % 2 else []
+            self._levels[level + 1].extend(items[self._rng.randint(0, 1)::2])
+            self._levels[level] = kept
+            self._retained = sum(len(level_items) for level_items in self._levels)
+            if self._retained < self._max_retained():
+                break
+
+    def _build_table(self):
+        """Sorted (score, weight) table with the weight at or above each score"""
+        weighted = sorted((score, 1 << level)
+                          for level, items in enumerate(self._levels) for score in items)
+        scores = [score for score, _ in weighted]
+        at_or_above = [0] * (len(weighted) + 1)
+        for index in range(len(weighted) - 1, -1, -1):
+            at_or_above[index] = at_or_above[index + 1] + weighted[index][1]
+        self._table = (scores, at_or_above)
+
+    def top_fraction(self, score):
+        """
+        Share of recorded scores at least as high
+
+        Args:
+            score: Score to rank (normally one already added)
+
+        Returns:
+            float: 0.0-1.0 (0.07 = top 7%), None while the sketch is empty
+        """
+        if not self._count:
+            return None
+        if self._table is None:
+            self._build_table()
+        scores, at_or_above = self._table
+        return at_or_above[bisect_left(scores, score)] / at_or_above[0]
+
+    def to_dict(self):
+        """JSON-serialisable form (see from_dict)"""
+        return {'version': self.FORMAT_VERSION, 'k': self._k, 'count': self._count,
+                'levels': self._levels}
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Rebuild a sketch saved with to_dict
+
+        Args:
+            data: Dictionary from to_dict
+
+        Returns:
+            ScoreSketch
+
+        Raises:
+            ValueError: Unknown format version or malformed levels
+        """
+        if not isinstance(data, dict) or data.get('version') != cls.FORMAT_VERSION:
+            raise ValueError("unsupported score sketch format")
+        sketch = cls(int(data['k']))
+        sketch._levels = [[int(score) for score in items] for items in data['levels']] or [[]]
+        sketch._retained = sum(len(items) for items in sketch._levels)
+        sketch._count = int(data['count'])
+        return sketch
+
+    @classmethod
+    def load(cls, path=None):
+        """
+        Load a saved sketch
+
+        Args:
+            path: JSON file (default data/score_sketch.json)
+
+        Returns:
+            ScoreSketch: The saved sketch, or an empty one if missing or invalid
+        """
+        path = path or get_data_path(cls.DEFAULT_FILE)
+        data = load_json(path)
+        if data is None:
+            return cls()
+        try:
+            return cls.from_dict(data)
+        except (KeyError, TypeError, ValueError) as e:
+            logger.error("Ignoring invalid score sketch '%s': %s", path, e)
+            return cls()
+
+    def save(self, path=None):
+        """
+        Save the sketch as JSON
+
+        Args:
+            path: JSON file (default data/score_sketch.json)
+
+        Returns:
+            bool: True if saved
+        """
+        return save_json(path or get_data_path(self.DEFAULT_FILE), self.to_dict())
+
+    # Properties
+    @property
+    def count(self):
+        """Scores added (one per player per game, including merged sketches)"""
+        return self._count
+
+    @property
+    def retained(self):
+        """Scores kept in the sketch"""
+        return self._retained
@@ -0,0 +1,296 @@
+"""
+Non-blocking screenshots and burst capture
+Singleton pattern: one capture worker and buffer pool for the game window
+
+pygame.image.save compresses the 1000x600 frame on the calling thread,
+which stalls the main loop for a couple of hundred milliseconds. Here the
+main thread only copies the finished frame's raw 32-bit pixels into a
+preallocated buffer (a quarter of a millisecond). A worker thread converts
+the buffer to RGB rows with NumPy and writes the PNG with zlib, which runs
+without the GIL. A burst captures consecutive frames the same way; frames
+that find no free buffer are skipped and counted instead of blocking.
+"""
+import os
+import queue
+import struct
+import sys
+import threading
+import time
+import zlib
+from collections import deque
+import numpy as np
+from utils.storage import get_data_path
+from utils.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+_PNG_FILTER_UP = 2  # Each row stored as its difference to the row above
+
+
+def _png_chunk(chunk_type, data):
+    """One length-prefixed, CRC-terminated PNG chunk"""
+    return (struct.pack('>I', len(data)) + chunk_type + data +
+            struct.pack('>I', zlib.crc32(chunk_type + data) & 0xffffffff))
+
+
+def encode_png(pixels, width, height, pitch, shifts, level=1):
+    """
+    Encode raw 32-bit surface pixels as an RGB PNG
+
+    Args:
+        pixels: uint8 array of height * pitch bytes (surface memory layout)
+        width: Image width
+        height: Image height
+        pitch: Bytes per surface row
+        shifts: Surface.get_shifts() of the pixels (channel positions)
+        level: zlib compression level (1 = fastest)
+
+    Returns:
+        bytes: PNG file contents
+    """
+    rows = pixels.reshape(height, pitch)[:, :width * 4].reshape(height, width, 4)
+    rgb = np.empty((height, width, 3), np.uint8)
+    for channel, shift in enumerate(shifts[:3]):
+        byte = shift // 8
+        rgb[:, :, channel] = rows[:, :, byte if sys.byteorder == 'little' else 3 - byte]
+    rgb = rgb.reshape(height, width * 3)
+
+    # Filter byte + row; the Up filter stores modulo-256 differences to the
+    # row above, which compress better than raw rows at the same speed
+    scanlines = np.empty((height, width * 3 + 1), np.uint8)
+    scanlines[:, 0] = _PNG_FILTER_UP
+    scanlines[0, 1:] = rgb[0]
+    np.subtract(rgb[1:], rgb[:-1], out=scanlines[1:, 1:])
+
+    header = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)  # 8-bit RGB
+    return b''.join((
+        _PNG_SIGNATURE,
+        _png_chunk(b'IHDR', header),
+        _png_chunk(b'IDAT', zlib.compress(scanlines.tobytes(), level)),
+        _png_chunk(b'IEND', b'')
+    ))
+
+
+class ScreenCapture:
+    """
+    Singleton screenshot service
+    Encapsulation: The buffer pool, job queue and worker thread are
+    private; callers request frames or capture a surface directly
+    """
+
+    DEFAULT_BURST_FRAMES = 30
+    MAX_BUFFERS = 60
+    COMPRESS_LEVEL = 1
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(ScreenCapture, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self._initialized = True
+
+        # Preallocated raw frame buffers; free ones wait in the deque
+        self._buffers = []
+        self._free = deque()
+        self._buffer_bytes = 0
+
+        # Frames still to capture for the current request, and their folder
+        self._pending = 0
+        self._burst_dir = None
+        self._burst_index = 0
+
+        self._jobs = queue.Queue()
+        self._worker = None
+
+        self._captured = 0
+        self._dropped = 0
+        self._written = 0
+        self._failed = 0
+        self._copy_time = 0.0
+        self._encode_time = 0.0
+
+    def prepare(self, surface):
+        """
+        Size the buffer pool for a surface (call once the display exists)
+
+        Args:
+            surface: Display surface
+        """
+        nbytes = surface.get_pitch() * surface.get_height()
+        if nbytes != self._buffer_bytes:
+            # Display size changed: buffers of the old size are useless
+            self._buffers = []
+            self._free.clear()
+            self._buffer_bytes = nbytes
+        self._reserve(1)
+
+    def request(self, frames=1):
+        """
+        Capture the next frames presented (see on_frame)
+
+        The pool grows to the burst size here, on the first burst of that
+        size only, so the captured frames themselves just copy.
+
+        Args:
+            frames: 1 for a screenshot, more for a burst of consecutive frames
+        """
+        frames = max(1, min(int(frames), self.MAX_BUFFERS))
+        self._pending = frames
+        self._burst_index = 0
+        self._burst_dir = None
+        if frames > 1:
+            self._burst_dir = get_data_path('screenshots', time.strftime('burst-%Y%m%d-%H%M%S'))
+        self._reserve(frames)
+
+    def on_frame(self, surface):
+        """
+        Capture the finished frame if a request is pending (call before flip)
+
+        Args:
+            surface: Display surface
+        """
+        if self._pending <= 0:
+            return
+
+        self._pending -= 1
+        if self._burst_dir is None:
+            path = get_data_path('screenshots', self._timestamp_name('screenshot') + '.png')
+        else:
+            path = os.path.join(self._burst_dir, f'frame-{self._burst_index:03d}.png')
+            self._burst_index += 1
+        self.capture(surface, path, last=self._pending == 0)
+
+    def capture(self, surface, path=None, last=True):
+        """
+        Copy a surface into a free buffer and queue it for encoding
+
+        Args:
+            surface: 32-bit pygame.Surface (normally the display)
+            path: PNG file to write (default data/screenshots/screenshot-<time>.png)
+            last: Whether this is the last frame of its request (logged when written)
+
+        Returns:
+            str or None: Path the PNG will be written to, None if no buffer was free
+        """
+        if surface.get_bitsize() != 32:
+            logger.warning("Screen capture needs a 32-bit surface, got %d-bit", surface.get_bitsize())
+            return None
+
+        started = time.perf_counter()
+        if surface.get_pitch() * surface.get_height() != self._buffer_bytes:
+            self.prepare(surface)
+            self._reserve(self._pending + 1)
+
+        try:
+            buffer = self._free.popleft()
+        except IndexError:
+            # Worker is behind: skip this frame rather than stall the game
+            self._dropped += 1
+            return None
+
+        np.copyto(buffer, np.frombuffer(surface.get_buffer(), np.uint8))
+        path = path or get_data_path('screenshots', self._timestamp_name('screenshot') + '.png')
+        self._jobs.put((buffer, path, surface.get_size(), surface.get_pitch(),
+                        surface.get_shifts(), last))
+        self._captured += 1
+        self._copy_time += time.perf_counter() - started
+
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._run, name='screen-capture', daemon=True)
+            self._worker.start()
+        return path
+
+    def close(self, timeout=10.0):
+        """
+        Wait for queued frames to be written
+
+        Args:
+            timeout: Seconds to wait at most
+        """
+        deadline = time.perf_counter() + timeout
+        while self._jobs.unfinished_tasks and time.perf_counter() < deadline:
+            time.sleep(0.01)
+        if self._jobs.unfinished_tasks:
+            logger.warning("Screen capture: %d frames not written", self._jobs.unfinished_tasks)
+
+    def get_stats(self):
+        """
+        Capture counters and timings
+
+        Returns:
+            dict: Frames captured/dropped/written/failed, main thread copy
+                  time and worker encode time (ms per frame)
+        """
+        return {
+            'captured': self._captured,
+            'dropped': self._dropped,
+            'written': self._written,
+            'failed': self._failed,
+            'queued': self._jobs.unfinished_tasks,
+            'buffers': len(self._buffers),
+            'copy_ms': self._copy_time / self._captured * 1000.0 if self._captured else 0.0,
+            'encode_ms': self._encode_time / self._written * 1000.0 if self._written else 0.0
+        }
+
+    def _reserve(self, count):
+        """Grow the buffer pool to at least count buffers (outside of capture frames)"""
+        if not self._buffer_bytes:
+            return
+        while len(self._buffers) < min(count, self.MAX_BUFFERS):
+            # Written once now so its pages are mapped before a capture copies into it
+            buffer = np.empty(self._buffer_bytes, np.uint8)
+            buffer.fill(0)
+            self._buffers.append(buffer)
+            self._free.append(buffer)
+
+    def _timestamp_name(self, prefix):
+        """File name stem with millisecond time, e.g. screenshot-20240101-120000-123"""
+        return time.strftime(f'{prefix}-%Y%m%d-%H%M%S') + f'-{int(time.time() * 1000) % 1000:03d}'
+
+    def _run(self):
+        """Worker loop: encode and write queued frames, then free their buffers"""
+        # Lower the worker's OS priority so encoding only takes CPU time the
+        # game loop leaves idle (Linux applies nice values per thread)
+        try:
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 10)
+        except (AttributeError, OSError):
+            pass
+
+        while True:
+            buffer, path, (width, height), pitch, shifts, last = self._jobs.get()
+            try:
+                started = time.perf_counter()
+                data = encode_png(buffer, width, height, pitch, shifts, self.COMPRESS_LEVEL)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, 'wb') as png_file:
+                    png_file.write(data)
+                self._encode_time += time.perf_counter() - started
+                self._written += 1
+                if last:
+                    stats = self.get_stats()
+                    logger.info("Screenshot saved to %s (%d written, %d dropped, copy %.2f ms, "
+                                "encode %.1f ms per frame)", path, stats['written'],
+                                stats['dropped'], stats['copy_ms'], stats['encode_ms'])
+            except Exception as e:
+                self._failed += 1
+                logger.error("Error writing screenshot '%s': %s", path, e)
+            finally:
+                if len(buffer) == self._buffer_bytes:
+                    self._free.append(buffer)
+                self._jobs.task_done()
+
+    # Properties
+    @property
+    def is_capturing(self):
+        """Whether frames of a request are still to be captured"""
+        return self._pending > 0
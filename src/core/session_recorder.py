@@ -0,0 +1,224 @@
+"""
+Session recording for replays and video export
+Demonstrates: Encapsulation, Exception Handling
+
+A recording is the game snapshot at the start of a session plus, for every
+frame, the delta time and the input axes the game was updated with. Game
+updates are deterministic given those, so tools/video_export.py can replay
+a session off-screen frame for frame.
+
+File layout (little-endian, struct-packed):
+    header   magic, version, player count, collision mode, width, height, frame count
+    snapshot length + Game.snapshot() bytes
+    frames   delta time, then (axis, held) per player
+"""
+import os
+import struct
+import time
+from core.game import COLLISION_MODES
+from utils.storage import get_data_path
+from utils.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+
+RECORDING_MAGIC = b'MBGR'
+RECORDING_VERSION = 2  # Version 1 timelines predate the item registry
+_RECORDING_HEADER = struct.Struct('<4sHBBHHI')  # magic, version, players, collision mode,
+                                                 # width, height, frame count
+_RECORDING_SNAPSHOT = struct.Struct('<I')        # snapshot length
+_RECORDING_DELTA = struct.Struct('<d')           # delta time (seconds, as used by Game.update)
+_RECORDING_AXIS = struct.Struct('<db')           # axis, held direction
+
+# Recordings kept in data/recordings/ (oldest are deleted)
+MAX_RECORDINGS = 20
+
+
+class SessionRecording:
+    """
+    A loaded recording
+    Encapsulation: Parsed once, read through properties
+    """
+
+    def __init__(self, num_players, collision_mode, width, height, snapshot, frames):
+        """
+        Args:
+            num_players: Number of players in the session
+            collision_mode: COLLISION_PIXEL or COLLISION_AABB
+            width: Screen width of the session
+            height: Screen height of the session
+            snapshot: Game.snapshot() bytes at the first frame
+            frames: List of (delta_time, axes) per frame
+        """
+        self._num_players = num_players
+        self._collision_mode = collision_mode
+        self._width = width
+        self._height = height
+        self._snapshot = snapshot
+        self._frames = frames
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read a recording file
+
+        Args:
+            path: File written by SessionRecorder
+
+        Returns:
+            SessionRecording: The parsed recording
+
+        Raises:
+            ValueError: If the file is not a valid recording
+        """
+        with open(path, 'rb') as recording_file:
+            data = recording_file.read()
+
+        try:
+            (magic, version, num_players, collision_code, width, height,
+             frame_count) = _RECORDING_HEADER.unpack_from(data, 0)
+            if magic != RECORDING_MAGIC or version != RECORDING_VERSION:
+                raise ValueError(f"unsupported recording (version {version})")
+            offset = _RECORDING_HEADER.size
+
+            (snapshot_length,) = _RECORDING_SNAPSHOT.unpack_from(data, offset)
+            offset += _RECORDING_SNAPSHOT.size
+            snapshot = data[offset:offset + snapshot_length]
+            offset += snapshot_length
+
+            frames = []
+            for _ in range(frame_count):
+                (delta_time,) = _RECORDING_DELTA.unpack_from(data, offset)
+                offset += _RECORDING_DELTA.size
+                axes = []
+                for _ in range(num_players):
+                    axes.append(_RECORDING_AXIS.unpack_from(data, offset))
+                    offset += _RECORDING_AXIS.size
+                frames.append((delta_time, axes))
+        except struct.error as e:
+            raise ValueError(f"truncated recording: {e}")
+
+        return cls(num_players, COLLISION_MODES[collision_code], width, height, snapshot, frames)
+
+    # Properties
+    @property
+    def num_players(self):
+        return self._num_players
+
+    @property
+    def collision_mode(self):
+        return self._collision_mode
+
+    @property
+    def width(self):
+        return self._width
+
+    @property
+    def height(self):
+        return self._height
+
+    @property
+    def snapshot(self):
+        return self._snapshot
+
+    @property
+    def frames(self):
+        return self._frames
+
+    @property
+    def frame_count(self):
+        return len(self._frames)
+
+
+class SessionRecorder:
+    """
+    Records the inputs of one game session
+    Encapsulation: Frames are packed in memory and written once per session
+    """
+
+    def __init__(self, game, width, height):
+        """
+        Args:
+            game: Game being recorded
+            width: Screen width
+            height: Screen height
+        """
+        self._game = game
+        self._width = width
+        self._height = height
+        self._snapshot = None
+        self._frames = []
+        self._last_path = None
+
+    def start(self):
+        """Begin a new recording from the game's current state"""
+        self._snapshot = self._game.snapshot()
+        self._frames = []
+
+    def record_frame(self, axes, delta_time):
+        """
+        Record one game update
+
+        Args:
+            axes: (axis, held) per player, as passed to Game.apply_input
+            delta_time: Delta time used by Game.update
+        """
+        if self._snapshot is None:
+            return
+        parts = [_RECORDING_DELTA.pack(delta_time)]
+        parts.extend(_RECORDING_AXIS.pack(axis, held) for axis, held in axes)
+        self._frames.append(b''.join(parts))
+
+    def finish(self):
+        """
+        Write the recording (if it has frames) and stop recording
+
+        Returns:
+            str or None: Path of the written file
+        """
+        snapshot, frames = self._snapshot, self._frames
+        self._snapshot = None
+        self._frames = []
+        if snapshot is None or not frames:
+            return None
+
+        try:
+            stamp = time.strftime('session-%Y%m%d-%H%M%S') + f'-{int(time.time() * 1000) % 1000:03d}'
+            path = get_data_path('recordings', stamp + '.mbgr')
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            header = _RECORDING_HEADER.pack(
+                RECORDING_MAGIC, RECORDING_VERSION, len(self._game.players),
+                COLLISION_MODES.index(self._game.collision_mode), self._width, self._height,
+                len(frames)
+            )
+            with open(path, 'wb') as recording_file:
+                recording_file.write(header)
+                recording_file.write(_RECORDING_SNAPSHOT.pack(len(snapshot)))
+                recording_file.write(snapshot)
+                recording_file.write(b''.join(frames))
+            self._last_path = path
+            self._prune(os.path.dirname(path))
+            return path
+        except Exception as e:
+            logger.error("Error writing session recording: %s", e)
+            return None
+
+    def _prune(self, directory):
+        """Delete the oldest recordings beyond MAX_RECORDINGS"""
+        recordings = sorted(name for name in os.listdir(directory) if name.endswith('.mbgr'))
+        for name in recordings[:-MAX_RECORDINGS]:
+            try:
+                os.remove(os.path.join(directory, name))
+            except OSError:
+                pass
+
+    # Properties
+    @property
+    def is_recording(self):
+        return self._snapshot is not None
+
+    @property
+    def last_path(self):
+        """Path of the last written recording, if any"""
+        return self._last_path
@@ -0,0 +1,198 @@
+"""
+Pipelined simulation: a worker thread steps the game, the main thread renders
+Demonstrates: Encapsulation, Composition
+
+The worker calls a step function at a fixed rate. Each step returns an
+immutable frame (e.g. a GameFrame), which is published into one of two
+slots; publishing flips which slot is the front. The renderer always takes
+the front slot, so it never waits for a step in progress and never sees a
+half-updated state. A frame that is replaced before it was rendered is
+dropped rather than queued, which bounds the handoff latency to about one
+step interval.
+
+The game logic itself stays under the GIL; what the pipeline wins is the
+time the main thread spends inside SDL blits and the display flip, which
+pygame runs with the GIL released. tools/pipeline_benchmark.py measures how
+much simulation actually overlaps that time.
+"""
+import threading
+import time
+from collections import deque
+from utils.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+
+# Latency/step samples kept for percentiles
+_SAMPLE_WINDOW = 600
+
+
+def _percentile(samples, fraction):
+    """Nearest-rank percentile of a list of numbers (0 when empty)"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class SimulationPipeline:
+    """
+    Fixed-rate simulation thread with a double-buffered frame handoff
+    Encapsulation: The slots, the worker thread and its statistics are
+    private; the renderer only calls latest()
+    """
+
+    def __init__(self, step, rate=60, name='simulation', record_timeline=False):
+        """
+        Args:
+            step: Callable run on the worker; returns an immutable frame
+            rate: Steps per second
+            name: Thread name
+            record_timeline: Keep (start, end) perf_counter times of every
+                             step (for benchmarks)
+        """
+        self._step = step
+        self._interval = 1.0 / rate
+        self._name = name
+
+        # Front/back slots of (frame, published_at); the front is the newest
+        self._slots = [None, None]
+        self._front = 0
+        self._front_rendered = True
+        self._lock = threading.Lock()
+
+        self._stop_event = threading.Event()
+        self._thread = None
+
+        self._steps = 0
+        self._rendered = 0
+        self._dropped = 0
+        self._repeated = 0
+        self._behind = 0
+        self._step_times = deque(maxlen=_SAMPLE_WINDOW)
+        self._latencies = deque(maxlen=_SAMPLE_WINDOW)
+        self._timeline = [] if record_timeline else None
+
+    def start(self):
+        """Start the worker (no-op while it is running)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=1.0):
+        """
+        Stop the worker and wait for its current step to finish
+
+        Args:
+            timeout: Seconds to wait for the thread
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def latest(self):
+        """
+        Newest published frame (called by the renderer)
+
+        Returns:
+            The frame returned by the newest step, or None before the first
+        """
+        with self._lock:
+            slot = self._slots[self._front]
+            if slot is None:
+                return None
+            if self._front_rendered:
+                self._repeated += 1
+            else:
+                self._front_rendered = True
+                self._rendered += 1
+                self._latencies.append(time.perf_counter() - slot[1])
+        return slot[0]
+
+    def _run(self):
+        """Worker loop: step, publish, sleep until the next step is due"""
+        next_step = time.perf_counter()
+        while not self._stop_event.is_set():
+            started = time.perf_counter()
+            try:
+                frame = self._step()
+            except Exception as e:
+                logger.error("Simulation step failed, stopping the pipeline: %s", e)
+                return
+            finished = time.perf_counter()
+            self._publish(frame, finished)
+
+            self._steps += 1
+            self._step_times.append(finished - started)
+            if self._timeline is not None:
+                self._timeline.append((started, finished))
+
+            next_step += self._interval
+            delay = next_step - time.perf_counter()
+            if delay > 0:
+                self._stop_event.wait(delay)
+            elif delay < -self._interval:
+                # More than a step behind: skip ahead instead of bursting
+                self._behind += 1
+                next_step = time.perf_counter()
+
+    def _publish(self, frame, published_at):
+        """Write the back slot, then flip it to the front"""
+        back = 1 - self._front
+        self._slots[back] = (frame, published_at)
+        with self._lock:
+            if not self._front_rendered:
+                self._dropped += 1
+            self._front = back
+            self._front_rendered = False
+
+    def get_stats(self):
+        """
+        Step and handoff statistics
+
+        Returns:
+            dict: Counts, step time and handoff latency percentiles (ms)
+        """
+        step_times = list(self._step_times)
+        latencies = list(self._latencies)
+        return {
+            'steps': self._steps,
+            'rendered': self._rendered,
+            'dropped': self._dropped,
+            'repeated': self._repeated,
+            'behind': self._behind,
+            'step_ms': sum(step_times) / len(step_times) * 1000.0 if step_times else 0.0,
+            'step_p95_ms': _percentile(step_times, 0.95) * 1000.0,
+            'latency_p50_ms': _percentile(latencies, 0.50) * 1000.0,
+            'latency_p95_ms': _percentile(latencies, 0.95) * 1000.0,
+            'latency_max_ms': max(latencies) * 1000.0 if latencies else 0.0
+        }
+
+    def format_report(self):
+        """
+        Human-readable pipeline report
+
+        Returns:
+            str: Report text
+        """
+        stats = self.get_stats()
+        return (f"Simulation pipeline: {stats['steps']} steps "
+                f"({stats['step_ms']:.2f} ms avg, {stats['step_p95_ms']:.2f} ms p95), "
+                f"{stats['rendered']} rendered, {stats['dropped']} dropped, "
+                f"{stats['repeated']} repeated, {stats['behind']} catch-ups; "
+                f"handoff latency {stats['latency_p50_ms']:.1f} ms p50, "
+                f"{stats['latency_p95_ms']:.1f} ms p95, {stats['latency_max_ms']:.1f} ms max")
+
+    # Properties
+    @property
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def timeline(self):
+        """(start, end) of every step, if recorded"""
+        return tuple(self._timeline) if self._timeline is not None else ()
@@ -0,0 +1,350 @@
+"""
+Spawn schedulers that precompute a whole session's spawn timeline
+Demonstrates: Inheritance, Polymorphism (strategy pattern), Encapsulation
+"""
+import bisect
+import random
+from abc import ABC, abstractmethod
+from array import array
+from itertools import accumulate
+from core.item import SPEED_FRAME_RATE
+from core.item_registry import ItemRegistry
+
+
+class SpawnScheduler(ABC):
+    """
+    Abstract base class for spawn schedulers
+    Inheritance: Parent class for Linear, Poisson and Wave schedulers
+    Encapsulation: The timeline is stored in compact private arrays and only
+    read through a cursor, so a game tick never touches the random generator
+    """
+
+    def __init__(self, screen_width, duration=60.0, weights=None, seed=None):
+        """
+        Initialize scheduler and precompute the first timeline
+
+        Args:
+            screen_width: Width of game screen (spawn x range)
+            duration: Session length in seconds
+            weights: Relative spawn weight per item type index (default:
+                     the weights of the item registry)
+            seed: Optional seed for a repeatable timeline
+        """
+        self._screen_width = screen_width
+        self._duration_ms = duration * 1000.0
+        if weights is None:
+            weights = [item_type.weight for item_type in ItemRegistry().types]
+        self._cumulative_weights = list(accumulate(weights))
+
+        # Timeline (parallel arrays, one entry per spawn)
+        self._times = array('d')     # Spawn time in milliseconds
+        self._xs = array('h')        # Spawn x position
+        self._type_ids = array('H')  # Item type index
+        self._speeds = array('f')    # Fall speed in pixels per frame
+
+        # Optional beat quantisation: (BeatGrid, grid points per beat, fall distance in px)
+        self._beat_quantisation = None
+
+        # Cursor state
+        self._seed = None
+        self._cursor = 0
+        self._elapsed = 0.0
+
+        self.generate(seed)
+
+    @abstractmethod
+    def _generate_times(self, rng):
+        """
+        Yield spawn times in ascending order (abstract method)
+
+        Args:
+            rng: random.Random instance dedicated to this timeline
+
+        Yields:
+            float: Spawn time in milliseconds since session start
+        """
+        pass
+
+    def generate(self, seed=None):
+        """
+        Precompute a fresh timeline and rewind the cursor
+
+        Args:
+            seed: Optional seed; a random one is drawn if omitted
+        """
+        if seed is None:
+            seed = random.getrandbits(32)
+        self._seed = seed
+        rng = random.Random(seed)
+
+        times = array('d')
+        xs = array('h')
+        type_ids = array('H')
+        speeds = array('f')
+        cumulative = self._cumulative_weights
+        last_type = len(cumulative) - 1
+
+        for spawn_time in self._generate_times(rng):
+            if spawn_time >= self._duration_ms:
+                break
+            times.append(spawn_time)
+            xs.append(rng.randint(50, self._screen_width - 50))
+            # Weighted type pick
+            type_ids.append(min(bisect.bisect_right(cumulative, rng.random() * cumulative[-1]), last_type))
+            speeds.append(rng.uniform(2.0, 4.0))
+
+        if self._beat_quantisation is not None:
+            times, xs, type_ids, speeds = self._quantise_to_beats(times, xs, type_ids, speeds)
+
+        self._times = times
+        self._xs = xs
+        self._type_ids = type_ids
+        self._speeds = speeds
+        self.rewind()
+
+    def set_beat_quantisation(self, grid, subdivision, fall_distance):
+        """
+        Quantise timelines so items reach the catch line on a beat grid
+
+        Applies from the next generate(); regenerate with the same seed to
+        quantise the current session's timeline.
+
+        Args:
+            grid: BeatGrid of the session, or None for free timing
+            subdivision: Grid points per beat (2 = eighth notes)
+            fall_distance: Pixels an item falls from spawn to the catch line
+        """
+        self._beat_quantisation = None if grid is None else (grid, subdivision, fall_distance)
+
+    def _quantise_to_beats(self, times, xs, type_ids, speeds):
+        """
+        Delay every spawn until its item lands on the next grid point
+
+        An item falls speed pixels per 1/SPEED_FRAME_RATE seconds, so it
+        reaches the catch line fall_distance / speed / 60 seconds after spawning. Each spawn is
+        delayed (by less than one grid interval) so that moment is a grid
+        point; spawns pushed past the session end are dropped.
+
+        Returns:
+            tuple: New (times, xs, type_ids, speeds) arrays, sorted by time
+        """
+        grid, subdivision, fall_distance = self._beat_quantisation
+        order = []
+        for index, (spawn_time, speed) in enumerate(zip(times, speeds)):
+            fall = fall_distance / (speed * SPEED_FRAME_RATE)
+            quantised = (grid.next_time(spawn_time / 1000.0 + fall, subdivision) - fall) * 1000.0
+            if quantised < self._duration_ms:
+                order.append((quantised, index))
+        order.sort()
+
+        return (
+            array('d', (spawn_time for spawn_time, _ in order)),
+            array('h', (xs[index] for _, index in order)),
+            array('H', (type_ids[index] for _, index in order)),
+            array('f', (speeds[index] for _, index in order))
+        )
+
+    def rewind(self):
+        """Move the cursor back to the start of the timeline"""
+        self._cursor = 0
+        self._elapsed = 0.0
+
+    def seek(self, cursor, elapsed):
+        """
+        Move the cursor to a saved position (used when restoring snapshots)
+
+        Args:
+            cursor: Index of the next spawn
+            elapsed: Session time in milliseconds
+        """
+        self._cursor = max(0, min(cursor, len(self._times)))
+        self._elapsed = elapsed
+
+    def advance(self, delta_ms):
+        """
+        Advance session time and collect spawns that became due
+
+        Args:
+            delta_ms: Milliseconds elapsed since last call
+
+        Returns:
+            range: Timeline indices to spawn this tick (usually empty)
+        """
+        self._elapsed += delta_ms
+        start = self._cursor
+        end = start
+        times = self._times
+        count = len(times)
+        while end < count and times[end] <= self._elapsed:
+            end += 1
+        self._cursor = end
+        return range(start, end)
+
+    def rate_at(self, elapsed_ms, window_ms=2000.0):
+        """
+        Spawn rate over the part of the timeline starting at a session time
+
+        Args:
+            elapsed_ms: Session time in milliseconds
+            window_ms: Length of the timeline window to count
+
+        Returns:
+            float: Spawns per second (0 once the session is over)
+        """
+        end_ms = min(elapsed_ms + window_ms, self._duration_ms)
+        if end_ms <= elapsed_ms:
+            return 0.0
+        first = bisect.bisect_right(self._times, elapsed_ms)
+        last = bisect.bisect_right(self._times, end_ms)
+        return (last - first) * 1000.0 / (end_ms - elapsed_ms)
+
+    def get_spawn(self, index):
+        """
+        Get spawn parameters for a timeline entry
+
+        Args:
+            index: Timeline index returned by advance()
+
+        Returns:
+            tuple: (x, item_type_index, speed)
+        """
+        return (
+            self._xs[index],
+            self._type_ids[index],
+            self._speeds[index]
+        )
+
+    def get_spawn_time(self, index):
+        """
+        Get the session time a timeline entry is due
+
+        Args:
+            index: Timeline index returned by advance()
+
+        Returns:
+            float: Milliseconds since session start
+        """
+        return self._times[index]
+
+    # Properties for encapsulation
+    @property
+    def seed(self):
+        return self._seed
+
+    @property
+    def cursor(self):
+        return self._cursor
+
+    @property
+    def elapsed(self):
+        return self._elapsed
+
+    @property
+    def beat_subdivision(self):
+        """Grid points per beat spawns are quantised to (0 = free timing)"""
+        return self._beat_quantisation[1] if self._beat_quantisation is not None else 0
+
+    @property
+    def spawn_count(self):
+        """Total number of spawns in the precomputed timeline"""
+        return len(self._times)
+
+    @property
+    def spawn_times(self):
+        """Read-only view of spawn times (ms) for benchmarking/plotting"""
+        return memoryview(self._times).toreadonly()
+
+
+class LinearSpawnScheduler(SpawnScheduler):
+    """
+    Original difficulty curve: interval shrinks by a fixed step per spawn
+    Inheritance: Extends SpawnScheduler
+    """
+
+    def __init__(self, screen_width, start_interval=1000, min_interval=500, step=10, **kwargs):
+        """
+        Args:
+            screen_width: Width of game screen
+            start_interval: First spawn interval in milliseconds
+            min_interval: Interval stops shrinking at this value
+            step: Milliseconds removed from the interval after each spawn
+            **kwargs: Passed to SpawnScheduler
+        """
+        self._start_interval = start_interval
+        self._min_interval = min_interval
+        self._step = step
+        super().__init__(screen_width, **kwargs)
+
+    def _generate_times(self, rng):
+        """Yield spawn times with a linearly shrinking interval"""
+        spawn_time = 0.0
+        interval = self._start_interval
+        while True:
+            spawn_time += interval
+            yield spawn_time
+            # Gradually increase difficulty
+            if interval > self._min_interval:
+                interval -= self._step
+
+
+class PoissonSpawnScheduler(SpawnScheduler):
+    """
+    Poisson arrivals with a rate that ramps up over the session
+    Inheritance: Extends SpawnScheduler
+    """
+
+    def __init__(self, screen_width, start_rate=1.0, end_rate=2.0, **kwargs):
+        """
+        Args:
+            screen_width: Width of game screen
+            start_rate: Average spawns per second at session start
+            end_rate: Average spawns per second at session end
+            **kwargs: Passed to SpawnScheduler
+        """
+        self._start_rate = start_rate
+        self._end_rate = end_rate
+        super().__init__(screen_width, **kwargs)
+
+    def _generate_times(self, rng):
+        """Yield exponentially distributed inter-arrival times"""
+        spawn_time = 0.0
+        while True:
+            progress = min(spawn_time / self._duration_ms, 1.0)
+            rate = self._start_rate + (self._end_rate - self._start_rate) * progress
+            spawn_time += rng.expovariate(rate) * 1000.0
+            yield spawn_time
+
+
+class WaveSpawnScheduler(SpawnScheduler):
+    """
+    Scripted wave pattern: bursts of items followed by a rest, cycled
+    Inheritance: Extends SpawnScheduler
+    """
+
+    # (count, spacing_ms, rest_ms) for each wave
+    DEFAULT_WAVES = (
+        (3, 300, 1500),
+        (5, 250, 1500),
+        (8, 180, 2000),
+    )
+
+    def __init__(self, screen_width, waves=None, **kwargs):
+        """
+        Args:
+            screen_width: Width of game screen
+            waves: Sequence of (count, spacing_ms, rest_ms) tuples, cycled
+            **kwargs: Passed to SpawnScheduler
+        """
+        self._waves = tuple(waves) if waves else self.DEFAULT_WAVES
+        super().__init__(screen_width, **kwargs)
+
+    def _generate_times(self, rng):
+        """Yield spawn times following the wave script"""
+        spawn_time = 0.0
+        while True:
+            for count, spacing, rest in self._waves:
+                spawn_time += rest
+                for i in range(count):
+                    if i > 0:
+                        spawn_time += spacing
+                    yield spawn_time
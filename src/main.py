@@ -2,12 +2,24 @@
 Main entry point for Cooking Rhythm MBG game
 Demonstrates: Composition (contains screens), Exception Handling
 """
+import argparse
+import asyncio
+import os
+import threading
+import time
 import pygame
 import sys
-from screens.main_menu import MainMenu
-from screens.game_screen import GameScreen
-from screens.high_score import HighScore
 from core.audio_manager import AudioManager
+from core.input_manager import InputManager
+from core.profiler import Profiler
+from core.quality_manager import QualityManager
+from core.residency_manager import ResidencyManager
+from core.screen_capture import ScreenCapture
+from screens.base import BaseScreen
+from utils.logger import get_logger
+
+
+logger = get_logger('main')
 
 
 class GameManager:
@@ -17,14 +29,38 @@ class GameManager:
     Exception Handling: Graceful error recovery
     """
     
-    def __init__(self):
-        """Initialize game manager"""
-        # Initialize Pygame
+    # Length of the blend from the outgoing screen's last frame
+    TRANSITION_SECONDS = 0.3
+    
+    def __init__(self, num_players=1, profile_frames=300, collision_mode='pixel',
+                 surface_budget_mb=None, record_sessions=True, pipelined=False,
+                 burst_frames=ScreenCapture.DEFAULT_BURST_FRAMES, procedural_music=True,
+                 beat_sync=True, transitions=True):
+        """
+        Initialize game manager
+        
+        Args:
+            num_players: Number of local players for new games (1-4)
+            collision_mode: 'pixel' (sprite masks) or 'aabb' (rectangles only)
+            profile_frames: Frames covered by a profiler capture
+            surface_budget_mb: Resident surface budget in MB (None = default
+                               or MBG_SURFACE_BUDGET_MB)
+            record_sessions: Record game sessions for tools/video_export.py
+            pipelined: Run game simulation on its own thread (see core/sim_pipeline.py)
+            burst_frames: Consecutive frames captured by Shift+F2
+            procedural_music: Stream generated game music (core/music_engine.py)
+                              instead of assets/sounds/game_music.mp3
+            beat_sync: Quantise spawns to the beat grid and lock the music to it
+            transitions: Blend screen switches from a snapshot of the old screen
+        """
+        # Initialize only the Pygame subsystems the game uses (pygame.init()
+        # would also open joystick/camera and a default mixer that
+        # AudioManager then cannot reconfigure)
         try:
-            pygame.init()
+            pygame.display.init()
             pygame.font.init()
         except Exception as e:
-            print(f"Failed to initialize Pygame: {e}")
+            logger.critical("Failed to initialize Pygame: %s", e)
             sys.exit(1)
         
         # Screen settings
@@ -33,33 +69,75 @@ class GameManager:
         self._screen = pygame.display.set_mode((self._width, self._height))
         pygame.display.set_caption("Cooking Rhythm MBG")
         
-        # Clock for FPS management
+        # Clock for FPS management (creating it also starts the SDL timer
+        # behind pygame.time.get_ticks())
         self._clock = pygame.time.Clock()
         self._fps = 60
         
+        # Options passed to every new GameScreen
+        self._game_options = {'num_players': num_players, 'collision_mode': collision_mode,
+                              'record_session': record_sessions, 'pipelined': pipelined,
+                              'beat_sync': beat_sync}
+        
         # Screen management
         self._current_screen_name = 'MAIN_MENU'
         self._screens = {}
         self._current_screen = None
+        self._transitions = transitions
+        
+        # Results of the last game played, shown by the high score screen
+        # (a finished game returns to the menu before it is opened)
+        self._last_results = None
         
         # Initialize audio
         self._audio = AudioManager()
+        self._audio.set_procedural_music(procedural_music)
+        
+        # Dynamic quality scaling against the frame budget
+        self._quality = QualityManager()
+        self._quality.set_target_fps(self._fps)
+        
+        # Timestamped input; F11 logs input-to-present latency percentiles
+        self._input = InputManager()
+        
+        # Runtime profiler: F10 = cProfile, Shift+F10 = sampling, or signals
+        self._profiler = Profiler()
+        self._profiler.install_signal_handlers()
+        self._profile_frames = profile_frames
+        
+        # Surface memory budget; F12 logs resident bytes per category
+        self._residency = ResidencyManager()
+        if surface_budget_mb is not None:
+            self._residency.set_budget(surface_budget_mb * 1024 * 1024)
+        
+        # Screenshots: F2 = one frame, Shift+F2 = burst (PNGs written off-thread)
+        self._capture = ScreenCapture()
+        self._capture.prepare(self._screen)
+        self._burst_frames = burst_frames
         
         # Initialize screens
         self._initialize_screens()
         
+        # Async runner state (see run_async)
+        self._event_loop = None
+        self._tasks = set()
+        
+        # Background warm-up starts once the first frame is on screen
+        self._warmed_up = False
+        
         # Running flag
         self._running = True
     
     def _initialize_screens(self):
         """Initialize all game screens"""
         try:
+            from screens.main_menu import MainMenu
             self._screens['MAIN_MENU'] = MainMenu(self._width, self._height)
             # Game and HighScore screens will be created on demand when switching
             
             self._current_screen = self._screens['MAIN_MENU']
         except Exception as e:
-            print(f"Error initializing screens: {e}")
+            logger.error("Error initializing screens: %s", e)
             sys.exit(1)
     
     def _switch_screen(self, screen_name):
@@ -69,105 +147,372 @@ class GameManager:
         Args:
             screen_name: Name of screen to switch to
         """
+        if screen_name not in ('GAME', 'HIGH_SCORE', 'MAIN_MENU', 'CALIBRATION'):
+            logger.warning("Unknown screen: %s", screen_name)
+            return
+        
+        # The display still holds the outgoing screen's last presented frame:
+        # the new screen blends out from this one copy instead of both
+        # screens rendering during the transition
+        snapshot = self._screen.copy() if self._transitions else None
+        
+        # Release the outgoing screens first, so their bundles can be
+        # evicted if the incoming screen does not fit the surface budget
+        # (screens are recreated on every switch)
+        for screen in self._screens.values():
+            screen.dispose()
+        
+        # Keep the results of a game being left (its simulation thread is
+        # stopped by dispose) until the high score screen asks for them
+        game_screen = self._screens.get('GAME')
+        if game_screen and hasattr(game_screen, '_game'):
+            self._last_results = game_screen._game.get_results()
+        
         try:
+            # Screen modules are imported on first use so the menu can be
+            # shown before the game/high score stacks are loaded
             if screen_name == 'GAME':
                 # Create new game screen for fresh game
-                self._screens['GAME'] = GameScreen(self._width, self._height)
+                from screens.game_screen import GameScreen
+                self._screens['GAME'] = GameScreen(self._width, self._height, **self._game_options)
                 self._current_screen = self._screens['GAME']
                 self._current_screen_name = 'GAME'
             
             elif screen_name == 'HIGH_SCORE':
-                # Create high score screen with game results
-                game_screen = self._screens.get('GAME')
-                if game_screen and hasattr(game_screen, '_game'):
-                    results = game_screen._game.get_results()
-                else:
-                    results = None
-                
+                # Create high score screen with the last game's results
+                from screens.high_score import HighScore
                 self._screens['HIGH_SCORE'] = HighScore(
-                    self._width, self._height, results
+                    self._width, self._height, self._last_results
                 )
                 self._current_screen = self._screens['HIGH_SCORE']
                 self._current_screen_name = 'HIGH_SCORE'
             
+            elif screen_name == 'CALIBRATION':
+                # Tap-along audio latency calibration
+                from screens.calibration import CalibrationScreen
+                self._screens['CALIBRATION'] = CalibrationScreen(self._width, self._height)
+                self._current_screen = self._screens['CALIBRATION']
+                self._current_screen_name = 'CALIBRATION'
+            
             elif screen_name == 'MAIN_MENU':
                 # Return to main menu
+                from screens.main_menu import MainMenu
                 self._screens['MAIN_MENU'] = MainMenu(self._width, self._height)
                 self._current_screen = self._screens['MAIN_MENU']
                 self._current_screen_name = 'MAIN_MENU'
-            
-            else:
-                print(f"Unknown screen: {screen_name}")
         
         except Exception as e:
-            print(f"Error switching to screen {screen_name}: {e}")
-            # Fallback to main menu on error
+            logger.exception("Error switching to screen %s: %s", screen_name, e)
+            # Fallback to a fresh main menu on error
+            from screens.main_menu import MainMenu
+            self._screens['MAIN_MENU'] = MainMenu(self._width, self._height)
             self._current_screen = self._screens['MAIN_MENU']
             self._current_screen_name = 'MAIN_MENU'
+        
+        # Disposed screens are dropped; their bundles stay resident (and are
+        # reused by the next screen of the same kind) until evicted
+        self._screens = {self._current_screen_name: self._current_screen}
+        
+        if snapshot is not None:
+            # Back to the menu slides the old screen away; anything else fades
+            style = (BaseScreen.TRANSITION_SLIDE if self._current_screen_name == 'MAIN_MENU'
+                     else BaseScreen.TRANSITION_CROSSFADE)
+            self._current_screen.start_transition(snapshot, style, self.TRANSITION_SECONDS)
+    
+    def _run_frame(self):
+        """Process events, update and draw one frame (shared by both runners)"""
+        frame_start = time.perf_counter()
+        
+        # Handle events (polled and timestamped by the input layer)
+        for event in self._input.begin_frame():
+            if event.type == pygame.QUIT:
+                self._running = False
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F10:
+                mode = 'sampling' if event.mod & pygame.KMOD_SHIFT else 'cprofile'
+                self._profiler.toggle(mode, self._profile_frames)
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F11:
+                self._log_input_latency()
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F12:
+                logger.info("%s", self._residency.format_report())
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F2:
+                self._capture.request(self._burst_frames if event.mod & pygame.KMOD_SHIFT else 1)
+            else:
+                # Pass event to current screen
+                if self._current_screen:
+                    self._current_screen.safe_handle_event(event)
+        
+        # Update current screen
+        if self._current_screen:
+            self._current_screen.safe_update()
+            
+            # Collect async work before the screen can be replaced
+            self._start_screen_tasks(self._current_screen.pop_scheduled_tasks())
+            
+            # Check for screen transition
+            next_screen = self._current_screen.get_next_screen()
+            if next_screen:
+                self._switch_screen(next_screen)
+        
+        # Draw
+        self._screen.fill((0, 0, 0))
+        if self._current_screen:
+            self._current_screen.safe_draw(self._screen)
+        self._capture.on_frame(self._screen)
+        
+        # Work time only: flip may wait for vsync, which is not pressure
+        self._quality.record_frame((time.perf_counter() - frame_start) * 1000.0)
+        
+        pygame.display.flip()
+        self._input.mark_presented()
+        self._profiler.end_frame()
+        
+        if not self._warmed_up:
+            self._warmed_up = True
+            threading.Thread(target=self._warm_up, name='warm-up', daemon=True).start()
+    
+    def _log_input_latency(self):
+        """Log input-to-present latency percentiles collected so far"""
+        stats = self._input.get_latency_stats()
+        if stats['count']:
+            logger.info("Input-to-present latency over %d inputs: p50 %.1f ms, p95 %.1f ms, "
+                        "p99 %.1f ms, max %.1f ms", stats['count'], stats['p50'],
+                        stats['p95'], stats['p99'], stats['max'])
+    
+    def _warm_up(self):
+        """
+        Load what the first frame did not need (runs on a daemon thread)
+        
+        Screen modules and sound effects would otherwise be loaded on the
+        main thread the first time they are used, stalling that frame.
+        """
+        try:
+            import screens.game_screen
+            import screens.high_score
+            self._audio.preload_sounds()
+        except Exception as e:
+            logger.error("Error during warm-up: %s", e)
+    
+    def _start_screen_tasks(self, coroutines):
+        """
+        Start coroutines scheduled by a screen
+        
+        Under run_async() they become tasks on the running event loop.
+        The blocking run() has no event loop, so each coroutine runs to
+        completion on a daemon worker thread instead.
+        
+        Args:
+            coroutines: List of coroutine objects
+        """
+        for coroutine in coroutines:
+            try:
+                if self._event_loop is not None:
+                    task = self._event_loop.create_task(coroutine)
+                    self._tasks.add(task)
+                    task.add_done_callback(self._on_task_done)
+                else:
+                    threading.Thread(target=asyncio.run, args=(coroutine,), daemon=True).start()
+            except Exception as e:
+                logger.error("Error starting screen task: %s", e)
+    
+    def _on_task_done(self, task):
+        """Forget a finished task and report its failure, if any"""
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Error in screen task: %s", task.exception(), exc_info=task.exception())
     
     def run(self):
         """Main game loop"""
+        frame_duration = 1.0 / self._fps
+        next_frame = time.perf_counter()
+        
         while self._running:
             try:
-                # Handle events
-                for event in pygame.event.get():
-                    if event.type == pygame.QUIT:
-                        self._running = False
-                    else:
-                        # Pass event to current screen
-                        if self._current_screen:
-                            self._current_screen.safe_handle_event(event)
-                
-                # Update current screen
-                if self._current_screen:
-                    self._current_screen.safe_update()
-                    
-                    # Check for screen transition
-                    next_screen = self._current_screen.get_next_screen()
-                    if next_screen:
-                        self._switch_screen(next_screen)
-                
-                # Draw
-                self._screen.fill((0, 0, 0))
-                if self._current_screen:
-                    self._current_screen.safe_draw(self._screen)
-                
-                pygame.display.flip()
+                self._run_frame()
                 
-                # Maintain FPS
-                self._clock.tick(self._fps)
+                # Maintain FPS; keep polling input while waiting so key
+                # events get timestamps finer than a frame
+                next_frame += frame_duration
+                now = time.perf_counter()
+                if now > next_frame:
+                    next_frame = now
+                self._input.wait_until(next_frame)
+                self._clock.tick()
             
             except Exception as e:
-                print(f"Error in main loop: {e}")
+                logger.exception("Error in main loop: %s", e)
                 # Try to continue running
                 continue
         
         # Cleanup
         self._cleanup()
     
+    async def run_async(self):
+        """
+        Main game loop as a coroutine
+        
+        Runs the same update/draw cycle as run(), but yields to the event
+        loop every frame so screen tasks (I/O, telemetry) progress between
+        frames. Pacing sleeps until an absolute per-frame deadline instead of
+        calling the blocking clock.tick(fps).
+        """
+        self._event_loop = asyncio.get_running_loop()
+        frame_duration = 1.0 / self._fps
+        next_frame = self._event_loop.time()
+        
+        while self._running:
+            try:
+                self._run_frame()
+            except Exception as e:
+                logger.exception("Error in main loop: %s", e)
+            
+            next_frame += frame_duration
+            now = self._event_loop.time()
+            if now > next_frame:
+                # Running late: resync rather than bursting frames to catch up
+                next_frame = now
+            
+            # Sleep in 1 ms slices (polling input), then sleep out the rest
+            # of the frame in one go (at most ~1 ms of jitter, like run())
+            while next_frame - self._event_loop.time() > 0.002:
+                await asyncio.sleep(0.001)
+                self._input.poll()
+            await asyncio.sleep(max(0.0, next_frame - self._event_loop.time()))
+            
+            # Keeps Clock.get_fps() meaningful without blocking
+            self._clock.tick()
+        
+        # Cancel outstanding screen tasks before shutting pygame down
+        for task in list(self._tasks):
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._event_loop = None
+        
+        # Cleanup
+        self._cleanup()
+    
+    def run_stress_test(self, stress_test):
+        """
+        Run an unattended stress test instead of the interactive loop
+        
+        Args:
+            stress_test: tools.stress_test.StressTest instance
+        """
+        try:
+            stress_test.run(self._screen)
+        except Exception as e:
+            logger.exception("Error during stress test: %s", e)
+        
+        self._cleanup()
+    
     def _cleanup(self):
         """Clean up resources"""
         try:
+            # Write out a capture that was still running
+            self._profiler.stop()
+            self._log_input_latency()
+            logger.info("%s", self._residency.format_report())
+            self._capture.close()
+            
+            # Flush/persist pending leaderboard submissions (only if the
+            # client module was ever loaded)
+            leaderboard = sys.modules.get('network.leaderboard_client')
+            if leaderboard is not None:
+                leaderboard.LeaderboardClient().close()
+            
             # Cleanup audio
             self._audio.cleanup()
             pygame.quit()
         except Exception as e:
-            print(f"Error during cleanup: {e}")
+            logger.error("Error during cleanup: %s", e)
         
         sys.exit(0)
 
 
+def parse_args(argv=None):
+    """
+    Parse command line options
+    
+    Args:
+        argv: Optional argument list (defaults to sys.argv)
+    
+    Returns:
+        argparse.Namespace: Parsed options
+    """
+    parser = argparse.ArgumentParser(description="Cooking Rhythm MBG")
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                        help="drive the game loop as an asyncio coroutine")
+    parser.add_argument('--players', type=int, default=1, choices=range(1, 5),
+                        help="local players: P1 A/D, P2 arrows, P3 J/L, P4 numpad 4/6")
+    parser.add_argument('--collision', choices=('pixel', 'aabb'), default='pixel',
+                        help="catch detection: sprite pixel masks (default) or rectangles")
+    parser.add_argument('--stress', action='store_true',
+                        help="run the unattended stress test and exit")
+    parser.add_argument('--stress-steps', type=int, default=10,
+                        help="number of load steps (default 10)")
+    parser.add_argument('--stress-frames', type=int, default=180,
+                        help="frames held per step (default 180)")
+    parser.add_argument('--stress-output', default='stress_results.csv',
+                        help="CSV file for the degradation curve")
+    parser.add_argument('--profile', choices=Profiler.MODES,
+                        help="start a profiler capture with the first frame (F10/Shift+F10 in game)")
+    parser.add_argument('--profile-frames', type=int, default=300,
+                        help="frames per profiler capture (default 300)")
+    parser.add_argument('--surface-budget', type=float, metavar='MB',
+                        help="resident surface budget in MB (default 64, F12 shows usage)")
+    parser.add_argument('--no-record', dest='record', action='store_false',
+                        help="do not record sessions to data/recordings/ (used for video export)")
+    parser.add_argument('--pipelined', action='store_true',
+                        help="simulate on a worker thread while the main thread renders")
+    parser.add_argument('--burst-frames', type=int, default=ScreenCapture.DEFAULT_BURST_FRAMES,
+                        help="frames captured by Shift+F2 (default 30; F2 takes one screenshot)")
+    parser.add_argument('--mp3-music', dest='procedural_music', action='store_false',
+                        help="play assets/sounds/game_music.mp3 instead of the generated game music")
+    parser.add_argument('--no-beat-sync', dest='beat_sync', action='store_false',
+                        help="spawn on the plain timeline instead of landing items on the beat")
+    parser.add_argument('--no-transitions', dest='transitions', action='store_false',
+                        help="switch screens with hard cuts instead of fades and slides")
+    return parser.parse_args(argv)
+
+
 def main():
     """Main entry point"""
+    args = parse_args()
+    
+    if args.stress:
+        # Unattended: no window and no sound device needed
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    
     try:
-        game_manager = GameManager()
-        game_manager.run()
+        game_manager = GameManager(num_players=args.players, profile_frames=args.profile_frames,
+                                   collision_mode=args.collision,
+                                   surface_budget_mb=args.surface_budget,
+                                   record_sessions=args.record,
+                                   pipelined=args.pipelined,
+                                   burst_frames=args.burst_frames,
+                                   procedural_music=args.procedural_music,
+                                   beat_sync=args.beat_sync,
+                                   transitions=args.transitions)
+        if args.profile:
+            Profiler().request(args.profile, args.profile_frames)
+        if args.stress:
+            from tools.stress_test import StressTest
+            game_manager.run_stress_test(StressTest(
+                steps=args.stress_steps,
+                frames_per_step=args.stress_frames,
+                output_path=args.stress_output
+            ))
+        elif args.use_async:
+            asyncio.run(game_manager.run_async())
+        else:
+            game_manager.run()
     except KeyboardInterrupt:
         print("\nGame interrupted by user")
         pygame.quit()
         sys.exit(0)
     except Exception as e:
-        print(f"Fatal error: {e}")
+        logger.critical("Fatal error: %s", e)
         pygame.quit()
         sys.exit(1)
 
@@ -0,0 +1 @@
+# Network components (leaderboard service)
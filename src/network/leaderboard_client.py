@@ -0,0 +1,345 @@
+"""
+Leaderboard client with pooled connections, batching and offline queue
+Singleton pattern: one client (and one connection pool) per process
+"""
+import asyncio
+import json
+import os
+import socket
+import threading
+import time
+from collections import deque
+from utils.storage import get_data_path, load_json, save_json
+from utils.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+
+class LeaderboardClient:
+    """
+    Singleton leaderboard client
+    All network work runs on a private asyncio loop in a daemon thread, so
+    the game thread only touches in-memory caches and never blocks
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(LeaderboardClient, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self._initialized = True
+
+        # Server address from MBG_LEADERBOARD=host:port
+        address = os.environ.get('MBG_LEADERBOARD', '127.0.0.1:8765')
+        host, _, port = address.rpartition(':')
+        self._host = host or '127.0.0.1'
+        self._port = int(port or 8765)
+        self._cabinet = os.environ.get('MBG_CABINET') or socket.gethostname()
+
+        # Tuning
+        self._pool_size = 2
+        self._timeout = 2.0
+        self._batch_size = 20
+        self._batch_interval = 0.5
+        self._cache_ttl = 30.0
+        self._retry_delay = 5.0
+
+        # Pending submissions (offline queue is persisted between runs)
+        self._queue_path = get_data_path('leaderboard_queue.json')
+        self._pending = deque(load_json(self._queue_path, []) or [])
+        self._lock = threading.Lock()
+
+        # Read caches: key -> (timestamp, value)
+        self._top_cache = {}
+        self._rank_cache = {}
+        self._refreshing = set()
+        self._version = 0
+        self._online = False
+        self._last_failure = float('-inf')
+
+        # Network loop (started on first use)
+        self._loop = None
+        self._thread = None
+        self._idle_connections = None
+        self._open_connections = 0
+        self._wakeup = None
+        self._flush_task = None
+
+    def configure(self, host, port):
+        """
+        Point the client at another server
+
+        Args:
+            host: Server host
+            port: Server port
+        """
+        self._host = host
+        self._port = int(port)
+        self._expire_caches()
+
+    def submit(self, score, player=None):
+        """
+        Queue a score for submission
+
+        Args:
+            score: Final score
+            player: Optional player label (e.g. 'P2')
+        """
+        name = f"{self._cabinet}-{player}" if player else self._cabinet
+        entry = {'name': name, 'score': int(score), 'time': time.time()}
+        with self._lock:
+            self._pending.append(entry)
+        self._ensure_started()
+        self._loop.call_soon_threadsafe(self._notify)
+
+    def get_top(self, count=5):
+        """
+        Get cached top entries; refreshes in the background when stale
+
+        Args:
+            count: Number of entries wanted
+
+        Returns:
+            list or None: Entries (dicts with 'name' and 'score'), None if never loaded
+        """
+        cached = self._top_cache.get(count)
+        if cached is None or time.monotonic() - cached[0] > self._cache_ttl:
+            self._refresh(('top', count))
+        return cached[1] if cached else None
+
+    def get_rank(self, score):
+        """
+        Get cached rank for a score; refreshes in the background when stale
+
+        Args:
+            score: Score to rank
+
+        Returns:
+            tuple or None: (rank, total) or None if not known yet
+        """
+        cached = self._rank_cache.get(score)
+        if cached is None or time.monotonic() - cached[0] > self._cache_ttl:
+            self._refresh(('rank', score))
+        return cached[1] if cached else None
+
+    def close(self):
+        """Try a final flush, persist the offline queue and stop the loop"""
+        if self._loop is not None:
+            try:
+                future = asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop)
+                future.result(timeout=self._timeout)
+            except Exception as e:
+                logger.error("Error closing leaderboard client: %s", e)
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=1.0)
+            self._loop = None
+            self._thread = None
+        self._persist_queue()
+
+    def _ensure_started(self):
+        """Start the network thread and its event loop on first use"""
+        if self._loop is not None:
+            return
+        self._loop = asyncio.new_event_loop()
+        self._idle_connections = deque()
+        self._open_connections = 0
+        self._thread = threading.Thread(target=self._run_loop, name='leaderboard', daemon=True)
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._flush_forever(), self._loop)
+
+    def _notify(self):
+        """Wake the flusher (runs on the network loop)"""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _run_loop(self):
+        """Thread body: run the private event loop"""
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_forever()
+        finally:
+            for _, writer in self._idle_connections:
+                writer.close()
+            self._loop.close()
+
+    def _refresh(self, key):
+        """Schedule a background cache refresh unless one is in flight"""
+        if key in self._refreshing:
+            return
+        if not self._online and time.monotonic() - self._last_failure < self._retry_delay:
+            # Offline: do not hammer an unreachable server every frame
+            return
+        self._refreshing.add(key)
+        self._ensure_started()
+        asyncio.run_coroutine_threadsafe(self._refresh_async(key), self._loop)
+
+    async def _refresh_async(self, key):
+        """Fetch top-N or rank and store it in the cache"""
+        try:
+            if key[0] == 'top':
+                response = await self._request({'op': 'top', 'n': key[1]})
+                cache, value = self._top_cache, response['entries']
+            else:
+                response = await self._request({'op': 'rank', 'score': key[1]})
+                cache, value = self._rank_cache, (response['rank'], response['total'])
+            previous = cache.get(key[1])
+            cache[key[1]] = (time.monotonic(), value)
+            if previous is None or previous[1] != value:
+                # Readers redraw only when what they show actually changed
+                self._version += 1
+        except Exception:
+            # Offline: keep serving the stale cache
+            self._last_failure = time.monotonic()
+        finally:
+            self._refreshing.discard(key)
+
+    async def _flush_forever(self):
+        """Send pending submissions in batches, retrying while offline"""
+        self._flush_task = asyncio.current_task()
+        self._wakeup = asyncio.Event()
+        if self._pending:
+            # Queue left over from an earlier offline session
+            self._wakeup.set()
+
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+
+            # Let submissions arriving close together share a request
+            await asyncio.sleep(self._batch_interval)
+
+            while self._pending:
+                with self._lock:
+                    batch = [self._pending.popleft()
+                             for _ in range(min(self._batch_size, len(self._pending)))]
+                try:
+                    await self._request({'op': 'submit', 'entries': batch})
+                    self._expire_caches()
+                except asyncio.CancelledError:
+                    # Shutting down mid-request: requeue so the final flush resends it
+                    with self._lock:
+                        self._pending.extendleft(reversed(batch))
+                    raise
+                except Exception:
+                    # Server unreachable: requeue in order, persist, retry later
+                    with self._lock:
+                        self._pending.extendleft(reversed(batch))
+                    self._persist_queue()
+                    self._loop.call_later(self._retry_delay, self._notify)
+                    break
+            else:
+                self._persist_queue()
+
+    async def _shutdown(self):
+        """Stop the flusher and make a final best-effort flush"""
+        if self._flush_task is not None:
+            # Wait for the cancellation to land, so a batch the flusher had
+            # in flight is back in the queue before it is resent
+            self._flush_task.cancel()
+            await asyncio.wait([self._flush_task])
+        if self._pending:
+            with self._lock:
+                batch = list(self._pending)
+            try:
+                await self._request({'op': 'submit', 'entries': batch})
+                with self._lock:
+                    for _ in batch:
+                        self._pending.popleft()
+            except Exception:
+                pass
+
+    async def _acquire(self):
+        """Get an idle pooled connection or open a new one"""
+        while self._idle_connections:
+            reader, writer = self._idle_connections.pop()
+            if not writer.is_closing():
+                return reader, writer
+            self._open_connections -= 1
+        connection = await asyncio.wait_for(
+            asyncio.open_connection(self._host, self._port), self._timeout
+        )
+        self._open_connections += 1
+        return connection
+
+    def _release(self, connection, healthy):
+        """Return a connection to the pool, or drop it"""
+        if healthy and len(self._idle_connections) < self._pool_size:
+            self._idle_connections.append(connection)
+        else:
+            connection[1].close()
+            self._open_connections -= 1
+
+    async def _request(self, payload):
+        """
+        Send one request over a pooled connection
+
+        Args:
+            payload: Request dict
+
+        Returns:
+            dict: Response
+
+        Raises:
+            Exception: On network errors or an error response
+        """
+        try:
+            connection = await self._acquire()
+        except Exception:
+            self._online = False
+            raise
+
+        healthy = False
+        try:
+            reader, writer = connection
+            writer.write(json.dumps(payload).encode('utf-8') + b'\n')
+            await writer.drain()
+            line = await asyncio.wait_for(reader.readline(), self._timeout)
+            if not line:
+                raise ConnectionError("leaderboard server closed the connection")
+            response = json.loads(line)
+            healthy = True
+            self._online = True
+        except Exception:
+            self._online = False
+            raise
+        finally:
+            self._release(connection, healthy)
+
+        if not response.get('ok'):
+            raise RuntimeError(response.get('error', 'leaderboard request failed'))
+        return response
+
+    def _expire_caches(self):
+        """Mark cached reads stale; they are still served until refreshed"""
+        self._top_cache = {count: (float('-inf'), entries)
+                           for count, (_, entries) in self._top_cache.items()}
+        self._rank_cache = {score: (float('-inf'), value)
+                            for score, (_, value) in self._rank_cache.items()}
+
+    def _persist_queue(self):
+        """Save pending submissions so they survive a restart"""
+        with self._lock:
+            pending = list(self._pending)
+        save_json(self._queue_path, pending)
+
+    # Properties
+    @property
+    def is_online(self):
+        return self._online
+
+    @property
+    def pending_count(self):
+        return len(self._pending)
+
+    @property
+    def version(self):
+        """Incremented whenever cached data changes (for redraw decisions)"""
+        return self._version
@@ -0,0 +1,212 @@
+"""
+Small asyncio leaderboard server (local stand-in for the shared service)
+Protocol: one JSON object per line over a persistent TCP connection
+
+Requests:
+    {"op": "submit", "entries": [{"name": "CAB1-P1", "score": 85}, ...]}
+    {"op": "top", "n": 10}
+    {"op": "rank", "score": 85}
+    {"op": "ping"}
+
+Run locally:
+    python src/network/leaderboard_server.py --port 8765
+"""
+import argparse
+import asyncio
+import bisect
+import json
+import os
+import time
+
+
+class Leaderboard:
+    """
+    In-memory leaderboard with sorted scores for O(log n) rank queries
+    Encapsulation: Entries are only changed through submit()
+    """
+
+    def __init__(self, data_path=None):
+        """
+        Initialize leaderboard
+
+        Args:
+            data_path: Optional JSON file to load from and save to
+        """
+        self._data_path = data_path
+        self._entries = []        # Sorted by (-score, time)
+        self._sort_keys = []      # Parallel (-score, time) keys for bisect
+        self._load()
+
+    def _load(self):
+        """Load saved entries, if any"""
+        if not self._data_path or not os.path.exists(self._data_path):
+            return
+        try:
+            with open(self._data_path, 'r', encoding='utf-8') as data_file:
+                for entry in json.load(data_file):
+                    self._insert(entry)
+        except Exception as e:
+            print(f"Error loading leaderboard data: {e}")
+
+    def save(self):
+        """Save entries to the data file"""
+        if not self._data_path:
+            return
+        try:
+            temp_path = self._data_path + '.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as data_file:
+                json.dump(self._entries, data_file)
+            os.replace(temp_path, self._data_path)
+        except Exception as e:
+            print(f"Error saving leaderboard data: {e}")
+
+    def _insert(self, entry):
+        """Insert one validated entry keeping sort order"""
+        key = (-entry['score'], entry['time'])
+        index = bisect.bisect_right(self._sort_keys, key)
+        self._sort_keys.insert(index, key)
+        self._entries.insert(index, entry)
+
+    def submit(self, entries):
+        """
+        Add a batch of entries
+
+        Args:
+            entries: List of dicts with 'name' and 'score'
+
+        Returns:
+            list: Rank (1-based) of each entry right after insertion
+        """
+        ranks = []
+        for raw in entries:
+            entry = {
+                'name': str(raw.get('name', 'PLAYER'))[:32],
+                'score': int(raw['score']),
+                'time': float(raw.get('time', time.time()))
+            }
+            self._insert(entry)
+            ranks.append(self.rank(entry['score']))
+        return ranks
+
+    def top(self, count):
+        """Get the best entries"""
+        return self._entries[:max(0, count)]
+
+    def rank(self, score):
+        """
+        Rank a score would have (1 + number of strictly better scores)
+
+        Args:
+            score: Score to rank
+
+        Returns:
+            int: 1-based rank
+        """
+        return bisect.bisect_left(self._sort_keys, (-score, float('-inf'))) + 1
+
+    @property
+    def total(self):
+        return len(self._entries)
+
+
+class LeaderboardServer:
+    """
+    Asyncio TCP server exposing a Leaderboard
+    Composition: Contains a Leaderboard
+    """
+
+    def __init__(self, leaderboard, host='127.0.0.1', port=8765):
+        """
+        Args:
+            leaderboard: Leaderboard instance
+            host: Address to bind
+            port: Port to bind (0 picks a free port)
+        """
+        self._leaderboard = leaderboard
+        self._host = host
+        self._port = port
+        self._server = None
+
+    async def start(self):
+        """Start listening"""
+        self._server = await asyncio.start_server(self._handle_client, self._host, self._port)
+        self._port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self):
+        """Start (if needed) and serve until cancelled"""
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def stop(self):
+        """Stop listening and save data"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        self._leaderboard.save()
+
+    async def _handle_client(self, reader, writer):
+        """Serve requests on one persistent connection"""
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                response = self._dispatch(line)
+                writer.write(json.dumps(response).encode('utf-8') + b'\n')
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as e:
+            print(f"Leaderboard connection error: {e}")
+        finally:
+            writer.close()
+
+    def _dispatch(self, line):
+        """Handle one request line and build the response"""
+        try:
+            request = json.loads(line)
+            op = request.get('op')
+            if op == 'submit':
+                ranks = self._leaderboard.submit(request.get('entries', []))
+                self._leaderboard.save()
+                return {'ok': True, 'ranks': ranks, 'total': self._leaderboard.total}
+            if op == 'top':
+                return {'ok': True, 'entries': self._leaderboard.top(int(request.get('n', 10))),
+                        'total': self._leaderboard.total}
+            if op == 'rank':
+                return {'ok': True, 'rank': self._leaderboard.rank(int(request['score'])),
+                        'total': self._leaderboard.total}
+            if op == 'ping':
+                return {'ok': True}
+            return {'ok': False, 'error': f"unknown op: {op}"}
+        except Exception as e:
+            return {'ok': False, 'error': str(e)}
+
+    @property
+    def port(self):
+        return self._port
+
+
+def main():
+    """Run the server from the command line"""
+    parser = argparse.ArgumentParser(description="Cooking Rhythm MBG leaderboard server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--data', default='leaderboard.json',
+                        help="JSON file where scores are kept")
+    args = parser.parse_args()
+
+    server = LeaderboardServer(Leaderboard(args.data), args.host, args.port)
+    print(f"Leaderboard server on {args.host}:{args.port} (data: {args.data})")
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        print("\nLeaderboard server stopped")
+
+
+if __name__ == "__main__":
+    main()
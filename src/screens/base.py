@@ -3,8 +3,15 @@ Base screen class for all game screens
 Demonstrates: Inheritance (abstract base class), Exception Handling
 """
 from abc import ABC, abstractmethod
+import time
 import pygame
+from core.profiler import Profiler
+from core.residency_manager import ResidencyManager
 from utils.load_image import load_background_image
+from utils.logger import get_logger
+
+
+logger = get_logger(__name__)
 
 
 class BaseScreen(ABC):
@@ -14,6 +21,10 @@ class BaseScreen(ABC):
     Exception Handling: Wrapper methods with try-catch
     """
     
+    # Transition styles (see start_transition)
+    TRANSITION_CROSSFADE = 'crossfade'
+    TRANSITION_SLIDE = 'slide'
+    
     def __init__(self, screen_width, screen_height):
         """
         Initialize base screen
@@ -25,7 +36,28 @@ class BaseScreen(ABC):
         self._width = screen_width
         self._height = screen_height
         self._next_screen = None
+        self._scheduled_tasks = []
+        
+        # Transition from the previous screen: a snapshot of its last frame
+        # drawn over this screen's live frame until _transition_alpha is 0
         self._transition_alpha = 0
+        self._transition_snapshot = None
+        self._transition_style = self.TRANSITION_CROSSFADE
+        self._transition_started = 0.0
+        self._transition_duration = 0.0
+        
+        # Retained-mode cache of static layers (name -> Surface)
+        self._layers = {}
+        
+        # Frame profiler (measures the safe_* wrappers during captures)
+        self._profiler = Profiler()
+        
+        # Surfaces are loaded through this screen's bundle (one per screen
+        # class) so the residency manager can count and evict them
+        self._residency = ResidencyManager()
+        self._bundle = self.__class__.__name__
+        self._residency.acquire_bundle(self._bundle)
+        self._disposed = False
     
     @abstractmethod
     def handle_event(self, event):
@@ -60,16 +92,16 @@ class BaseScreen(ABC):
             event: pygame event
         """
         try:
-            self.handle_event(event)
+            self._profiler.profile_call(self.__class__.__name__, 'event', self.handle_event, event)
         except Exception as e:
-            print(f"Error handling event in {self.__class__.__name__}: {e}")
+            logger.exception("Error handling event in %s: %s", self.__class__.__name__, e)
     
     def safe_update(self):
         """Safely update with exception handling"""
         try:
-            self.update()
+            self._profiler.profile_call(self.__class__.__name__, 'update', self.update)
         except Exception as e:
-            print(f"Error updating {self.__class__.__name__}: {e}")
+            logger.exception("Error updating %s: %s", self.__class__.__name__, e)
     
     def safe_draw(self, screen):
         """
@@ -79,9 +111,62 @@ class BaseScreen(ABC):
             screen: pygame surface
         """
         try:
-            self.draw(screen)
+            self._profiler.profile_call(self.__class__.__name__, 'draw', self.draw, screen)
+            if self._transition_snapshot is not None:
+                self._draw_transition(screen)
         except Exception as e:
-            print(f"Error drawing {self.__class__.__name__}: {e}")
+            logger.exception("Error drawing %s: %s", self.__class__.__name__, e)
+    
+    def start_transition(self, snapshot, style=TRANSITION_CROSSFADE, duration=0.3):
+        """
+        Blend from the previous screen's last frame into this screen
+        
+        Only this screen keeps rendering; the snapshot costs one extra
+        blit per frame until the transition ends.
+        
+        Args:
+            snapshot: Surface holding the outgoing screen's last frame
+                      (display format, owned by this screen from now on)
+            style: TRANSITION_CROSSFADE (fade out) or TRANSITION_SLIDE
+                   (slides out to the left, uncovering this screen)
+            duration: Seconds the transition takes
+        """
+        self._end_transition()
+        if duration <= 0:
+            return
+        self._transition_snapshot = snapshot
+        self._transition_style = style
+        self._transition_started = time.perf_counter()
+        self._transition_duration = duration
+        self._transition_alpha = 255
+        self._residency.register(self._bundle, 'layer', self._layer_key('transition'), snapshot)
+    
+    def _draw_transition(self, screen):
+        """
+        Draw the outgoing snapshot over the live frame (ease-out)
+        
+        Args:
+            screen: pygame surface the live frame was drawn on
+        """
+        progress = (time.perf_counter() - self._transition_started) / self._transition_duration
+        if progress >= 1.0:
+            self._end_transition()
+            return
+        
+        remaining = (1.0 - progress) ** 2
+        self._transition_alpha = int(255 * remaining)
+        if self._transition_style == self.TRANSITION_SLIDE:
+            screen.blit(self._transition_snapshot, (int(-self._width * (1.0 - remaining)), 0))
+        else:
+            self._transition_snapshot.set_alpha(self._transition_alpha)
+            screen.blit(self._transition_snapshot, (0, 0))
+    
+    def _end_transition(self):
+        """Drop the transition snapshot"""
+        if self._transition_snapshot is not None:
+            self._transition_snapshot = None
+            self._residency.unregister(self._layer_key('transition'))
+        self._transition_alpha = 0
     
     def set_next_screen(self, screen_name):
         """
@@ -103,6 +188,91 @@ class BaseScreen(ABC):
         self._next_screen = None
         return next_screen
     
+    def schedule_task(self, coroutine):
+        """
+        Schedule async work (saving, telemetry, streaming) without blocking a frame
+        
+        The game manager starts the coroutine after this frame's update.
+        
+        Args:
+            coroutine: Coroutine object to run
+        """
+        self._scheduled_tasks.append(coroutine)
+    
+    def pop_scheduled_tasks(self):
+        """
+        Get and clear coroutines scheduled since the last call
+        
+        Returns:
+            list: Coroutine objects
+        """
+        tasks = self._scheduled_tasks
+        self._scheduled_tasks = []
+        return tasks
+    
+    def _get_layer(self, name, render, alpha=False):
+        """
+        Get a cached static layer, rendering it only on first use
+        
+        The layer is a full-screen surface composited once by the render
+        callback and then reused every frame until invalidated.
+        
+        Args:
+            name: Layer name (cache key)
+            render: Callable that draws the layer onto the given surface
+            alpha: Whether the layer needs per-pixel alpha (overlays)
+        
+        Returns:
+            pygame.Surface: The cached layer
+        """
+        layer = self._layers.get(name)
+        if layer is None:
+            if alpha:
+                layer = pygame.Surface((self._width, self._height), pygame.SRCALPHA)
+            else:
+                layer = pygame.Surface((self._width, self._height))
+            
+            # Match display format for fast blits (needs a display mode)
+            if pygame.display.get_surface() is not None:
+                layer = layer.convert_alpha() if alpha else layer.convert()
+                if alpha:
+                    layer.fill((0, 0, 0, 0))
+            
+            render(layer)
+            self._layers[name] = layer
+            self._residency.register(self._bundle, 'layer', self._layer_key(name), layer)
+        return layer
+    
+    def _invalidate_layer(self, name=None):
+        """
+        Drop cached layers so they are re-rendered when next requested
+        
+        Args:
+            name: Layer to drop, or None to drop all layers
+        """
+        names = list(self._layers) if name is None else [name]
+        for layer_name in names:
+            if self._layers.pop(layer_name, None) is not None:
+                self._residency.unregister(self._layer_key(layer_name))
+    
+    def _layer_key(self, name):
+        """Residency key of a layer (layers belong to one screen instance)"""
+        return ('layer', id(self), name)
+    
+    def dispose(self):
+        """
+        Release this screen's surfaces (called when the screen is replaced)
+        
+        Cached layers are dropped; the screen's bundle stays resident until
+        the surface budget needs the memory, so returning to the screen is cheap.
+        """
+        if self._disposed:
+            return
+        self._disposed = True
+        self._end_transition()
+        self._invalidate_layer()
+        self._residency.release_bundle(self._bundle)
+    
     # Properties
     @property
     def width(self):
@@ -112,6 +282,11 @@ class BaseScreen(ABC):
     def height(self):
         return self._height
     
+    @property
+    def is_transitioning(self):
+        """Whether the previous screen's snapshot is still being blended out"""
+        return self._transition_snapshot is not None
+    
     def _load_background(self, image_name, fallback_color=(50, 50, 100)):
         """
         Load and scale background image using utility function
@@ -123,4 +298,7 @@ class BaseScreen(ABC):
         Returns:
             pygame.Surface: The loaded and scaled background surface
         """
-        return load_background_image(image_name, self._width, self._height, fallback_color)
+        return self._residency.load(
+            self._bundle, 'background', ('background', image_name, self._width, self._height),
+            lambda: load_background_image(image_name, self._width, self._height, fallback_color)
+        )
@@ -0,0 +1,158 @@
+"""
+Audio calibration screen: measures when the player hears the beat
+Demonstrates: Inheritance (extends BaseScreen), Composition
+
+The procedural music plays free-running while the player taps SPACE on
+every kick drum. Each tap's arrival time (stamped by InputManager) is
+compared with the beat the music engine's BeatClock says was reaching the
+speakers at that moment. The median difference is added to the saved
+output offset, so beat-synced items land where the player hears the beat.
+"""
+import time
+import pygame
+from screens.base import BaseScreen
+from core.audio_manager import AudioManager
+from core.input_manager import InputManager
+from utils.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+
+class CalibrationScreen(BaseScreen):
+    """
+    Tap-along audio latency calibration
+    Inheritance: Extends BaseScreen
+    Composition: Uses AudioManager's MusicEngine and the InputManager stamps
+    """
+    
+    # Taps measured per run; the first ones are ignored while the player
+    # finds the beat, and a result needs at least MIN_TAPS of the rest
+    TAPS = 16
+    SKIPPED_TAPS = 2
+    MIN_TAPS = 8
+    
+    def __init__(self, screen_width, screen_height):
+        super().__init__(screen_width, screen_height)
+        
+        self._background = self._load_background('home.png')
+        
+        self._audio = AudioManager()
+        self._input = InputManager()
+        
+        # Music with a kick on every beat, not locked to any game
+        self._audio.stop_music()
+        self._audio.play_music('calibration', loop=True)
+        
+        # Measurement state
+        self._taps = 0
+        self._offsets = []     # Seconds each counted tap was late (negative = early)
+        self._result = None    # (measured offset, spread) once MIN_TAPS are in
+        self._saved = False
+        self._pulse = 0.0      # 1.0 as a beat is heard, decaying to 0
+        
+        # Fonts and rendered texts (re-rendered only when a text changes)
+        self._title_font = None
+        self._font = None
+        self._texts = {}
+    
+    def handle_event(self, event):
+        """Handle calibration keys (SPACE taps are read with timestamps in update)"""
+        if event.type != pygame.KEYDOWN:
+            return
+        if event.key == pygame.K_ESCAPE:
+            self._audio.stop_music()
+            self.set_next_screen('MAIN_MENU')
+        elif event.key == pygame.K_RETURN and self._result is not None and not self._saved:
+            offset = self._audio.audio_offset + self._result[0]
+            self._audio.set_audio_offset(offset)
+            self._saved = True
+            logger.info("Audio offset calibrated to %.1f ms (%d taps, spread %.1f ms)",
+                        offset * 1000.0, len(self._offsets), self._result[1] * 1000.0)
+        elif event.key == pygame.K_r:
+            self._reset()
+    
+    def _reset(self):
+        """Start a new measurement"""
+        self._taps = 0
+        self._offsets = []
+        self._result = None
+        self._saved = False
+    
+    def update(self):
+        """Measure this frame's taps against the heard beat"""
+        engine = self._audio.music_engine
+        if engine is None or not engine.is_running:
+            return
+        
+        beat = engine.beat_heard_at(time.perf_counter())
+        if beat is not None:
+            self._pulse = max(0.0, 1.0 - (beat % 1.0) * 4.0)
+        
+        for stamp in self._input.get_presses(pygame.K_SPACE):
+            if self._taps >= self.TAPS:
+                break
+            tap_beat = engine.beat_heard_at(stamp)
+            if tap_beat is None:
+                continue
+            self._taps += 1
+            if self._taps > self.SKIPPED_TAPS:
+                self._offsets.append((tap_beat - round(tap_beat)) * 60.0 / engine.tempo)
+        
+        if len(self._offsets) >= self.MIN_TAPS:
+            ordered = sorted(self._offsets)
+            median = ordered[len(ordered) // 2]
+            spread = sorted(abs(offset - median) for offset in ordered)[len(ordered) // 2]
+            self._result = (median, spread)
+    
+    def _render_text(self, slot, font, text, color):
+        """Rendered text for a screen slot, cached until its text changes"""
+        cached = self._texts.get(slot)
+        if cached is None or cached[0] != text:
+            cached = (text, font.render(text, True, color))
+            self._texts[slot] = cached
+        return cached[1]
+    
+    def _draw_overlay(self, layer):
+        """Dim the background behind the texts"""
+        layer.fill((0, 0, 0, 160))
+    
+    def draw(self, screen):
+        """Draw instructions, the beat indicator and the measurement"""
+        if self._font is None:
+            self._title_font = pygame.font.Font(None, 56)
+            self._font = pygame.font.Font(None, 32)
+        
+        screen.blit(self._background, (0, 0))
+        screen.blit(self._get_layer('overlay', self._draw_overlay, alpha=True), (0, 0))
+        center_x = self._width // 2
+        
+        lines = [('title', self._title_font, "Kalibrasi Audio", (255, 255, 255), 90)]
+        if not self._audio.is_available:
+            lines.append(('info', self._font, "Audio tidak tersedia", (239, 68, 68), 160))
+        else:
+            lines.append(('info', self._font, "Tekan SPASI setiap mendengar dentuman drum",
+                          (220, 220, 220), 150))
+            
+            # Indicator flashing on the beat as the clock expects it to be heard
+            radius = int(40 + 25 * self._pulse)
+            color = (250, 204, 21) if self._pulse > 0 else (120, 120, 140)
+            pygame.draw.circle(screen, color, (center_x, 290), radius)
+            
+            lines.append(('taps', self._font, f"Ketukan: {self._taps}/{self.TAPS}", (220, 220, 220), 390))
+            lines.append(('current', self._font,
+                          f"Offset tersimpan: {self._audio.audio_offset * 1000.0:+.0f} ms",
+                          (180, 180, 200), 425))
+            if self._result is not None:
+                measured, spread = self._result
+                if self._saved:
+                    result_text = f"Disimpan: {self._audio.audio_offset * 1000.0:+.0f} ms"
+                else:
+                    result_text = f"Selisih ketukan {measured * 1000.0:+.0f} ms (±{spread * 1000.0:.0f} ms)"
+                lines.append(('result', self._font, result_text, (34, 197, 94), 465))
+            lines.append(('help', self._font, "ENTER simpan  ·  R ulangi  ·  ESC kembali",
+                          (200, 200, 200), self._height - 50))
+        
+        for slot, font, text, color, y in lines:
+            surface = self._render_text(slot, font, text, color)
+            screen.blit(surface, surface.get_rect(center=(center_x, y)))
@@ -4,9 +4,27 @@ Demonstrates: Inheritance, Composition, Exception Handling
 """
 import pygame
 import random
+import threading
+from collections import namedtuple
 from screens.base import BaseScreen
-from core.game import Game
+from core.game import Game, COLLISION_PIXEL
 from core.audio_manager import AudioManager
+from core.input_manager import InputManager
+from core.quality_manager import QualityManager
+from core.session_recorder import SessionRecorder
+from core.score_sketch import ScoreSketch
+from core.sim_pipeline import SimulationPipeline
+from network.leaderboard_client import LeaderboardClient
+from ui.shapes import draw_star
+from utils.storage import get_data_path
+from utils.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+
+# Immutable view of the screen: a GameFrame plus particle and text render states
+ScreenFrame = namedtuple('ScreenFrame', ('game', 'particles', 'texts'))
 
 
 class Particle:
@@ -34,10 +52,24 @@ class Particle:
     
     def draw(self, screen):
         """Draw particle with fade effect"""
+        self.draw_state(screen, self.get_render_state())
+    
+    def get_render_state(self):
+        """
+        Get what draw() needs as an immutable value
+        
+        Returns:
+            tuple: (color, (x, y), size), size shrinking as the particle fades
+        """
         alpha_ratio = self.life / self.max_life
-        size = int(self.size * alpha_ratio)
+        return (self.color, (int(self.x), int(self.y)), int(self.size * alpha_ratio))
+    
+    @staticmethod
+    def draw_state(screen, render_state):
+        """Draw a particle from its render state"""
+        color, center, size = render_state
         if size > 0:
-            pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), size)
+            pygame.draw.circle(screen, color, center, size)
     
     @property
     def is_dead(self):
@@ -47,6 +79,10 @@ class Particle:
 class FloatingText:
     """Floating score text when catching items"""
     
+    # Shared font and rendered texts ("+5", "-1", ...), created on first draw
+    _font = None
+    _surfaces = {}
+    
     def __init__(self, x, y, text, color):
         self.x = x
         self.y = y
@@ -55,6 +91,7 @@ class FloatingText:
         self.life = 60
         self.max_life = 60
         self.vy = -2
+        self.quality = QualityManager()
     
     def update(self):
         """Update floating text"""
@@ -63,16 +100,36 @@ class FloatingText:
     
     def draw(self, screen):
         """Draw floating text with fade"""
-        alpha_ratio = self.life / self.max_life
-        font = pygame.font.Font(None, 48)
-        
-        # Create text with color
-        text_surface = font.render(self.text, True, self.color)
-        
-        # Apply alpha (fade out)
-        text_surface.set_alpha(int(255 * alpha_ratio))
+        self.draw_state(screen, self.get_render_state())
+    
+    def get_render_state(self):
+        """
+        Get what draw() needs as an immutable value
         
-        text_rect = text_surface.get_rect(center=(int(self.x), int(self.y)))
+        Returns:
+            tuple: (text, color, (x, y), alpha), alpha None when fades are off
+        """
+        # Apply alpha (fade out), skipped when quality is reduced
+        alpha = None
+        if self.quality.text_fades:
+            alpha = int(255 * self.life / self.max_life)
+        return (self.text, self.color, (int(self.x), int(self.y)), alpha)
+    
+    @staticmethod
+    def draw_state(screen, render_state):
+        """Draw a floating text from its render state"""
+        text, color, center, alpha = render_state
+        text_surface = FloatingText._surfaces.get((text, color))
+        if text_surface is None:
+            if FloatingText._font is None:
+                FloatingText._font = pygame.font.Font(None, 48)
+            text_surface = FloatingText._font.render(text, True, color)
+            FloatingText._surfaces[(text, color)] = text_surface
+        
+        # The cached surface is shared, so its alpha is set for every blit
+        text_surface.set_alpha(255 if alpha is None else alpha)
+        
+        text_rect = text_surface.get_rect(center=center)
         screen.blit(text_surface, text_rect)
     
     @property
@@ -87,18 +144,54 @@ class GameScreen(BaseScreen):
     Composition: Contains Game, Particles, FloatingTexts
     """
     
-    def __init__(self, screen_width, screen_height):
+    # Number of particles emitted per catch
+    PARTICLES_PER_CATCH = 15
+    
+    # Snapshot file for F5 (save) / F9 (load), inside the data folder
+    QUICKSAVE_NAME = 'quicksave.mbgs'
+    
+    # Beat-synced sessions: items reach the players on eighth notes
+    BEAT_SUBDIVISION = 2
+    
+    def __init__(self, screen_width, screen_height, num_players=1, collision_mode=COLLISION_PIXEL,
+                 record_session=False, pipelined=False, beat_sync=True, record_results=True):
+        """
+        Initialize game screen
+        
+        Args:
+            screen_width: Width of the screen
+            screen_height: Height of the screen
+            num_players: Number of local players (1-4)
+            collision_mode: COLLISION_PIXEL or COLLISION_AABB
+            record_session: Record inputs to data/recordings/ for replay and
+                            video export (tools/video_export.py)
+            pipelined: Step the game on a simulation thread and draw the
+                       newest published frame (core/sim_pipeline.py)
+            beat_sync: Quantise spawns to the music's beat grid and lock the
+                       music to the game (core/beat_clock.py)
+            record_results: Submit finished sessions to the leaderboard and
+                            the score sketch (off for replays and benchmarks)
+        """
         super().__init__(screen_width, screen_height)
         
         # Load background image
         self._background = self._load_background('play.png')
         
         # Composition: GameScreen contains Game
-        self._game = Game(screen_width, screen_height)
+        self._num_players = num_players
+        self._game = Game(screen_width, screen_height, num_players=num_players,
+                          collision_mode=collision_mode,
+                          beat_subdivision=self.BEAT_SUBDIVISION if beat_sync else 0)
         
         # Get audio manager
         self._audio = AudioManager()
         
+        # Get quality manager (scales particle count under load)
+        self._quality = QualityManager()
+        
+        # Input layer (timestamped key events)
+        self._input = InputManager()
+        
         # Play game music
         self._audio.stop_music()  # Stop menu music
         self._audio.play_music('game_music', loop=True)
@@ -107,48 +200,159 @@ class GameScreen(BaseScreen):
         self._particles = []
         self._floating_texts = []
         
-        # Track previous item count to detect catches
+        # Track previous score/HP per player to detect catches
         self._prev_item_count = 0
-        self._last_score = 0
-        self._last_hp = 3
+        self._reset_catch_tracking()
         self._game_over_sound_played = False
         
+        # Finished sessions are submitted once, when they end
+        self._record_results = record_results
+        self._results_recorded = False
+        
+        # Sounds due from the last steps; played by update() on the main
+        # thread, since pipelined steps run on the simulation thread
+        self._sounds_due = []
+        
         # Game over background
         self._game_over_background = None
         self._game_over_background_loaded = False
+        
+        # Session recording (one file per session, written when it ends)
+        self._recorder = None
+        if record_session:
+            self._recorder = SessionRecorder(self._game, screen_width, screen_height)
+            self._recorder.start()
+        
+        # Pipelined mode: the simulation thread owns the game between events;
+        # the lock keeps event handling and live drawing out of its steps
+        self._sim_lock = threading.Lock()
+        self._pipeline = None
+        self._pending_axes = [(0.0, 0)] * num_players
+        if pipelined:
+            self._pipeline = SimulationPipeline(self._simulation_step, name='game-simulation')
     
     def handle_event(self, event):
         """Handle game events"""
         if event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_ESCAPE:
-                # Pause or return to menu
-                self._audio.stop_music()
-                self.set_next_screen('MAIN_MENU')
-            elif event.key == pygame.K_r and self._game.is_game_over:
-                # Restart game
-                self._game = Game(self._width, self._height)
-                self._particles.clear()
-                self._floating_texts.clear()
-                self._last_score = 0
-                self._last_hp = 3
-                self._game_over_sound_played = False
-                self._game_over_background = None
-                self._game_over_background_loaded = False
-                
-                # Restart music
-                self._audio.play_music('game_music', loop=True)
+            with self._sim_lock:
+                if event.key == pygame.K_ESCAPE:
+                    # Pause or return to menu
+                    self._audio.stop_music()
+                    self.set_next_screen('MAIN_MENU')
+                elif event.key == pygame.K_r and self._game.is_game_over:
+                    # Restart game in place (keeps loaded sprites and background)
+                    self._submit_results()
+                    self._game.reset()
+                    self._on_game_state_replaced()
+                elif event.key == pygame.K_F5:
+                    self._quick_save()
+                elif event.key == pygame.K_F9:
+                    self._quick_load()
+    
+    def _on_game_state_replaced(self):
+        """Resync screen effects after a restart or snapshot restore"""
+        self._particles.clear()
+        self._floating_texts.clear()
+        self._sounds_due = []
+        self._reset_catch_tracking()
+        self._game_over_background = None
+        self._game_over_background_loaded = False
+        self._results_recorded = self._game.is_game_over  # Restored finished sessions count once
+        self._invalidate_layer()
+        
+        # A restart or restored snapshot begins a new recording
+        if self._recorder is not None:
+            self._recorder.finish()
+            self._recorder.start()
+        
+        if not self._game.is_game_over:
+            # Restart music
+            self._game_over_sound_played = False
+            self._audio.play_music('game_music', loop=True)
+    
+    def _quick_save(self):
+        """Pause-to-disk: write a snapshot of the current game"""
+        try:
+            with open(get_data_path(self.QUICKSAVE_NAME), 'wb') as save_file:
+                save_file.write(self._game.snapshot())
+        except Exception as e:
+            logger.error("Error saving snapshot: %s", e)
+    
+    def _quick_load(self):
+        """Resume a snapshot written by _quick_save"""
+        try:
+            with open(get_data_path(self.QUICKSAVE_NAME), 'rb') as save_file:
+                self._game.restore(save_file.read())
+            self._on_game_state_replaced()
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.error("Error loading snapshot: %s", e)
     
     def update(self):
         """Update game screen"""
-        if not self._game.is_game_over:
-            # Get keyboard state
-            keys = pygame.key.get_pressed()
-            self._game.handle_input(keys)
-            self._game.update()
-            
-            # Check for score/hp changes to create effects
-            self._check_for_catches()
+        # Movement from timestamped key events (sub-frame accurate)
+        axes = [self._input.get_axis(left_keys, right_keys)
+                for left_keys, right_keys in self._game.bindings]
+        
+        if self._pipeline is not None:
+            # Input is sampled here (events live on the main thread); the
+            # simulation thread applies the newest axes on its next step
+            self._pending_axes = axes
+            self._pipeline.start()
+        else:
+            if not self._game.is_game_over:
+                self._advance_game(axes)
+            self._update_effects()
         
+        with self._sim_lock:
+            self._apply_side_effects()
+    
+    def _simulation_step(self):
+        """
+        One step of the simulation thread (pipelined mode)
+        
+        Returns:
+            ScreenFrame: The state to render
+        """
+        with self._sim_lock:
+            if not self._game.is_game_over:
+                self._advance_game(self._pending_axes)
+            self._update_effects()
+            return self._capture_frame()
+    
+    def dispose(self):
+        """Stop the simulation thread, write the recording of an unfinished session, then release surfaces"""
+        if self._pipeline is not None:
+            self._pipeline.stop()
+            logger.info(self._pipeline.format_report())
+        if self._recorder is not None:
+            self._recorder.finish()
+        super().dispose()
+    
+    def _advance_game(self, axes, delta_time=None):
+        """
+        Apply input and update the game by one frame
+        
+        Args:
+            axes: (axis, held) per player
+            delta_time: Seconds to advance (None = measured by Game)
+        """
+        self._game.apply_input(axes)
+        self._game.update(delta_time)
+        beat = self._game.beat_position if self._game.beat_subdivision else None
+        self._audio.update_music(self._game.time_remaining, self._game.spawn_rate, beat)
+        
+        if self._recorder is not None:
+            self._recorder.record_frame(axes, self._game.delta_time)
+            if self._game.is_game_over:
+                self._recorder.finish()
+        
+        # Check for score/hp changes to create effects
+        self._check_for_catches()
+    
+    def _update_effects(self):
+        """Update particles and floating texts"""
         # Update particles
         for particle in self._particles[:]:
             particle.update()
@@ -160,9 +364,22 @@ class GameScreen(BaseScreen):
             text.update()
             if text.is_dead:
                 self._floating_texts.remove(text)
+    
+    def _apply_side_effects(self):
+        """
+        Play due sounds and enter the game over state (main thread only)
+        
+        Steps only queue these: sounds, music and the surface cache are
+        not safe to use from the simulation thread of pipelined mode.
+        """
+        sounds, self._sounds_due = self._sounds_due, []
+        for sound_name in sounds:
+            self._audio.play_sound(sound_name)
         
         # Check if game is over
         if self._game.is_game_over:
+            self._submit_results()
+            
             # Play game over sound once
             if not self._game_over_sound_played:
                 self._audio.stop_music()
@@ -174,37 +391,57 @@ class GameScreen(BaseScreen):
                 self._load_game_over_background()
                 self._game_over_background_loaded = True
     
+    def _submit_results(self):
+        """Submit every player's final score to the leaderboard and the score sketch (once per session)"""
+        if not self._record_results or self._results_recorded:
+            return
+        self._results_recorded = True
+        
+        results = self._game.get_results()
+        players = results.get('players', [results])
+        leaderboard = LeaderboardClient()
+        sketch = ScoreSketch.load()
+        for index, player_results in enumerate(players):
+            leaderboard.submit(player_results['score'],
+                               player=f"P{index + 1}" if len(players) > 1 else None)
+            sketch.add(player_results['score'])
+        sketch.save()
+    
+    def _reset_catch_tracking(self):
+        """Remember starting score/HP of every player"""
+        states = self._game.player_states
+        self._last_scores = [state.score for state in states]
+        self._last_hps = [state.hp for state in states]
+    
     def _check_for_catches(self):
-        """Check if item was caught and create effects"""
-        current_score = self._game.score
-        current_hp = self._game.hp
-        
-        # Score increased - good item caught
-        if current_score > self._last_score:
-            score_diff = current_score - self._last_score
-            self._create_catch_effect(
-                self._game._player.x,
-                self._game._player.y,
-                f"+{score_diff}",
-                (34, 197, 94),
-                (34, 197, 94)
-            )
-            self._last_score = current_score
-            # Play good catch sound
-            self._audio.play_sound('good_catch')
-        
-        # HP decreased - bad item caught
-        if current_hp < self._last_hp:
-            self._create_catch_effect(
-                self._game._player.x,
-                self._game._player.y,
-                "-1",
-                (239, 68, 68),
-                (239, 68, 68)
-            )
-            self._last_hp = current_hp
-            # Play bad catch sound
-            self._audio.play_sound('bad_catch')
+        """Check if items were caught and create effects at each catching player"""
+        for index, (player, state) in enumerate(zip(self._game.players, self._game.player_states)):
+            # Score increased - good item caught
+            if state.score > self._last_scores[index]:
+                score_diff = state.score - self._last_scores[index]
+                self._create_catch_effect(
+                    player.x,
+                    player.y,
+                    f"+{score_diff}",
+                    (34, 197, 94),
+                    (34, 197, 94)
+                )
+                self._last_scores[index] = state.score
+                # Play good catch sound
+                self._sounds_due.append('good_catch')
+            
+            # HP decreased - bad item caught
+            if state.hp < self._last_hps[index]:
+                self._create_catch_effect(
+                    player.x,
+                    player.y,
+                    "-1",
+                    (239, 68, 68),
+                    (239, 68, 68)
+                )
+                self._last_hps[index] = state.hp
+                # Play bad catch sound
+                self._sounds_due.append('bad_catch')
     
     def _create_catch_effect(self, x, y, text, text_color, particle_color):
         """
@@ -222,11 +459,11 @@ class GameScreen(BaseScreen):
             self._floating_texts.append(floating_text)
             
             # Create particles
-            for _ in range(15):
+            for _ in range(self._quality.particle_count(self.PARTICLES_PER_CATCH)):
                 particle = Particle(x, y, particle_color)
                 self._particles.append(particle)
         except Exception as e:
-            print(f"Error creating catch effect: {e}")
+            logger.error("Error creating catch effect: %s", e)
     
     def _get_stars_from_score(self, score):
         """
@@ -234,7 +471,7 @@ class GameScreen(BaseScreen):
         
         Args:
             score: Player's final score
-            
+        
         Returns:
             int: Number of stars (1-3)
         """
@@ -263,8 +500,60 @@ class GameScreen(BaseScreen):
     
     def draw(self, screen):
         """Draw game screen"""
+        if self._pipeline is not None:
+            frame = self._pipeline.latest()
+            if frame is not None and not frame.game.is_game_over:
+                self._draw_frame(screen, frame)
+                return
+            
+            # Before the first step and on the result screen (where almost
+            # nothing moves) draw the live state, holding off the simulation
+            with self._sim_lock:
+                self._draw_live(screen)
+            return
+        
+        self._draw_live(screen)
+    
+    def _draw_live(self, screen):
+        """Draw the current state of the game"""
+        if self._game.is_game_over and not self._particles and not self._floating_texts:
+            # Nothing moves any more: the whole result screen is one cached blit
+            screen.blit(self._get_layer('game_over', self._draw_game_over_scene), (0, 0))
+            return
+        
+        self._draw_scene(screen)
+        
+        # Draw game over screen if game is over (cached overlay layer)
+        if self._game.is_game_over:
+            screen.blit(self._get_layer('game_over_overlay', self._draw_game_over, alpha=True), (0, 0))
+    
+    def _capture_frame(self):
+        """
+        Capture the game and its effects as an immutable ScreenFrame
+        
+        Returns:
+            ScreenFrame: What _draw_scene would show now
+        """
+        return ScreenFrame(
+            self._game.capture_frame(),
+            tuple(particle.get_render_state() for particle in self._particles),
+            tuple(text.get_render_state() for text in self._floating_texts)
+        )
+    
+    def _draw_scene(self, screen):
+        """Draw background, game and effects"""
+        self._draw_frame(screen, self._capture_frame())
+    
+    def _draw_frame(self, screen, frame):
+        """
+        Draw a captured frame
+        
+        Args:
+            screen: pygame surface to draw on
+            frame: ScreenFrame from _capture_frame()
+        """
         # Draw appropriate background
-        if self._game.is_game_over and self._game_over_background:
+        if frame.game.is_game_over and self._game_over_background:
             # Draw game over background (win or lose)
             screen.blit(self._game_over_background, (0, 0))
         else:
@@ -272,55 +561,57 @@ class GameScreen(BaseScreen):
             screen.blit(self._background, (0, 0))
         
         # Draw game (without its own background)
-        self._game.draw(screen, draw_background=False)
+        self._game.draw_frame(screen, frame.game, draw_background=False)
         
         # Draw particles
-        for particle in self._particles:
-            particle.draw(screen)
+        for render_state in frame.particles:
+            Particle.draw_state(screen, render_state)
         
         # Draw floating texts
-        for text in self._floating_texts:
-            text.draw(screen)
-        
-        # Draw game over screen if game is over
-        if self._game.is_game_over:
-            self._draw_game_over(screen)
+        for render_state in frame.texts:
+            FloatingText.draw_state(screen, render_state)
+    
+    def _draw_game_over_scene(self, surface):
+        """Compose the frozen final scene with the game over overlay"""
+        self._draw_scene(surface)
+        surface.blit(self._get_layer('game_over_overlay', self._draw_game_over, alpha=True), (0, 0))
     
-    def _draw_game_over(self, screen):
-        """Draw game over overlay"""
+    def _draw_game_over(self, surface):
+        """Draw game over overlay onto a transparent layer"""
         # Semi-transparent overlay
-        overlay = pygame.Surface((self._width, self._height))
-        overlay.set_alpha(100)
-        overlay.fill((0, 0, 0))
-        screen.blit(overlay, (0, 0))
+        surface.fill((0, 0, 0, 100))
         
         # Game Over text
         font = pygame.font.Font(None, 84)
         game_over_text = font.render("GAME OVER", True, (251, 191, 36))
         game_over_rect = game_over_text.get_rect(center=(self._width // 2, self._height // 2 - 80))
-        screen.blit(game_over_text, game_over_rect)
+        surface.blit(game_over_text, game_over_rect)
         
         # Results
         results_font = pygame.font.Font(None, 48)
         results = self._game.get_results()
         
-        score_text = results_font.render(f"Score: {results['score']}", True, (255, 255, 255))
+        if 'players' in results:
+            score_line = f"P{results['winner'] + 1} wins! Score: {results['score']}"
+        else:
+            score_line = f"Score: {results['score']}"
+        score_text = results_font.render(score_line, True, (255, 255, 255))
         score_rect = score_text.get_rect(center=(self._width // 2, self._height // 2))
-        screen.blit(score_text, score_rect)
+        surface.blit(score_text, score_rect)
         
         caught_text = results_font.render(
             f"Caught: {results['good_caught']}/{results['total_caught']}",
             True, (255, 255, 255)
         )
         caught_rect = caught_text.get_rect(center=(self._width // 2, self._height // 2 + 50))
-        screen.blit(caught_text, caught_rect)
+        surface.blit(caught_text, caught_rect)
         
         accuracy_text = results_font.render(
             f"Accuracy: {results['accuracy']:.1f}%",
             True, (255, 255, 255)
         )
         accuracy_rect = accuracy_text.get_rect(center=(self._width // 2, self._height // 2 + 100))
-        screen.blit(accuracy_text, accuracy_rect)
+        surface.blit(accuracy_text, accuracy_rect)
         
         # Instructions
         instruction_font = pygame.font.Font(None, 36)
@@ -329,10 +620,10 @@ class GameScreen(BaseScreen):
             True, (200, 200, 200)
         )
         instruction_rect = instruction_text.get_rect(center=(self._width // 2, self._height - 60))
-        screen.blit(instruction_text, instruction_rect)
+        surface.blit(instruction_text, instruction_rect)
         
         # Draw stars based on score
-        self._draw_stars(screen, results['score'])
+        self._draw_stars(surface, results['score'])
     
     def _draw_stars(self, screen, score):
         """Draw star rating based on score"""
@@ -346,22 +637,4 @@ class GameScreen(BaseScreen):
         
         for i in range(stars):
             star_x = start_x + i * star_spacing
-            self._draw_star(screen, star_x, star_y, 20, (251, 191, 36))
-    
-    def _draw_star(self, screen, x, y, size, color):
-        """Draw a star shape"""
-        import math
-        points = []
-        for i in range(5):
-            angle = math.pi / 2 + (2 * math.pi * i) / 5
-            point_x = x + size * math.cos(angle)
-            point_y = y - size * math.sin(angle)
-            points.append((point_x, point_y))
-            
-            # Inner point
-            angle = math.pi / 2 + (2 * math.pi * i) / 5 + math.pi / 5
-            point_x = x + (size * 0.4) * math.cos(angle)
-            point_y = y - (size * 0.4) * math.sin(angle)
-            points.append((point_x, point_y))
-        
-        pygame.draw.polygon(screen, color, points)
+            draw_star(screen, star_x, star_y, 20, (251, 191, 36))
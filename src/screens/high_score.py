@@ -6,8 +6,11 @@ import pygame
 import math
 from screens.base import BaseScreen
 from ui.button import Button
+from ui.shapes import draw_star
 from core.background import Background
 from core.audio_manager import AudioManager
+from core.score_sketch import ScoreSketch
+from network.leaderboard_client import LeaderboardClient
 from utils.load_image import get_assets_path, load_image_fit
 
 class HighScore(BaseScreen):
@@ -26,7 +29,7 @@ class HighScore(BaseScreen):
         self._audio = AudioManager()
         
         # Create button with audio
-        self._back_button = Button(100, screen_height - 80, 150, 100, "Back", audio_manager=self._audio, image_name='button-back.png')
+        self._back_button = Button(100, screen_height - 80, 150, 100, "Back", audio_manager=self._audio, image_name='button-back.png', bundle=self._bundle)
         
         # Play victory sound
         self._audio.play_sound('victory')
@@ -41,6 +44,20 @@ class HighScore(BaseScreen):
             'time_played': 0
         }
         
+        # Shared leaderboard (sessions are submitted by GameScreen when they
+        # end): read top-N/rank from cache
+        self._leaderboard = LeaderboardClient()
+        self._leaderboard_version = self._leaderboard.version
+        
+        # Local percentile rank from the bounded sketch of all final scores,
+        # so ranking never scans the history
+        self._top_fraction = None
+        self._scores_recorded = 0
+        if game_results:
+            sketch = ScoreSketch.load()
+            self._top_fraction = sketch.top_fraction(game_results['score'])
+            self._scores_recorded = sketch.count
+        
         # Animation state
         self._time = 0
         self._star_scale = [0, 0, 0]
@@ -79,6 +96,14 @@ class HighScore(BaseScreen):
                 if self._star_scale[i] > 1.0:
                     self._star_scale[i] = 1.0
         
+        # Leaderboard reads come from the client cache; redraw the static
+        # layer only when that cache actually changed
+        self._leaderboard.get_top(5)
+        self._leaderboard.get_rank(self._results['score'])
+        if self._leaderboard.version != self._leaderboard_version:
+            self._leaderboard_version = self._leaderboard.version
+            self._invalidate_layer('static')
+        
         # Update button
         mouse_pos = pygame.mouse.get_pos()
         mouse_pressed = pygame.mouse.get_pressed()
@@ -86,26 +111,37 @@ class HighScore(BaseScreen):
     
     def draw(self, screen):
         """Draw high score screen"""
+        # Background, title, statistics and rating never change: one cached blit
+        screen.blit(self._get_layer('static', self._draw_static), (0, 0))
+        
+        # Draw stars with animation
+        self._draw_animated_stars(screen)
+        
+        # Draw button
+        self._back_button.draw(screen)
+    
+    def _draw_static(self, surface):
+        """Compose the static part of the results screen"""
         # Draw background
-        screen.blit(self._background, (0, 0))
+        surface.blit(self._background, (0, 0))
         
         # Draw title
         title_font = pygame.font.Font(None, 72)
         title_text = title_font.render("HASIL PERMAINAN", True, (251, 191, 36))
         title_rect = title_text.get_rect(center=(self._width // 2, 60))
-        screen.blit(title_text, title_rect)
+        surface.blit(title_text, title_rect)
         
-        # Draw stars with animation
-        self._draw_animated_stars(screen)
+        # Draw percentile rank among all recorded scores
+        self._draw_percentile(surface)
         
         # Draw statistics
-        self._draw_statistics(screen)
+        self._draw_statistics(surface)
         
         # Draw rating message
-        self._draw_rating_message(screen)
+        self._draw_rating_message(surface)
         
-        # Draw button
-        self._back_button.draw(screen)
+        # Draw shared leaderboard
+        self._draw_leaderboard(surface)
     
     def _draw_animated_stars(self, screen):
         """Draw stars with scale animation"""
@@ -124,46 +160,10 @@ class HighScore(BaseScreen):
                 color = (100, 100, 100)
                 scale = 1.0
             
-            # Draw star with scale
+            # Draw star with scale (cached surface per size bucket)
             size = int(30 * scale)
             if size > 0:
-                self._draw_star(screen, star_x, star_y, size, color)
-    
-    def _draw_star(self, screen, x, y, size, color):
-        """Draw a star shape"""
-        points = []
-        for i in range(5):
-            angle = math.pi / 2 + (2 * math.pi * i) / 5
-            point_x = x + size * math.cos(angle)
-            point_y = y - size * math.sin(angle)
-            points.append((point_x, point_y))
-            
-            # Inner point
-            angle = math.pi / 2 + (2 * math.pi * i) / 5 + math.pi / 5
-            point_x = x + (size * 0.4) * math.cos(angle)
-            point_y = y - (size * 0.4) * math.sin(angle)
-            points.append((point_x, point_y))
-        
-        pygame.draw.polygon(screen, color, points)
-    
-    def _draw_star_glow(self, screen, x, y, size, color, alpha):
-        """Draw star glow effect"""
-        glow_surface = pygame.Surface((size * 3, size * 3), pygame.SRCALPHA)
-        
-        for i in range(5):
-            angle = math.pi / 2 + (2 * math.pi * i) / 5
-            point_x = size * 1.5 + size * math.cos(angle)
-            point_y = size * 1.5 - size * math.sin(angle)
-            
-            # Draw fading circles for glow
-            for j in range(3):
-                glow_radius = int(size * 0.3 * (3 - j))
-                glow_alpha = alpha // (j + 1)
-                glow_color = (*color, glow_alpha)
-                pygame.draw.circle(glow_surface, glow_color, 
-                                 (int(point_x), int(point_y)), glow_radius)
-        
-        screen.blit(glow_surface, (x - size * 1.5, y - size * 1.5))
+                draw_star(screen, star_x, star_y, size, color)
     
     def _draw_statistics(self, screen):
         """Draw game statistics"""
@@ -187,6 +187,16 @@ class HighScore(BaseScreen):
             stat_rect = stat_text.get_rect(center=(self._width // 2, y_start + i * line_height))
             screen.blit(stat_text, stat_rect)
     
+    def _draw_percentile(self, screen):
+        """Draw 'Top X%' of this session's score among all recorded scores"""
+        if self._top_fraction is None:
+            return
+        percent = max(1, math.ceil(self._top_fraction * 100 - 1e-9))
+        percentile_font = pygame.font.Font(None, 30)
+        percentile_text = percentile_font.render(
+            f"Top {percent}% dari {self._scores_recorded} skor", True, (34, 197, 94))
+        screen.blit(percentile_text, percentile_text.get_rect(center=(self._width // 2, 205)))
+    
     def _draw_rating_message(self, screen):
         """Draw rating message based on performance"""
         messages = [
@@ -197,7 +207,37 @@ class HighScore(BaseScreen):
         ]
         
         message = messages[self._target_stars]
+        if 'players' in self._results:
+            # Multiplayer: stats shown are the winner's
+            message = f"P{self._results['winner'] + 1} menang! {message}"
         message_font = pygame.font.Font(None, 48)
         message_text = message_font.render(message, True, (251, 191, 36))
         message_rect = message_text.get_rect(center=(self._width // 2, 520))
         screen.blit(message_text, message_rect)
+    
+    def _draw_leaderboard(self, screen):
+        """Draw top scores and this session's rank from the leaderboard cache"""
+        title_font = pygame.font.Font(None, 32)
+        entry_font = pygame.font.Font(None, 26)
+        panel_x = self._width - 150
+        
+        title_text = title_font.render("PAPAN SKOR", True, (251, 191, 36))
+        screen.blit(title_text, title_text.get_rect(center=(panel_x, 240)))
+        
+        top_entries = self._leaderboard.get_top(5)
+        if top_entries is None:
+            lines = ["Offline" if not self._leaderboard.is_online else "Memuat..."]
+        elif not top_entries:
+            lines = ["Belum ada skor"]
+        else:
+            lines = [f"{i + 1}. {entry['name'][:10]}  {entry['score']}"
+                     for i, entry in enumerate(top_entries)]
+        
+        rank = self._leaderboard.get_rank(self._results['score'])
+        if rank and self._results['score'] > 0:
+            lines.append("")
+            lines.append(f"Peringkat #{rank[0]} / {max(rank[1], rank[0])}")
+        
+        for i, line in enumerate(lines):
+            line_text = entry_font.render(line, True, (255, 255, 255))
+            screen.blit(line_text, line_text.get_rect(center=(panel_x, 275 + i * 28)))
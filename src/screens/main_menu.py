@@ -8,6 +8,10 @@ from screens.base import BaseScreen
 from ui.button import Button
 from core.audio_manager import AudioManager
 from utils.load_image import get_assets_path, load_image_fit
+from utils.logger import get_logger
+
+
+logger = get_logger(__name__)
 
 
 class MainMenu(BaseScreen):
@@ -31,9 +35,9 @@ class MainMenu(BaseScreen):
         
         # Create buttons with audio and images
         center_x = screen_width // 2
-        self._play_button = Button(center_x, 310, 400, 125, "MAIN", audio_manager=self._audio, image_name='button-start.png')
-        self._highscore_button = Button(center_x, 430, 250, 75, "HIGH SCORE", audio_manager=self._audio, image_name='button-score.png')
-        self._quit_button = Button(center_x, 520, 250, 75, "KELUAR", audio_manager=self._audio, image_name='button-leave.png')
+        self._play_button = Button(center_x, 310, 400, 125, "MAIN", audio_manager=self._audio, image_name='button-start.png', bundle=self._bundle)
+        self._highscore_button = Button(center_x, 430, 250, 75, "HIGH SCORE", audio_manager=self._audio, image_name='button-score.png', bundle=self._bundle)
+        self._quit_button = Button(center_x, 520, 250, 75, "KELUAR", audio_manager=self._audio, image_name='button-leave.png', bundle=self._bundle)
         
         # Play menu music
         self._audio.play_music('menu_music', loop=True)
@@ -41,25 +45,28 @@ class MainMenu(BaseScreen):
         # Animation state
         self._title_offset = 0
         self._time = 0
+        
+        # Instruction line (static text, rendered on first draw)
+        self._instruction_text = None
     
     def _load_logo(self):
         """Load and prepare logo image"""
         try:
             logo_path = get_assets_path('images', 'logo.png')
             # Load logo with max dimensions to fit nicely above buttons
-            self._logo, self._logo_width, self._logo_height = load_image_fit(
-                logo_path, 
-                max_width=400, 
-                max_height=200, 
-                convert_alpha=True
+            self._logo, self._logo_width, self._logo_height = self._residency.load(
+                self._bundle, 'ui', ('logo', 400, 200),
+                lambda: load_image_fit(logo_path, max_width=400, max_height=200, convert_alpha=True)
             )
         except Exception as e:
-            print(f"Error loading logo: {e}")
+            logger.error("Error loading logo: %s", e)
             self._logo = None
     
     def handle_event(self, event):
         """Handle menu events"""
-        if event.type == pygame.MOUSEBUTTONUP:
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_c:
+            self.set_next_screen('CALIBRATION')
+        elif event.type == pygame.MOUSEBUTTONUP:
             mouse_pos = pygame.mouse.get_pos()
             
             if self._play_button.is_clicked(mouse_pos, True):
@@ -101,7 +108,8 @@ class MainMenu(BaseScreen):
         self._quit_button.draw(screen)
         
         # Draw instructions
-        instruction_font = pygame.font.Font(None, 28)
-        instruction_text = instruction_font.render("Use ← → or A D to move", True, (200, 200, 200))
-        instruction_rect = instruction_text.get_rect(center=(self._width // 2, self._height - 40))
-        screen.blit(instruction_text, instruction_rect)
+        if self._instruction_text is None:
+            instruction_font = pygame.font.Font(None, 28)
+            self._instruction_text = instruction_font.render("Use ← → or A D to move  ·  C: audio calibration", True, (200, 200, 200))
+        instruction_rect = self._instruction_text.get_rect(center=(self._width // 2, self._height - 40))
+        screen.blit(self._instruction_text, instruction_rect)
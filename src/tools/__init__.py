@@ -0,0 +1 @@
+# Developer tools (stress test, reports, benchmarks)
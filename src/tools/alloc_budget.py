@@ -0,0 +1,354 @@
+"""
+Allocation budget check for the steady-state frame loop
+Demonstrates: Inheritance (harness subclass), Composition
+
+Runs GameScreen (and MainMenu, for Button.draw) headlessly for thousands
+of frames under tracemalloc. Every instrumented call site records the peak
+bytes allocated above its starting point while it ran: the transient
+churn of Rects, Fonts and Surfaces created and dropped each frame. Warm-up
+frames are discarded, the rest are averaged per frame of their screen.
+Memory still allocated after a full collection at the end of a screen's
+frames, compared with its start, is reported as growth. The check fails
+(exit status 1) when the per-frame peak of a whole frame or of a call site
+exceeds its budget, or when memory keeps growing.
+
+tracemalloc sees Python-side allocations (objects, buffers, font files
+read into bytes); pixel memory SDL allocates for surfaces is not traced,
+but each Surface object still shows up. GC collections per 1000 frames are
+reported alongside, since allocation churn is what triggers them.
+
+Run headless:
+    python src/tools/alloc_budget.py --frames 3000
+    python src/tools/alloc_budget.py --budget frame=4096 --budget Game.draw_frame=2048
+"""
+import argparse
+import gc
+import os
+import random
+import sys
+import tracemalloc
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+from core.audio_manager import AudioManager
+from core.game import Game
+from core.quality_manager import QualityManager
+from screens.game_screen import GameScreen, FloatingText
+from screens.main_menu import MainMenu
+from tools.stress_test import _StressGame
+from ui.button import Button
+
+
+# Instrumented call sites: label -> (class, method name)
+CALL_SITES = {
+    'Game.update': (Game, 'update'),
+    'Game.draw_frame': (Game, 'draw_frame'),
+    'Game._draw_hud': (Game, '_draw_hud'),
+    'FloatingText.draw_state': (FloatingText, 'draw_state'),
+    'Button.draw': (Button, 'draw'),
+}
+
+# Default per-frame peak budgets in bytes ('frame' = a whole game frame,
+# 'menu' = a whole main menu frame)
+DEFAULT_BUDGETS = {
+    'frame': 8192,
+    'menu': 1024,
+    'Game.update': 6144,  # NumPy temporaries of the vectorised collision check
+    'Game.draw_frame': 1024,
+    'Game._draw_hud': 512,
+    'FloatingText.draw_state': 1024,
+    'Button.draw': 1024,
+}
+
+# Growth per 1000 frames (after a full collection) reported as a leak
+LEAK_BYTES_PER_1000 = 8192
+
+
+class _Tracker:
+    """
+    Nested peak accounting on top of tracemalloc
+    Each active call keeps the highest traced memory seen while it ran;
+    tracemalloc's peak is reset on entry, so nested calls fold their
+    peaks into their caller on exit
+    """
+
+    def __init__(self):
+        self._stack = []
+        self._totals = {}
+        self._recording = False
+
+    def enter(self):
+        current, peak = tracemalloc.get_traced_memory()
+        if self._stack:
+            self._stack[-1][1] = max(self._stack[-1][1], peak)
+        tracemalloc.reset_peak()
+        self._stack.append([current, current])
+
+    def exit(self, label):
+        _, peak = tracemalloc.get_traced_memory()
+        base, highest = self._stack.pop()
+        highest = max(highest, peak)
+        if self._stack:
+            self._stack[-1][1] = max(self._stack[-1][1], highest)
+        if self._recording:
+            totals = self._totals.setdefault(label, [0, 0])
+            totals[0] += 1
+            totals[1] += highest - base
+
+    def start_recording(self):
+        """Start a new measurement; returns the previous one's totals"""
+        totals = self._totals
+        self._recording = True
+        self._totals = {}
+        return totals
+
+    @property
+    def totals(self):
+        """label -> [calls, summed peak bytes]"""
+        return self._totals
+
+
+def instrument(tracker):
+    """
+    Wrap every CALL_SITES method with the tracker
+
+    Args:
+        tracker: _Tracker receiving the measurements
+
+    Returns:
+        list: (owner, name, original) to restore with uninstrument()
+    """
+    originals = []
+    for label, (owner, name) in CALL_SITES.items():
+        original = owner.__dict__[name]
+        function = original.__func__ if isinstance(original, staticmethod) else original
+
+        def wrapper(*args, _function=function, _label=label, **kwargs):
+            tracker.enter()
+            try:
+                return _function(*args, **kwargs)
+            finally:
+                tracker.exit(_label)
+
+        setattr(owner, name, staticmethod(wrapper) if isinstance(original, staticmethod) else wrapper)
+        originals.append((owner, name, original))
+    return originals
+
+
+def uninstrument(originals):
+    """Restore methods wrapped by instrument()"""
+    for owner, name, original in originals:
+        setattr(owner, name, original)
+
+
+class _SteadyScreen(GameScreen):
+    """
+    Game screen held in a steady state: fixed time step, constant item
+    count, regular catches, and a session that never ends
+    Inheritance: Extends GameScreen
+    """
+
+    def __init__(self, screen_width, screen_height, items, catch_interval, seed=1):
+        super().__init__(screen_width, screen_height, record_results=False)
+        self._game = _StressGame(screen_width, screen_height)
+        self._reset_catch_tracking()
+        self._items_target = items
+        self._catch_interval = catch_interval
+        self._rng = random.Random(seed)
+        self._frame = 0
+
+    def update(self):
+        """One fixed 1/60 s step with the load topped up"""
+        self._frame += 1
+        self._game.keep_alive()
+        self._game.fill_items(self._items_target, self._rng)
+        if self._frame % self._catch_interval == 0:
+            player = self._game.players[0]
+            self._create_catch_effect(player.x, player.y, "+5", (34, 197, 94), (34, 197, 94))
+        axes = [(0.0, 0)] * len(self._game.players)
+        self._advance_game(axes, 1.0 / 60.0)
+        self._update_effects()
+        self._apply_side_effects()
+
+
+def _run_frames(screen, display, frames, tracker, label='frame'):
+    """Update and draw frames, each measured as one call of label"""
+    for _ in range(frames):
+        tracker.enter()
+        try:
+            screen.update()
+            display.fill((0, 0, 0))
+            screen.draw(display)
+        finally:
+            tracker.exit(label)
+
+
+def _measure(screen, display, frames, tracker, label):
+    """
+    Measure frames of one screen
+
+    Returns:
+        tuple: (site label -> per-frame figures, growth in bytes per 1000
+               frames, GC collections per generation)
+    """
+    collections = [0, 0, 0]
+
+    def count_collections(phase, info):
+        if phase == 'start':
+            collections[info['generation']] += 1
+
+    gc.collect()
+    start = tracemalloc.get_traced_memory()[0]
+    tracker.start_recording()
+    gc.callbacks.append(count_collections)
+    try:
+        _run_frames(screen, display, frames, tracker, label)
+    finally:
+        gc.callbacks.remove(count_collections)
+    totals = tracker.start_recording()
+    gc.collect()
+    growth = tracemalloc.get_traced_memory()[0] - start
+
+    sites = {}
+    for site_label, (calls, peak) in totals.items():
+        sites[site_label] = {
+            'calls_per_frame': calls / frames,
+            'peak_per_frame': peak / frames,
+            'peak_per_call': peak / calls
+        }
+    sites[label]['growth_per_1000'] = growth / frames * 1000.0
+    return sites, collections
+
+
+def run(frames=3000, warmup=300, menu_frames=600, items=20, catch_interval=20):
+    """
+    Measure steady-state allocations per frame
+
+    Args:
+        frames: Measured game frames
+        warmup: Unmeasured frames first (caches fill, effects reach steady state)
+        menu_frames: Measured main menu frames (Button.draw)
+        items: Live items kept on screen
+        catch_interval: Frames between catch effects
+
+    Returns:
+        dict: 'sites' (label -> calls and peak bytes per frame of its
+              screen, plus growth for 'frame' and 'menu'), 'gc' (collections
+              per 1000 frames by generation) and 'frames'
+    """
+    display = pygame.display.get_surface()
+    width, height = display.get_size()
+    QualityManager().set_enabled(False, level=QualityManager.HIGH)
+    # tracemalloc is process-wide: the music engine's render thread would
+    # land its chunk buffers in whichever frame happens to be measured
+    AudioManager().set_procedural_music(False)
+
+    game_screen = _SteadyScreen(width, height, items, catch_interval)
+    menu = MainMenu(width, height)
+
+    tracker = _Tracker()
+    originals = instrument(tracker)
+    tracemalloc.start()
+    try:
+        _run_frames(game_screen, display, warmup, tracker, 'frame')
+        _run_frames(menu, display, min(warmup, menu_frames), tracker, 'menu')
+
+        sites, game_collections = _measure(game_screen, display, frames, tracker, 'frame')
+        menu_sites, menu_collections = _measure(menu, display, menu_frames, tracker, 'menu')
+        sites.update(menu_sites)
+    finally:
+        tracemalloc.stop()
+        uninstrument(originals)
+        game_screen.dispose()
+        menu.dispose()
+
+    measured = frames + menu_frames
+    return {
+        'frames': measured,
+        'sites': sites,
+        'gc': [(game + menu_count) / measured * 1000.0
+               for game, menu_count in zip(game_collections, menu_collections)]
+    }
+
+
+def check(result, budgets):
+    """
+    Compare a run against budgets
+
+    Args:
+        result: Value returned by run()
+        budgets: label -> allowed per-frame peak bytes
+
+    Returns:
+        list: Failure messages (empty when within budget)
+    """
+    failures = []
+    for label, budget in budgets.items():
+        site = result['sites'].get(label)
+        if site is not None and site['peak_per_frame'] > budget:
+            failures.append(f"{label}: {site['peak_per_frame']:.0f} B per frame > budget {budget} B")
+    for label in ('frame', 'menu'):
+        site = result['sites'].get(label)
+        if site is not None and site['growth_per_1000'] > LEAK_BYTES_PER_1000:
+            failures.append(f"{label}: memory grows {site['growth_per_1000']:.0f} B per 1000 frames")
+    return failures
+
+
+def _parse_budget(text):
+    """'label=bytes' command line budget"""
+    label, _, value = text.partition('=')
+    if label not in DEFAULT_BUDGETS:
+        raise argparse.ArgumentTypeError(f"unknown call site {label!r}")
+    return label, int(value)
+
+
+def main():
+    """Run the allocation check from the command line"""
+    parser = argparse.ArgumentParser(description="Steady-state per-frame allocation budget check")
+    parser.add_argument('--frames', type=int, default=3000, help="measured game frames (default 3000)")
+    parser.add_argument('--warmup', type=int, default=300, help="unmeasured frames first (default 300)")
+    parser.add_argument('--menu-frames', type=int, default=600,
+                        help="measured main menu frames for Button.draw (default 600)")
+    parser.add_argument('--items', type=int, default=20, help="live items (default 20)")
+    parser.add_argument('--budget', type=_parse_budget, action='append', default=[],
+                        metavar='SITE=BYTES', help="override a per-frame peak budget")
+    args = parser.parse_args()
+
+    budgets = dict(DEFAULT_BUDGETS)
+    budgets.update(args.budget)
+
+    pygame.display.init()
+    pygame.font.init()
+    pygame.display.set_mode((1000, 600))
+    pygame.time.Clock()  # Starts the SDL timer used by Game
+
+    result = run(args.frames, args.warmup, args.menu_frames, args.items)
+
+    print(f"{'call site':<26}{'calls/frame':>12}{'peak B/frame':>14}{'peak B/call':>13}"
+          f"{'budget':>9}{'growth B/1k':>13}")
+    for label in ['frame', 'menu'] + list(CALL_SITES):
+        site = result['sites'].get(label)
+        if site is None:
+            continue
+        growth = f"{site['growth_per_1000']:.0f}" if 'growth_per_1000' in site else ''
+        print(f"{label:<26}{site['calls_per_frame']:>12.2f}{site['peak_per_frame']:>14.0f}"
+              f"{site['peak_per_call']:>13.0f}{budgets.get(label, 0):>9}{growth:>13}")
+    gen0, gen1, gen2 = result['gc']
+    print(f"GC collections per 1000 frames: gen0 {gen0:.1f}, gen1 {gen1:.1f}, gen2 {gen2:.1f}")
+
+    failures = check(result, budgets)
+    pygame.quit()
+    if failures:
+        print("Allocation budget exceeded:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    print(f"Within budget over {result['frames']} frames")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Benchmark of AABB versus pixel-mask collision at high item counts
+Demonstrates: Inheritance (benchmark subclass), Composition
+
+Run headless:
+    python src/tools/collision_benchmark.py --items 100 250 500 1000 2000 --players 1 4
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+from core.game import Game, COLLISION_AABB, COLLISION_PIXEL
+from core.item import create_item
+from core.item_registry import ItemRegistry
+
+
+class _BenchmarkGame(Game):
+    """
+    Game with a controlled item layout
+    Inheritance: Extends Game to reach its protected state
+    """
+
+    def place_items(self, count, near_fraction, rng):
+        """
+        Replace live items with a random layout
+
+        Args:
+            count: Number of items
+            near_fraction: Share of items placed inside a player's rectangle
+                           band, so the narrowphase actually runs
+            rng: random.Random used for placement
+        """
+        self._items = []
+        for _ in range(count):
+            if rng.random() < near_fraction:
+                player = rng.choice(self._players)
+                x = player.x + rng.uniform(-player.width / 2 - 25, player.width / 2 + 25)
+                y = player.y + rng.uniform(-player.height / 2 - 25, player.height / 2 + 25)
+            else:
+                x = rng.uniform(50, self._width - 50)
+                y = rng.uniform(-30, self._height - 250)
+            self._items.append(create_item(ItemRegistry().pick(rng), x, y))
+
+
+def time_mode(game, mode, repeats):
+    """
+    Time collision resolution in one mode
+
+    Args:
+        game: _BenchmarkGame with items placed
+        mode: COLLISION_AABB or COLLISION_PIXEL
+        repeats: Number of timed calls
+
+    Returns:
+        tuple: (microseconds per call, catches per call)
+    """
+    game.set_collision_mode(mode)
+    catches = len(game._resolve_collisions())  # Warm-up
+    start = time.perf_counter()
+    for _ in range(repeats):
+        game._resolve_collisions()
+    return (time.perf_counter() - start) / repeats * 1e6, catches
+
+
+def run(item_counts, player_counts, near_fraction=0.25, repeats=200, seed=1):
+    """
+    Benchmark every item/player count combination
+
+    Args:
+        item_counts: Item counts to test
+        player_counts: Player counts to test
+        near_fraction: Share of items placed around players
+        repeats: Timed calls per measurement
+        seed: Layout seed
+
+    Returns:
+        list: One result dict per combination
+    """
+    results = []
+    for players in player_counts:
+        game = _BenchmarkGame(1000, 600, num_players=players)
+        for count in item_counts:
+            game.place_items(count, near_fraction, random.Random(seed))
+            aabb_us, aabb_hits = time_mode(game, COLLISION_AABB, repeats)
+            pixel_us, pixel_hits = time_mode(game, COLLISION_PIXEL, repeats)
+            results.append({
+                'items': count,
+                'players': players,
+                'rect_hits': aabb_hits,
+                'pixel_hits': pixel_hits,
+                'aabb_us': round(aabb_us, 1),
+                'pixel_us': round(pixel_us, 1),
+                'overhead_pct': round((pixel_us / aabb_us - 1.0) * 100.0, 1)
+            })
+    return results
+
+
+def main():
+    """Run the benchmark from the command line"""
+    parser = argparse.ArgumentParser(description="AABB vs pixel-mask collision benchmark")
+    parser.add_argument('--items', type=int, nargs='+', default=[100, 250, 500, 1000, 2000])
+    parser.add_argument('--players', type=int, nargs='+', default=[1, 4])
+    parser.add_argument('--near', type=float, default=0.25,
+                        help="share of items placed around players (default 0.25)")
+    parser.add_argument('--repeats', type=int, default=200)
+    parser.add_argument('--json', help="also write results to this JSON file")
+    args = parser.parse_args()
+
+    pygame.display.init()
+    pygame.display.set_mode((1000, 600))
+    pygame.time.Clock()  # Starts the SDL timer used by Game
+
+    results = run(args.items, args.players, args.near, args.repeats)
+    print(f"{'items':>6}{'players':>8}{'rect hits':>10}{'pixel hits':>11}"
+          f"{'aabb us':>10}{'pixel us':>10}{'overhead':>10}")
+    for row in results:
+        print(f"{row['items']:>6}{row['players']:>8}{row['rect_hits']:>10}{row['pixel_hits']:>11}"
+              f"{row['aabb_us']:>10.1f}{row['pixel_us']:>10.1f}{row['overhead_pct']:>9.1f}%")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as json_file:
+            json.dump(results, json_file, indent=2)
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Merge score sketches from other machines into the local percentile rank
+
+Each machine keeps its own data/score_sketch.json (see core/score_sketch.py).
+Copy the other machines' files over and fold them in; the results screen
+then ranks new scores against all of their recorded scores:
+    python src/tools/merge_scores.py laptop.json lab-pc.json
+    python src/tools/merge_scores.py a.json b.json -o combined.json
+"""
+import argparse
+import os
+import sys
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.score_sketch import ScoreSketch
+from utils.storage import get_data_path, load_json
+
+
+def merge_files(paths, output=None):
+    """
+    Merge sketch files into the local (or output) sketch
+
+    Args:
+        paths: Sketch JSON files to fold in
+        output: File to write (default data/score_sketch.json, which is
+                also merged in when it exists)
+
+    Returns:
+        ScoreSketch: The merged sketch (already saved)
+
+    Raises:
+        ValueError: A file is missing or not a score sketch
+    """
+    output = output or get_data_path(ScoreSketch.DEFAULT_FILE)
+    sketch = ScoreSketch.load(output)
+    for path in paths:
+        data = load_json(path)
+        if data is None:
+            raise ValueError(f"cannot read {path}")
+        try:
+            sketch.merge(ScoreSketch.from_dict(data))
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"{path} is not a score sketch: {e}") from e
+    if not sketch.save(output):
+        raise ValueError(f"cannot write {output}")
+    return sketch
+
+
+def main():
+    """Merge score sketches from the command line"""
+    parser = argparse.ArgumentParser(description="Merge score sketches from several machines")
+    parser.add_argument('sketches', nargs='+', help="score_sketch.json files to merge in")
+    parser.add_argument('-o', '--output',
+                        help="merged sketch file (default: data/score_sketch.json, merged in too)")
+    args = parser.parse_args()
+
+    try:
+        sketch = merge_files(args.sketches, args.output)
+    except ValueError as e:
+        print(f"Merge failed: {e}")
+        sys.exit(1)
+    print(f"{sketch.count} scores recorded, {sketch.retained} retained")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+Benchmark of serial versus pipelined (simulation thread) game frames
+Demonstrates: Inheritance (benchmark subclass), Composition
+
+Both modes run the same loaded game screen for a fixed number of paced
+frames. The serial mode updates, draws and flips on the main thread. The
+pipelined mode only samples input on the main thread while a
+SimulationPipeline steps the game. Per mode the benchmark reports main
+thread frame cost and simulation step time. For the pipelined mode it
+also reports how much simulation ran inside the main thread's draw + flip
+intervals: that work overlaps rendering instead of running after it, and
+is only possible while pygame has released the GIL in SDL blits and flips.
+
+Run headless:
+    python src/tools/pipeline_benchmark.py --items 300 --frames 600
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+from core.quality_manager import QualityManager
+from screens.game_screen import GameScreen
+from tools.stress_test import _StressGame
+
+
+class _BenchmarkScreen(GameScreen):
+    """
+    Game screen held at a constant load
+    Inheritance: Extends GameScreen; the load is topped up inside each
+    simulation step so both modes do the same work
+    """
+
+    def __init__(self, screen_width, screen_height, items, catch_interval, pipelined, seed=1):
+        super().__init__(screen_width, screen_height, pipelined=pipelined, record_results=False)
+        self._game = _StressGame(screen_width, screen_height)
+        self._reset_catch_tracking()
+        self._items_target = items
+        self._catch_interval = catch_interval
+        self._steps = 0
+        self._rng = random.Random(seed)
+        self._step_times = []
+
+    def _advance_game(self, axes, delta_time=None):
+        """Keep the session alive and loaded, then advance it (timed game step)"""
+        started = time.perf_counter()
+        self._game.keep_alive()
+        self._game.fill_items(self._items_target, self._rng)
+        self._steps += 1
+        if self._steps % self._catch_interval == 0:
+            player = self._game.players[0]
+            self._create_catch_effect(player.x, player.y, "+5", (34, 197, 94), (34, 197, 94))
+        super()._advance_game(axes, delta_time)
+        self._step_times.append(time.perf_counter() - started)
+
+    @property
+    def step_times(self):
+        return self._step_times
+
+
+def _overlap(intervals, windows):
+    """
+    Total time of intervals falling inside windows
+
+    Args:
+        intervals: Sorted (start, end) pairs
+        windows: Sorted, non-overlapping (start, end) pairs
+
+    Returns:
+        float: Seconds of overlap
+    """
+    total = 0.0
+    window_index = 0
+    for start, end in intervals:
+        while window_index < len(windows) and windows[window_index][1] <= start:
+            window_index += 1
+        index = window_index
+        while index < len(windows) and windows[index][0] < end:
+            total += min(end, windows[index][1]) - max(start, windows[index][0])
+            index += 1
+    return total
+
+
+def run_mode(display, pipelined, frames, items, catch_interval, fps=60):
+    """
+    Run one mode and time it
+
+    Args:
+        display: Display surface
+        pipelined: Whether the game is stepped on the simulation thread
+        frames: Frames to run (after 30 warm-up frames)
+        items: Live items kept on screen
+        catch_interval: Steps between catch effects
+        fps: Frame pacing of the main loop
+
+    Returns:
+        dict: Timing results in milliseconds
+    """
+    screen = _BenchmarkScreen(display.get_width(), display.get_height(), items,
+                              catch_interval, pipelined)
+    clock = pygame.time.Clock()
+    update_time = 0.0
+    render_windows = []
+
+    try:
+        for frame in range(frames + 30):
+            pygame.event.pump()
+            started = time.perf_counter()
+            screen.update()
+            updated = time.perf_counter()
+            screen.draw(display)
+            pygame.display.flip()
+            finished = time.perf_counter()
+            if frame >= 30:
+                update_time += updated - started
+                render_windows.append((updated, finished))
+            clock.tick(fps)
+    finally:
+        timeline = screen._pipeline.timeline if pipelined else ()
+        handoff = screen._pipeline.get_stats() if pipelined else None
+        screen.dispose()
+
+    render_time = sum(end - start for start, end in render_windows)
+    step_times = screen.step_times[30:]
+    result = {
+        'mode': 'pipelined' if pipelined else 'serial',
+        'main_ms': (update_time + render_time) / frames * 1000.0,
+        'render_ms': render_time / frames * 1000.0,
+        'step_ms': sum(step_times) / max(1, len(step_times)) * 1000.0,
+        'overlap_ms': 0.0,
+        'overlap_pct': 0.0
+    }
+    if pipelined:
+        # Simulation that ran while the main thread was drawing or flipping
+        first = render_windows[0][0]
+        steps = [interval for interval in timeline if interval[1] > first]
+        overlap = _overlap(steps, render_windows)
+        step_total = sum(end - start for start, end in steps)
+        result['overlap_ms'] = overlap / frames * 1000.0
+        result['overlap_pct'] = overlap / step_total * 100.0 if step_total else 0.0
+        result['latency_p95_ms'] = handoff['latency_p95_ms']
+        result['dropped'] = handoff['dropped']
+    return result
+
+
+def main():
+    """Run the benchmark from the command line"""
+    parser = argparse.ArgumentParser(description="Serial vs pipelined frame benchmark")
+    parser.add_argument('--items', type=int, default=300, help="live items (default 300)")
+    parser.add_argument('--frames', type=int, default=600, help="timed frames per mode (default 600)")
+    parser.add_argument('--catch-interval', type=int, default=4,
+                        help="steps between catch effects (default 4)")
+    args = parser.parse_args()
+
+    pygame.display.init()
+    pygame.font.init()
+    display = pygame.display.set_mode((1000, 600))
+    QualityManager().set_enabled(False, level=QualityManager.HIGH)
+
+    results = [run_mode(display, pipelined, args.frames, args.items, args.catch_interval)
+               for pipelined in (False, True)]
+
+    print(f"{'mode':<10}{'main ms':>9}{'render ms':>11}{'step ms':>9}{'overlap ms':>12}{'overlap':>9}")
+    for row in results:
+        print(f"{row['mode']:<10}{row['main_ms']:>9.2f}{row['render_ms']:>11.2f}{row['step_ms']:>9.2f}"
+              f"{row['overlap_ms']:>12.2f}{row['overlap_pct']:>8.1f}%")
+    serial, pipelined = results
+    print(f"Main thread frame cost: {serial['main_ms']:.2f} -> {pipelined['main_ms']:.2f} ms; "
+          f"simulation inside draw/flip: {pipelined['overlap_ms']:.2f} ms per frame "
+          f"({pipelined['overlap_pct']:.0f}% of steps); handoff latency "
+          f"{pipelined['latency_p95_ms']:.1f} ms p95, {pipelined['dropped']} frames dropped; "
+          f"{os.cpu_count()} CPU(s)")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Startup report: time-to-first-frame and import cost, before vs after
+
+Each run starts a fresh interpreter with -X importtime, launches the game's
+main.py and exits as soon as the first frame has been flipped. The report
+shows the median wall time to that first frame and the slowest imports
+(cumulative microseconds, as printed by -X importtime).
+
+Because the probe patches pygame.display.flip instead of relying on a game
+option, any revision can be measured. Compare the working tree against an
+older commit with:
+    python src/tools/startup_report.py --baseline HEAD~1
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+
+
+# Child process bootstrap: run main.py and exit right after the first flip
+_PROBE = """
+import os, runpy, sys, time
+start = time.perf_counter()
+import pygame
+_flip = pygame.display.flip
+def _first_flip():
+    _flip()
+    sys.stderr.write('first-frame-ms: %.3f\\n' % ((time.perf_counter() - start) * 1000.0))
+    sys.stderr.flush()
+    os._exit(0)
+pygame.display.flip = _first_flip
+main_path = sys.argv[1]
+sys.path.insert(0, os.path.dirname(main_path))
+sys.argv = [main_path]
+runpy.run_path(main_path, run_name='__main__')
+"""
+
+
+def measure(root, runs=5, timeout=60.0):
+    """
+    Measure startup of the game in a source tree
+
+    Args:
+        root: Project root containing src/main.py and assets/
+        runs: Number of fresh processes to start
+        timeout: Seconds before a run is abandoned
+
+    Returns:
+        dict: 'wall_ms' and 'first_frame_ms' lists, 'imports' from the last
+              run as {module: cumulative_us}
+    """
+    env = dict(os.environ)
+    env.setdefault('SDL_VIDEODRIVER', 'dummy')
+    env.setdefault('SDL_AUDIODRIVER', 'dummy')
+    env['PYTHONDONTWRITEBYTECODE'] = '1'
+    main_path = os.path.join(root, 'src', 'main.py')
+
+    result = {'wall_ms': [], 'first_frame_ms': [], 'imports': {}}
+    for _ in range(runs):
+        started = time.perf_counter()
+        process = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', _PROBE, main_path],
+            cwd=root, env=env, capture_output=True, text=True, timeout=timeout
+        )
+        wall_ms = (time.perf_counter() - started) * 1000.0
+
+        first_frame = None
+        imports = {}
+        for line in process.stderr.splitlines():
+            if line.startswith('first-frame-ms:'):
+                first_frame = float(line.split(':', 1)[1])
+            elif line.startswith('import time:') and '|' in line:
+                parts = line[len('import time:'):].split('|')
+                try:
+                    imports[parts[2].strip()] = int(parts[1])
+                except ValueError:
+                    pass  # Column header line
+
+        if first_frame is None:
+            raise RuntimeError(f"no frame presented by {main_path}:\n{process.stderr[-2000:]}")
+        result['wall_ms'].append(wall_ms)
+        result['first_frame_ms'].append(first_frame)
+        result['imports'] = imports
+    return result
+
+
+def export_revision(revision, destination):
+    """
+    Extract src/ and assets/ of a git revision into a directory
+
+    Args:
+        revision: Any git revision (e.g. 'HEAD~1', a tag)
+        destination: Empty directory to extract into
+
+    Returns:
+        str: The destination directory
+    """
+    root = _project_root()
+    archive_path = os.path.join(destination, 'tree.tar')
+    with open(archive_path, 'wb') as archive:
+        subprocess.run(['git', 'archive', '--format=tar', revision, 'src', 'assets'],
+                       cwd=root, stdout=archive, check=True)
+    with tarfile.open(archive_path) as archive:
+        archive.extractall(destination)
+    os.remove(archive_path)
+    return destination
+
+
+def format_report(label, result, top=10):
+    """
+    Format one measurement
+
+    Args:
+        label: Heading for this tree
+        result: Dict returned by measure()
+        top: Number of slowest imports to list
+
+    Returns:
+        str: Report text
+    """
+    lines = [
+        f"{label}",
+        f"  first frame (in process): median {statistics.median(result['first_frame_ms']):8.1f} ms",
+        f"  process start to frame:   median {statistics.median(result['wall_ms']):8.1f} ms",
+        f"  modules imported:         {len(result['imports'])}",
+        "  slowest imports (cumulative):"
+    ]
+    slowest = sorted(result['imports'].items(), key=lambda item: item[1], reverse=True)
+    for module, cumulative_us in slowest[:top]:
+        lines.append(f"    {cumulative_us / 1000.0:8.1f} ms  {module}")
+    return '\n'.join(lines)
+
+
+def _project_root():
+    """Project root (parent of src/)"""
+    return os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def main():
+    """Run the report from the command line"""
+    parser = argparse.ArgumentParser(description="Time-to-first-frame and import report")
+    parser.add_argument('--baseline', metavar='REV',
+                        help="git revision to compare against (e.g. HEAD~1)")
+    parser.add_argument('--runs', type=int, default=5,
+                        help="fresh processes per tree (default 5)")
+    parser.add_argument('--top', type=int, default=10,
+                        help="slowest imports to list (default 10)")
+    args = parser.parse_args()
+
+    current = measure(_project_root(), args.runs)
+    if args.baseline:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            baseline = measure(export_revision(args.baseline, temp_dir), args.runs)
+        print(format_report(f"Before ({args.baseline})", baseline, args.top))
+        print()
+    print(format_report("After (working tree)", current, args.top))
+
+    if args.baseline:
+        before = statistics.median(baseline['first_frame_ms'])
+        after = statistics.median(current['first_frame_ms'])
+        print(f"\nFirst frame: {before:.1f} ms -> {after:.1f} ms ({after - before:+.1f} ms)")
+        deferred = sorted(set(baseline['imports']) - set(current['imports']))
+        if deferred:
+            print(f"No longer imported before the first frame: {', '.join(deferred)}")
+
+
+if __name__ == "__main__":
+    main()
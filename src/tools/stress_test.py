@@ -0,0 +1,259 @@
+"""
+Stress test that ramps load until the frame rate degrades
+Demonstrates: Inheritance (instrumented subclasses), Composition
+"""
+import csv
+import json
+import os
+import random
+import time
+import pygame
+from core.game import Game
+from core.item import create_item
+from core.item_registry import ItemRegistry
+from core.quality_manager import QualityManager
+from screens.game_screen import GameScreen, FloatingText
+
+
+class _StressGame(Game):
+    """
+    Game that never ends and keeps a fixed number of live items
+    Inheritance: Extends Game to reach its protected state
+    """
+
+    def keep_alive(self):
+        """Freeze the timer and HP so the session never ends"""
+        self._time_remaining = 60.0
+        for state in self._player_states:
+            state.hp = self._max_hp
+        self._is_game_over = False
+
+    def fill_items(self, target, rng):
+        """
+        Top up live items to the target count
+
+        Args:
+            target: Desired number of live items
+            rng: random.Random used for placement
+        """
+        while len(self._items) < target:
+            x = rng.randint(50, self._width - 50)
+            y = rng.randint(-30, self._height - 200)
+            self._items.append(create_item(ItemRegistry().pick(rng), x, y))
+
+
+class _StressScreen(GameScreen):
+    """
+    Game screen with externally controlled effect load
+    Inheritance: Extends GameScreen
+    """
+
+    def __init__(self, screen_width, screen_height):
+        super().__init__(screen_width, screen_height, record_results=False)
+        self._game = _StressGame(screen_width, screen_height)
+
+    def set_particles_per_catch(self, count):
+        """Override particles emitted per catch for this instance"""
+        self.PARTICLES_PER_CATCH = count
+
+    def emit_catch(self, x, y):
+        """Emit one catch effect at a position"""
+        self._create_catch_effect(x, y, "+5", (34, 197, 94), (34, 197, 94))
+
+    def fill_floating_texts(self, target, rng):
+        """
+        Top up floating texts to the target count
+
+        Args:
+            target: Desired number of live floating texts
+            rng: random.Random used for placement
+        """
+        while len(self._floating_texts) < target:
+            x = rng.randint(50, self._width - 50)
+            y = rng.randint(100, self._height - 100)
+            self._floating_texts.append(FloatingText(x, y, "+5", (34, 197, 94)))
+
+
+class StressTest:
+    """
+    Ramps live items, particles per catch and floating texts in steps
+    Each step is held for a fixed number of frames while frame times are
+    recorded; the result is a degradation curve and its knee point
+    """
+
+    def __init__(self, steps=10, frames_per_step=180, warmup_frames=30,
+                 items_per_step=40, particles_per_step=15, texts_per_step=10,
+                 catch_interval=5, output_path='stress_results.csv', seed=1234):
+        """
+        Initialize stress test
+
+        Args:
+            steps: Number of load steps
+            frames_per_step: Frames measured at each step
+            warmup_frames: Frames run before measuring each step
+            items_per_step: Live items added per step
+            particles_per_step: Particles per catch added per step
+            texts_per_step: Live floating texts added per step
+            catch_interval: Emit a synthetic catch every N frames
+            output_path: CSV file for the degradation curve
+            seed: Seed for repeatable placement
+        """
+        self._steps = steps
+        self._frames_per_step = frames_per_step
+        self._warmup_frames = warmup_frames
+        self._items_per_step = items_per_step
+        self._particles_per_step = particles_per_step
+        self._texts_per_step = texts_per_step
+        self._catch_interval = catch_interval
+        self._output_path = output_path
+        self._rng = random.Random(seed)
+        self._results = []
+
+    def run(self, screen):
+        """
+        Run all steps on the given display surface
+
+        Args:
+            screen: pygame display surface
+
+        Returns:
+            dict: Summary with per-step results and knee point
+        """
+        width, height = screen.get_size()
+        stress_screen = _StressScreen(width, height)
+
+        # Measure raw capacity: quality must not step down mid-test
+        QualityManager().set_enabled(False, QualityManager.HIGH)
+
+        for step in range(1, self._steps + 1):
+            load = {
+                'items': step * self._items_per_step,
+                'particles_per_catch': step * self._particles_per_step,
+                'floating_texts': step * self._texts_per_step
+            }
+            stress_screen.set_particles_per_catch(load['particles_per_catch'])
+
+            frame_times = []
+            total_frames = self._warmup_frames + self._frames_per_step
+            for frame in range(total_frames):
+                start = time.perf_counter()
+                self._step_frame(stress_screen, screen, load, frame)
+                elapsed_ms = (time.perf_counter() - start) * 1000.0
+                if frame >= self._warmup_frames:
+                    frame_times.append(elapsed_ms)
+
+            row = dict(step=step, **load, **self._summarize(frame_times))
+            self._results.append(row)
+            print(f"[stress] step {step}/{self._steps}: "
+                  f"items={load['items']} particles/catch={load['particles_per_catch']} "
+                  f"texts={load['floating_texts']} -> p50={row['p50_ms']:.2f}ms "
+                  f"p95={row['p95_ms']:.2f}ms fps={row['fps']:.1f}")
+
+        knee = self._find_knee([row['step'] for row in self._results],
+                               [row['p95_ms'] for row in self._results])
+        summary = {
+            'steps': self._results,
+            'knee_step': knee,
+            'first_over_budget_step': self._first_over_budget(1000.0 / 60)
+        }
+        self._write_output(summary)
+        return summary
+
+    def _step_frame(self, stress_screen, screen, load, frame):
+        """Drive one frame of the stress screen"""
+        # Events are pumped so the dummy/real driver stays responsive
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                raise KeyboardInterrupt
+
+        game = stress_screen._game
+        game.keep_alive()
+        game.fill_items(load['items'], self._rng)
+        stress_screen.fill_floating_texts(load['floating_texts'], self._rng)
+        if frame % self._catch_interval == 0:
+            stress_screen.emit_catch(self._rng.randint(100, screen.get_width() - 100),
+                                     screen.get_height() - 120)
+
+        stress_screen.safe_update()
+        screen.fill((0, 0, 0))
+        stress_screen.safe_draw(screen)
+        pygame.display.flip()
+
+    @staticmethod
+    def _percentile(sorted_values, percent):
+        """Nearest-rank percentile of an already sorted list"""
+        if not sorted_values:
+            return 0.0
+        index = min(len(sorted_values) - 1, int(round(percent / 100.0 * (len(sorted_values) - 1))))
+        return sorted_values[index]
+
+    def _summarize(self, frame_times):
+        """Compute FPS and frame-time percentiles for one step"""
+        ordered = sorted(frame_times)
+        mean = sum(ordered) / len(ordered) if ordered else 0.0
+        return {
+            'fps': 1000.0 / mean if mean > 0 else 0.0,
+            'mean_ms': mean,
+            'p50_ms': self._percentile(ordered, 50),
+            'p95_ms': self._percentile(ordered, 95),
+            'p99_ms': self._percentile(ordered, 99),
+            'max_ms': ordered[-1] if ordered else 0.0
+        }
+
+    @staticmethod
+    def _find_knee(xs, ys):
+        """
+        Find the knee of an increasing convex curve (Kneedle method)
+
+        The curve is normalised to the unit square and the knee is the point
+        furthest below the straight line joining its endpoints.
+
+        Args:
+            xs: Load values (ascending)
+            ys: Frame time values
+
+        Returns:
+            Load value at the knee, or None if the curve is too short/flat
+        """
+        if len(xs) < 3:
+            return None
+        x_min, x_max = xs[0], xs[-1]
+        y_min, y_max = min(ys), max(ys)
+        if x_max == x_min or y_max == y_min:
+            return None
+
+        best_x = None
+        best_gap = 0.0
+        for x, y in zip(xs, ys):
+            x_norm = (x - x_min) / (x_max - x_min)
+            y_norm = (y - y_min) / (y_max - y_min)
+            gap = x_norm - y_norm
+            if gap > best_gap:
+                best_gap = gap
+                best_x = x
+        return best_x
+
+    def _first_over_budget(self, budget_ms):
+        """First step whose p95 frame time exceeds the frame budget"""
+        for row in self._results:
+            if row['p95_ms'] > budget_ms:
+                return row['step']
+        return None
+
+    def _write_output(self, summary):
+        """Write degradation curve CSV and JSON summary"""
+        try:
+            with open(self._output_path, 'w', newline='') as csv_file:
+                writer = csv.DictWriter(csv_file, fieldnames=list(self._results[0].keys()))
+                writer.writeheader()
+                writer.writerows(self._results)
+
+            summary_path = os.path.splitext(self._output_path)[0] + '.json'
+            with open(summary_path, 'w') as json_file:
+                json.dump(summary, json_file, indent=2)
+
+            print(f"[stress] degradation curve written to {self._output_path}")
+            print(f"[stress] knee at step {summary['knee_step']}, "
+                  f"first step over 60 FPS budget: {summary['first_over_budget_step']}")
+        except Exception as e:
+            print(f"Error writing stress test results: {e}")
@@ -0,0 +1,324 @@
+"""
+Faster-than-realtime video export of recorded game sessions
+Demonstrates: Inheritance (replay screen), Composition
+
+The session is split into one contiguous frame range per worker process.
+Each worker replays the recording off-screen from its start snapshot
+(simulating, without drawing, up to the first frame of its range), renders
+its frames into raw buffers through pygame.surfarray and pipes them to
+its own ffmpeg process. The segments are then joined without re-encoding.
+
+Run headless:
+    python src/tools/video_export.py data/recordings/session-....mbgr -o highlight.mp4
+    python src/tools/video_export.py --workers 4 --null     # time rendering only
+"""
+import argparse
+import glob
+import multiprocessing
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+if __name__ in ("__main__", "__mp_main__"):
+    # Also runs in spawned worker processes, which import this file as __mp_main__
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+from core.quality_manager import QualityManager
+from core.session_recorder import SessionRecording
+from screens.game_screen import GameScreen
+from utils.storage import get_data_path
+
+
+class _ReplayScreen(GameScreen):
+    """
+    Game screen driven by a recording instead of the keyboard
+    Inheritance: Extends GameScreen, replacing only where input comes from
+    """
+
+    def __init__(self, recording):
+        super().__init__(recording.width, recording.height, num_players=recording.num_players,
+                         collision_mode=recording.collision_mode, record_results=False)
+        self._game.restore(recording.snapshot)
+        self._reset_catch_tracking()
+        self._frames = recording.frames
+        self._cursor = 0
+
+    def update(self):
+        """Advance by the next recorded frame (effects only after the recording ends)"""
+        if self._cursor < len(self._frames):
+            delta_time, axes = self._frames[self._cursor]
+            if not self._game.is_game_over:
+                self._advance_game(axes, delta_time)
+        self._cursor += 1
+        self._update_effects()
+        self._apply_side_effects()
+
+    def seek(self, frame):
+        """
+        Simulate up to a frame without drawing
+
+        Args:
+            frame: Index of the next frame to render
+        """
+        while self._cursor < frame:
+            self.update()
+
+
+def plan_ranges(frame_count, workers):
+    """
+    Split frames into contiguous ranges of near-equal size
+
+    Args:
+        frame_count: Total frames to render
+        workers: Number of worker processes
+
+    Returns:
+        list: (start, end) per worker, end exclusive
+    """
+    workers = max(1, min(workers, frame_count))
+    bounds = [frame_count * index // workers for index in range(workers + 1)]
+    return [(bounds[index], bounds[index + 1]) for index in range(workers)]
+
+
+def raw_pixel_format(surface):
+    """
+    ffmpeg pixel format matching a 32-bit surface's memory layout
+
+    Frames are piped as the surface's own 32-bit pixels; building packed
+    RGB bytes instead (pixels3d) costs more than drawing the frame.
+
+    Args:
+        surface: 32-bit pygame.Surface
+
+    Returns:
+        str: e.g. 'bgr0' (ffmpeg -pix_fmt name)
+    """
+    r_shift, g_shift, b_shift, _ = surface.get_shifts()
+    channels = ['0'] * 4
+    for name, shift in (('r', r_shift), ('g', g_shift), ('b', b_shift)):
+        byte = shift // 8
+        channels[byte if sys.byteorder == 'little' else 3 - byte] = name
+    return ''.join(channels)
+
+
+def encoder_command(width, height, fps, output, pixel_format='bgr0', crf=20, preset='veryfast'):
+    """
+    ffmpeg command reading raw frames from stdin
+
+    Args:
+        width, height: Frame size
+        fps: Frame rate of the video
+        output: Output file
+        pixel_format: Layout of the raw frames (see raw_pixel_format)
+        crf: x264 quality (lower is better)
+        preset: x264 speed preset
+
+    Returns:
+        list: Command line
+    """
+    return [
+        'ffmpeg', '-loglevel', 'error', '-y',
+        '-f', 'rawvideo', '-pix_fmt', pixel_format, '-s', f'{width}x{height}', '-r', str(fps),
+        '-i', '-',
+        '-c:v', 'libx264', '-preset', preset, '-crf', str(crf), '-pix_fmt', 'yuv420p',
+        output
+    ]
+
+
+def render_range(recording_path, start, end, output=None, fps=60, seed=1, crf=20,
+                 preset='veryfast'):
+    """
+    Worker: render one frame range and pipe it to an encoder
+
+    Args:
+        recording_path: Recording file
+        start: First frame to render
+        end: Frame after the last one to render
+        output: Segment file, or None to discard frames (timing runs)
+        fps: Frame rate of the video
+        seed: Seed for visual effects, identical in every worker
+        crf, preset: x264 settings
+
+    Returns:
+        dict: Frames rendered and seconds spent simulating, rendering and encoding
+    """
+    recording = SessionRecording.load(recording_path)
+    pygame.display.init()
+    pygame.font.init()
+    pygame.display.set_mode((recording.width, recording.height))
+    pygame.time.Clock()  # Starts the SDL timer used by Game
+
+    # Same effects in every worker: full quality and one random sequence
+    QualityManager().set_enabled(False, level=QualityManager.HIGH)
+    random.seed(seed)
+
+    screen = _ReplayScreen(recording)
+    size = (recording.width, recording.height)
+    frame = pygame.Surface(size).convert()
+    if frame.get_bitsize() != 32:
+        frame = pygame.Surface(size, 0, 32)
+
+    timings = {'frames': 0, 'seek': 0.0, 'render': 0.0, 'encode': 0.0}
+    started = time.perf_counter()
+    screen.seek(start)
+    timings['seek'] = time.perf_counter() - started
+
+    encoder = None
+    if output is not None:
+        encoder = subprocess.Popen(
+            encoder_command(recording.width, recording.height, fps, output,
+                            raw_pixel_format(frame), crf, preset),
+            stdin=subprocess.PIPE
+        )
+
+    try:
+        for _ in range(start, end):
+            started = time.perf_counter()
+            screen.update()
+            frame.fill((0, 0, 0))
+            screen.draw(frame)
+            # (width, height) view of the 32-bit pixels -> row-major frame bytes
+            pixels = pygame.surfarray.pixels2d(frame)
+            data = pixels.T.tobytes()
+            del pixels  # Unlocks the surface
+            rendered = time.perf_counter()
+            if encoder is not None:
+                encoder.stdin.write(data)
+            timings['render'] += rendered - started
+            timings['encode'] += time.perf_counter() - rendered
+            timings['frames'] += 1
+    finally:
+        if encoder is not None:
+            encoder.stdin.close()
+            if encoder.wait() != 0:
+                raise RuntimeError(f"ffmpeg failed on frames {start}-{end}")
+        screen.dispose()
+        pygame.quit()
+    return timings
+
+
+def concat_segments(segments, output):
+    """
+    Join encoded segments without re-encoding
+
+    Args:
+        segments: Segment files in order
+        output: Final video file
+    """
+    if len(segments) == 1:
+        shutil.move(segments[0], output)
+        return
+
+    list_path = os.path.join(os.path.dirname(segments[0]), 'segments.txt')
+    with open(list_path, 'w', encoding='utf-8') as list_file:
+        for segment in segments:
+            list_file.write(f"file '{segment}'\n")
+    subprocess.run(['ffmpeg', '-loglevel', 'error', '-y', '-f', 'concat', '-safe', '0',
+                    '-i', list_path, '-c', 'copy', output], check=True)
+
+
+def export(recording_path, output=None, workers=None, fps=60, tail=90, seed=1,
+           crf=20, preset='veryfast'):
+    """
+    Export a recording to a video file
+
+    Args:
+        recording_path: Recording file
+        output: Video file, or None to render without encoding (timing runs)
+        workers: Worker processes (default: one per CPU)
+        fps: Frame rate of the video
+        tail: Frames rendered after the recording ends (game over screen)
+        seed: Seed for visual effects
+        crf, preset: x264 settings
+
+    Returns:
+        dict: 'frames', 'video_seconds', 'wall_seconds' and per-worker timings
+    """
+    if output is not None and shutil.which('ffmpeg') is None:
+        raise RuntimeError("ffmpeg not found on PATH (use --null to time rendering only)")
+
+    recording = SessionRecording.load(recording_path)
+    frame_count = recording.frame_count + tail
+    ranges = plan_ranges(frame_count, workers or os.cpu_count() or 1)
+
+    started = time.perf_counter()
+    with tempfile.TemporaryDirectory(prefix='mbg-export-') as temp_dir:
+        segments = [None] * len(ranges)
+        if output is not None:
+            extension = os.path.splitext(output)[1] or '.mp4'
+            segments = [os.path.join(temp_dir, f'segment-{index:03d}{extension}')
+                        for index in range(len(ranges))]
+
+        jobs = [(recording_path, start, end, segment, fps, seed, crf, preset)
+                for (start, end), segment in zip(ranges, segments)]
+        if len(jobs) == 1:
+            timings = [render_range(*jobs[0])]
+        else:
+            # Fresh interpreters: pygame/SDL state is never shared with a fork
+            with multiprocessing.get_context('spawn').Pool(len(jobs)) as pool:
+                timings = pool.starmap(render_range, jobs)
+
+        if output is not None:
+            concat_segments(segments, output)
+
+    return {
+        'frames': frame_count,
+        'video_seconds': frame_count / fps,
+        'wall_seconds': time.perf_counter() - started,
+        'workers': timings
+    }
+
+
+def latest_recording():
+    """Newest file in data/recordings/, or None"""
+    recordings = sorted(glob.glob(get_data_path('recordings', '*.mbgr')))
+    return recordings[-1] if recordings else None
+
+
+def main():
+    """Export a recorded session from the command line"""
+    parser = argparse.ArgumentParser(description="Faster-than-realtime session video export")
+    parser.add_argument('recording', nargs='?', help="recording file (default: newest in data/recordings/)")
+    parser.add_argument('-o', '--output', default='session.mp4', help="video file (default session.mp4)")
+    parser.add_argument('--null', action='store_true', help="render only, no encoding (timing run)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help="worker processes (default: one per CPU)")
+    parser.add_argument('--fps', type=int, default=60)
+    parser.add_argument('--tail', type=int, default=90,
+                        help="frames of game over screen after the session (default 90)")
+    parser.add_argument('--seed', type=int, default=1, help="seed for particle effects")
+    parser.add_argument('--crf', type=int, default=20)
+    parser.add_argument('--preset', default='veryfast')
+    args = parser.parse_args()
+
+    recording_path = args.recording or latest_recording()
+    if recording_path is None:
+        parser.error("no recording given and none found in data/recordings/")
+
+    output = None if args.null else args.output
+    try:
+        result = export(recording_path, output, args.workers, args.fps, args.tail,
+                        args.seed, args.crf, args.preset)
+    except (RuntimeError, ValueError, subprocess.CalledProcessError) as e:
+        print(f"Export failed: {e}")
+        sys.exit(1)
+
+    for index, timing in enumerate(result['workers']):
+        print(f"worker {index}: {timing['frames']} frames, seek {timing['seek']:.2f} s, "
+              f"render {timing['render']:.2f} s, encode {timing['encode']:.2f} s")
+    speed = result['video_seconds'] / result['wall_seconds']
+    print(f"{result['frames']} frames ({result['video_seconds']:.1f} s of video) in "
+          f"{result['wall_seconds']:.1f} s, {speed:.1f}x realtime")
+    if output is not None:
+        print(f"Video written to {output}")
+
+
+if __name__ == "__main__":
+    main()
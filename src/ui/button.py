@@ -4,6 +4,12 @@ Demonstrates: Encapsulation
 """
 import pygame
 from utils.load_image import load_ui_image
+from core.quality_manager import QualityManager
+from core.residency_manager import ResidencyManager
+from utils.logger import get_logger
+
+
+logger = get_logger(__name__)
 
 
 class Button:
@@ -12,7 +18,8 @@ class Button:
     Encapsulation: Internal state management for hover/click
     """
     
-    def __init__(self, x, y, width, height, text, font_size=32, audio_manager=None, image_name=None):
+    def __init__(self, x, y, width, height, text, font_size=32, audio_manager=None, image_name=None,
+                 bundle=None):
         """
         Initialize button
         
@@ -25,6 +32,8 @@ class Button:
             font_size: Font size for text
             audio_manager: Optional AudioManager for click sounds
             image_name: Optional image filename from assets/images/ui/
+            bundle: Optional residency bundle (screen) that owns the images;
+                    without one the images are private to this button
         """
         self._x = x
         self._y = y
@@ -33,6 +42,7 @@ class Button:
         self._text = text
         self._font = pygame.font.Font(None, font_size)
         self._audio_manager = audio_manager
+        self._bundle = bundle
         
         # Load image if provided
         self._image = None
@@ -53,29 +63,49 @@ class Button:
         # Animation
         self._scale = 1.0
         self._target_scale = 1.0
+        self._quality = QualityManager()
+        
+        # Last scaled image and rendered label, reused while unchanged
+        self._scaled_key = None
+        self._scaled_image = None
+        self._text_surface = None
     
     def _load_image(self, image_name):
         """Load button image from assets/images/ui/ using utility function"""
         try:
-            # Load image with proper scaling using utility function
-            self._image, self._img_width, self._img_height = load_ui_image(
-                image_name, 
-                self._width, 
-                self._height
-            )
-            
-            # Create hover version (slightly brighter)
-            self._image_hover = self._image.copy()
-            brightness = pygame.Surface(self._image_hover.get_size(), pygame.SRCALPHA)
-            brightness.fill((30, 30, 30, 0))
-            self._image_hover.blit(brightness, (0, 0), special_flags=pygame.BLEND_RGB_ADD)
+            if self._bundle is None:
+                self._image, self._image_hover = self._render_images(image_name)
+            else:
+                # Shared through the screen's bundle (same image and size = same surfaces)
+                self._image, self._image_hover = ResidencyManager().load(
+                    self._bundle, 'ui', ('ui', image_name, self._width, self._height),
+                    lambda: self._render_images(image_name)
+                )
+            self._img_width, self._img_height = self._image.get_size()
         except Exception as e:
-            print(f"Error loading button image '{image_name}': {e}")
+            logger.error("Error loading button image '%s': %s", image_name, e)
             self._image = None
             self._image_hover = None
             self._img_width = self._width
             self._img_height = self._height
     
+    def _render_images(self, image_name):
+        """
+        Load the button image and build its hover version
+        
+        Returns:
+            tuple: (image, hover_image)
+        """
+        # Load image with proper scaling using utility function
+        image, _, _ = load_ui_image(image_name, self._width, self._height)
+        
+        # Create hover version (slightly brighter)
+        image_hover = image.copy()
+        brightness = pygame.Surface(image_hover.get_size(), pygame.SRCALPHA)
+        brightness.fill((30, 30, 30, 0))
+        image_hover.blit(brightness, (0, 0), special_flags=pygame.BLEND_RGB_ADD)
+        return image, image_hover
+    
     def update(self, mouse_pos, mouse_pressed):
         """
         Update button state
@@ -113,10 +143,22 @@ class Button:
             else:
                 current_image = self._image
             
-            # Scale image maintaining aspect ratio
+            # Scale image maintaining aspect ratio (cheaper scaler or none under load)
             img_scaled_width = int(self._img_width * self._scale)
             img_scaled_height = int(self._img_height * self._scale)
-            scaled_image = pygame.transform.smoothscale(current_image, (img_scaled_width, img_scaled_height))
+            if not self._quality.button_scaling:
+                scaled_image = current_image
+            else:
+                # The scale settles after hovering, so most frames reuse the last image
+                smooth = self._quality.smooth_button_scaling
+                key = (current_image is self._image_hover, img_scaled_width, img_scaled_height, smooth)
+                if key != self._scaled_key:
+                    if smooth:
+                        self._scaled_image = pygame.transform.smoothscale(current_image, (img_scaled_width, img_scaled_height))
+                    else:
+                        self._scaled_image = pygame.transform.scale(current_image, (img_scaled_width, img_scaled_height))
+                    self._scaled_key = key
+                scaled_image = self._scaled_image
             
             # Draw image (no shadow to preserve transparency)
             image_rect = scaled_image.get_rect(center=(self._x, self._y))
@@ -150,9 +192,10 @@ class Button:
             pygame.draw.rect(screen, color, button_rect, border_radius=10)
             
             # Draw text
-            text_surface = self._font.render(self._text, True, self._text_color)
-            text_rect = text_surface.get_rect(center=(self._x, self._y))
-            screen.blit(text_surface, text_rect)
+            if self._text_surface is None:
+                self._text_surface = self._font.render(self._text, True, self._text_color)
+            text_rect = self._text_surface.get_rect(center=(self._x, self._y))
+            screen.blit(self._text_surface, text_rect)
     
     def is_clicked(self, mouse_pos, mouse_clicked):
         """
@@ -161,7 +204,7 @@ class Button:
         Args:
             mouse_pos: Tuple of (x, y) mouse position
             mouse_clicked: True if mouse button was just released
-            
+        
         Returns:
             bool: True if button was clicked
         """
@@ -191,3 +234,4 @@ class Button:
     @text.setter
     def text(self, value):
         self._text = value
+        self._text_surface = None
@@ -0,0 +1,85 @@
+"""
+Pre-rasterised vector shapes (stars)
+Demonstrates: Reusability, DRY (Don't Repeat Yourself) principle, Caching
+"""
+import math
+import pygame
+
+# Stars are drawn at this multiple of their size and smoothscaled down (antialiasing)
+SUPERSAMPLE = 4
+
+# Cache keyed by (size bucket, colour)
+_star_cache = {}
+
+
+def _star_points(center_x, center_y, size):
+    """
+    Compute the 10 outline points of a 5-pointed star
+
+    Args:
+        center_x: Star centre x
+        center_y: Star centre y
+        size: Outer radius
+
+    Returns:
+        list: (x, y) tuples alternating outer and inner points
+    """
+    points = []
+    for i in range(5):
+        angle = math.pi / 2 + (2 * math.pi * i) / 5
+        points.append((center_x + size * math.cos(angle),
+                       center_y - size * math.sin(angle)))
+
+        # Inner point
+        angle += math.pi / 5
+        points.append((center_x + (size * 0.4) * math.cos(angle),
+                       center_y - (size * 0.4) * math.sin(angle)))
+    return points
+
+
+def get_star(size, color):
+    """
+    Get a cached antialiased star surface
+
+    Args:
+        size: Outer radius in pixels (rounded to an integer bucket)
+        color: RGB tuple
+
+    Returns:
+        pygame.Surface or None: Star surface of (2 * size + 2) pixels square
+    """
+    size = int(size)
+    if size <= 0:
+        return None
+
+    key = (size, tuple(color))
+    star = _star_cache.get(key)
+    if star is None:
+        extent = 2 * size + 2
+        big = pygame.Surface((extent * SUPERSAMPLE, extent * SUPERSAMPLE), pygame.SRCALPHA)
+        center = extent * SUPERSAMPLE / 2
+        pygame.draw.polygon(big, color, _star_points(center, center, size * SUPERSAMPLE))
+        star = pygame.transform.smoothscale(big, (extent, extent))
+        _star_cache[key] = star
+    return star
+
+
+def draw_star(screen, x, y, size, color):
+    """
+    Blit a cached star centred at a position
+
+    Args:
+        screen: pygame surface to draw on
+        x: Centre x
+        y: Centre y
+        size: Outer radius
+        color: RGB tuple
+    """
+    star = get_star(size, color)
+    if star:
+        screen.blit(star, star.get_rect(center=(int(x), int(y))))
+
+
+def clear_cache():
+    """Drop all cached shape surfaces"""
+    _star_cache.clear()
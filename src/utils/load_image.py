@@ -4,6 +4,10 @@ Demonstrates: Reusability, DRY (Don't Repeat Yourself) principle
 """
 import pygame
 import os
+from utils.logger import get_logger
+
+
+logger = get_logger(__name__)
 
 
 def get_assets_path(*paths):
@@ -56,7 +60,7 @@ def load_image(image_path, convert_alpha=True, scale=None, fallback_color=None):
         return image
     
     except Exception as e:
-        print(f"Error loading image '{image_path}': {e}")
+        logger.error("Error loading image '%s': %s", image_path, e)
         
         # Create fallback surface if color provided
         if fallback_color and scale:
@@ -130,7 +134,7 @@ def load_background_image(image_name, screen_width, screen_height, fallback_colo
         image_path = get_assets_path('images', 'backgrounds', image_name)
         return load_image(image_path, convert_alpha=False, scale=(screen_width, screen_height))
     except Exception as e:
-        print(f"Error loading background '{image_name}': {e}")
+        logger.error("Error loading background '%s': %s", image_name, e)
         # Create fallback surface
         fallback = pygame.Surface((screen_width, screen_height))
         fallback.fill(fallback_color)
@@ -0,0 +1,285 @@
+"""
+Rate-limited, non-blocking logging for the game
+Demonstrates: Reusability, DRY (Don't Repeat Yourself) principle
+
+Game code logs through get_logger(). The calling thread only runs a
+per-call-site rate limiter and appends to a queue; a background listener
+thread writes records to the console, a JSON-lines file under data/logs/
+and an in-memory ring buffer. A fault that repeats every frame therefore
+logs a short burst, then only counts until its window ends, when the next
+record from that site carries the number of suppressed repeats.
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+from collections import deque
+
+
+# Per call site: this many records per window, the rest are only counted
+RATE_LIMIT_BURST = 5
+RATE_LIMIT_WINDOW = 10.0
+
+# Recent records kept in memory (for overlays and crash reports)
+RING_BUFFER_SIZE = 200
+
+_ROOT_NAME = 'mbg'
+
+# Logging pipeline state (created on first get_logger call)
+_listener = None
+_rate_limiter = None
+_ring_buffer = None
+_configuring = False
+_setup_lock = threading.RLock()
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Per-call-site rate limiter and deduplication counter
+    Runs in the calling thread, so rejecting a record is just a dict lookup
+    """
+
+    def __init__(self, burst=RATE_LIMIT_BURST, window=RATE_LIMIT_WINDOW):
+        """
+        Args:
+            burst: Records allowed per site in each window
+            window: Window length in seconds
+        """
+        super().__init__()
+        self._burst = burst
+        self._window = window
+        self._lock = threading.Lock()
+
+        # (pathname, lineno) -> [window_start, sent_in_window, suppressed_in_window,
+        #                        total_sent, total_suppressed]
+        self._sites = {}
+
+    def filter(self, record):
+        key = (record.pathname, record.lineno)
+        suppressed = 0
+        with self._lock:
+            site = self._sites.get(key)
+            if site is None:
+                site = self._sites[key] = [record.created, 0, 0, 0, 0]
+            elif record.created - site[0] >= self._window:
+                # New window: report what the last one swallowed
+                suppressed = site[2]
+                site[0] = record.created
+                site[1] = 0
+                site[2] = 0
+
+            if site[1] >= self._burst:
+                site[2] += 1
+                site[4] += 1
+                return False
+
+            site[1] += 1
+            site[3] += 1
+            record.suppressed = suppressed
+            return True
+
+    def pending_suppressed(self):
+        """
+        Get and clear repeats not yet reported by a later record
+
+        Returns:
+            dict: 'path:line' -> count
+        """
+        with self._lock:
+            pending = {}
+            for (pathname, lineno), site in self._sites.items():
+                if site[2]:
+                    pending[f"{os.path.basename(pathname)}:{lineno}"] = site[2]
+                    site[2] = 0
+            return pending
+
+    def get_stats(self):
+        """
+        Totals per call site
+
+        Returns:
+            dict: 'path:line' -> {'sent': int, 'suppressed': int}
+        """
+        with self._lock:
+            return {
+                f"{os.path.basename(pathname)}:{lineno}": {'sent': site[3], 'suppressed': site[4]}
+                for (pathname, lineno), site in self._sites.items()
+            }
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that defers all formatting to the listener thread
+    Only the message string is built in the calling thread
+    """
+
+    def prepare(self, record):
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            # Traceback objects keep frames alive; keep the text only
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class RingBufferHandler(logging.Handler):
+    """Keeps the most recent records in memory"""
+
+    def __init__(self, capacity=RING_BUFFER_SIZE):
+        super().__init__()
+        self._records = deque(maxlen=capacity)
+
+    def emit(self, record):
+        self._records.append(record)
+
+    @property
+    def records(self):
+        return list(self._records)
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """One JSON object per record, for grepping and tooling"""
+
+    def format(self, record):
+        entry = {
+            'time': round(record.created, 3),
+            'level': record.levelname,
+            'logger': record.name,
+            'site': f"{record.module}:{record.lineno}",
+            'thread': record.threadName,
+            'message': record.getMessage(),
+        }
+        if getattr(record, 'suppressed', 0):
+            entry['suppressed'] = record.suppressed
+        if record.exc_text:
+            entry['traceback'] = record.exc_text
+        return json.dumps(entry)
+
+
+class ConsoleFormatter(logging.Formatter):
+    """Plain one-line console output with the repeat count, if any"""
+
+    def format(self, record):
+        text = f"[{record.levelname}] {record.getMessage()}"
+        suppressed = getattr(record, 'suppressed', 0)
+        if suppressed:
+            text += f" (+{suppressed} similar suppressed)"
+        return text
+
+
+def setup_logging(log_path=None, console=True, level=logging.INFO):
+    """
+    Create the logging pipeline (idempotent; get_logger calls this on demand)
+
+    Args:
+        log_path: JSON-lines log file (default data/logs/game.log)
+        console: Whether records are also written to stderr
+        level: Minimum level logged
+    """
+    global _listener, _rate_limiter, _ring_buffer, _configuring
+
+    with _setup_lock:
+        if _listener is not None or _configuring:
+            # Already set up, or re-entered from a helper logging an error below
+            return
+        _configuring = True
+
+        handlers = []
+        _ring_buffer = RingBufferHandler()
+        handlers.append(_ring_buffer)
+
+        if console:
+            console_handler = logging.StreamHandler(sys.stderr)
+            console_handler.setFormatter(ConsoleFormatter())
+            handlers.append(console_handler)
+
+        try:
+            if log_path is None:
+                from utils.storage import get_data_path
+                log_path = get_data_path('logs', 'game.log')
+            os.makedirs(os.path.dirname(log_path), exist_ok=True)
+            file_handler = logging.handlers.RotatingFileHandler(
+                log_path, maxBytes=1024 * 1024, backupCount=3, encoding='utf-8', delay=True
+            )
+            file_handler.setFormatter(JsonLinesFormatter())
+            handlers.append(file_handler)
+        except Exception as e:
+            sys.stderr.write(f"Log file not available: {e}\n")
+
+        _rate_limiter = RateLimitFilter()
+        queue_handler = _QueueHandler(queue.SimpleQueue())
+        queue_handler.addFilter(_rate_limiter)
+
+        root = logging.getLogger(_ROOT_NAME)
+        root.setLevel(level)
+        root.addHandler(queue_handler)
+        root.propagate = False
+
+        _listener = logging.handlers.QueueListener(queue_handler.queue, *handlers)
+        _listener.start()
+        _configuring = False
+        atexit.register(shutdown_logging)
+
+
+def shutdown_logging():
+    """Report outstanding suppressed repeats, flush and stop the listener thread"""
+    global _listener
+
+    with _setup_lock:
+        if _listener is None:
+            return
+
+        pending = _rate_limiter.pending_suppressed()
+        if pending:
+            summary = ', '.join(f"{site} x{count}" for site, count in pending.items())
+            logging.getLogger(_ROOT_NAME).warning("Suppressed repeated log records: %s", summary)
+
+        listener = _listener
+        _listener = None
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+        root = logging.getLogger(_ROOT_NAME)
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+
+
+def get_logger(name):
+    """
+    Get a game logger, setting up the pipeline on first use
+
+    Args:
+        name: Module name (e.g. __name__)
+
+    Returns:
+        logging.Logger: Logger under the game's root logger
+    """
+    if _listener is None:
+        setup_logging()
+    return logging.getLogger(f"{_ROOT_NAME}.{name}")
+
+
+def get_recent_records():
+    """
+    Most recent records that passed the rate limiter
+
+    Returns:
+        list: logging.LogRecord objects, oldest first
+    """
+    return _ring_buffer.records if _ring_buffer is not None else []
+
+
+def get_log_stats():
+    """
+    Sent and suppressed record counts per call site
+
+    Returns:
+        dict: 'file:line' -> {'sent': int, 'suppressed': int}
+    """
+    return _rate_limiter.get_stats() if _rate_limiter is not None else {}
@@ -0,0 +1,72 @@
+"""
+Local data storage utility functions
+Demonstrates: Reusability, DRY (Don't Repeat Yourself) principle
+"""
+import json
+import os
+from utils.logger import get_logger
+
+
+def get_data_path(*paths):
+    """
+    Get absolute path inside the writable data folder (created on demand)
+
+    Args:
+        *paths: Variable number of path components (e.g., 'leaderboard_queue.json')
+
+    Returns:
+        str: Absolute path inside <project root>/data
+    """
+    # Get src directory, then go up one level to project root
+    src_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    data_dir = os.environ.get('MBG_DATA_DIR') or os.path.join(os.path.dirname(src_dir), 'data')
+
+    try:
+        os.makedirs(data_dir, exist_ok=True)
+    except Exception as e:
+        get_logger(__name__).error("Error creating data folder '%s': %s", data_dir, e)
+
+    return os.path.join(data_dir, *paths) if paths else data_dir
+
+
+def load_json(path, default=None):
+    """
+    Load JSON from a file
+
+    Args:
+        path: File path
+        default: Value returned when the file is missing or invalid
+
+    Returns:
+        Parsed JSON value, or default
+    """
+    if not os.path.exists(path):
+        return default
+    try:
+        with open(path, 'r', encoding='utf-8') as json_file:
+            return json.load(json_file)
+    except Exception as e:
+        get_logger(__name__).error("Error reading '%s': %s", path, e)
+        return default
+
+
+def save_json(path, value):
+    """
+    Atomically write JSON to a file (write temp file, then rename)
+
+    Args:
+        path: File path
+        value: JSON-serialisable value
+
+    Returns:
+        bool: True if saved
+    """
+    temp_path = path + '.tmp'
+    try:
+        with open(temp_path, 'w', encoding='utf-8') as json_file:
+            json.dump(value, json_file)
+        os.replace(temp_path, path)
+        return True
+    except Exception as e:
+        get_logger(__name__).error("Error writing '%s': %s", path, e)
+        return False